@@ -0,0 +1,138 @@
+"""Compare the escaping/attribute fast path against the previous implementation.
+
+Run with ``python benchmarks/bench_attributes.py [--options 10000] [--repeat 5]``.
+The legacy functions below are verbatim copies of the pre-fast-path renderer so
+the comparison stays meaningful after the module changes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Mapping
+
+from antd_to_html.render import (
+  default_value,
+  escape_html,
+  render_checkbox_group,
+  render_radio_group,
+  render_select,
+  value_set,
+)
+
+
+def legacy_escape_html(value: Any) -> str:
+  text = "" if value is None else str(value)
+  return (
+    text.replace("&", "&amp;")
+    .replace("<", "&lt;")
+    .replace(">", "&gt;")
+    .replace('"', "&quot;")
+    .replace("'", "&#39;")
+  )
+
+
+def legacy_attributes_to_string(attrs: Mapping[str, Any]) -> str:
+  parts: List[str] = []
+  for key, value in attrs.items():
+    if value in (None, False):
+      continue
+    if value is True:
+      parts.append(str(key))
+    else:
+      parts.append(f'{key}="{legacy_escape_html(value)}"')
+  return " ".join(parts)
+
+
+def legacy_render_choice_group(item: Mapping[str, Any], input_type: str) -> str:
+  values = value_set(default_value(item))
+  selected = default_value(item)
+  group_name = item.get("name") or ""
+  options_markup = []
+  for index, option in enumerate(item.get("options", [])):
+    option_value = option.get("value") or option.get("key") or option.get("label") or ""
+    option_id = option.get("id") or f"{group_name}-{index}"
+    checked = option_value == selected if input_type == "radio" else option_value in values
+    attrs = legacy_attributes_to_string(
+      {
+        "type": input_type,
+        "id": option_id,
+        "name": group_name,
+        "value": option_value,
+        "checked": option.get("checked") or checked,
+        "disabled": option.get("disabled"),
+      }
+    )
+    label = option.get("label") or option_value
+    options_markup.append(
+      f'<label for="{legacy_escape_html(option_id)}"><input {attrs} /> {legacy_escape_html(label)}</label>'
+    )
+  return f'<div class="{input_type}-group">{"".join(options_markup)}</div>'
+
+
+def legacy_render_select_options(item: Mapping[str, Any]) -> str:
+  values = value_set(default_value(item))
+  options_markup = []
+  for option in item.get("options", []):
+    value = option.get("value") or option.get("key") or option.get("label") or ""
+    label = option.get("label") or option.get("value") or ""
+    option_attrs = legacy_attributes_to_string({"value": value, "selected": value in values})
+    options_markup.append(f"<option {option_attrs}>{legacy_escape_html(label)}</option>")
+  return "\n  ".join(options_markup)
+
+
+def build_options(count: int) -> List[Dict[str, Any]]:
+  options = []
+  for index in range(count):
+    label = f"选项 {index}" if index % 10 else f"Option <{index}> & more"
+    options.append({"label": label, "value": f"value-{index}", "disabled": index % 97 == 0})
+  return options
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> float:
+  samples = []
+  for _ in range(repeat):
+    start = time.perf_counter()
+    fn()
+    samples.append(time.perf_counter() - start)
+  return statistics.median(samples) * 1000
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--options", type=int, default=10_000)
+  parser.add_argument("--repeat", type=int, default=5)
+  args = parser.parse_args()
+
+  options = build_options(args.options)
+  radio = {"type": "radio-group", "name": "r", "options": options, "defaultValue": "value-3"}
+  checkbox = {"type": "checkbox-group", "name": "c", "options": options, "defaultValue": ["value-3"]}
+  select = {"type": "select", "name": "s", "options": options, "defaultValue": "value-3"}
+  corpus = [option["label"] for option in options] + [option["value"] for option in options]
+
+  assert legacy_render_choice_group(radio, "radio") == render_radio_group(radio)
+  assert legacy_render_choice_group(checkbox, "checkbox") == render_checkbox_group(checkbox)
+  assert legacy_render_select_options(select) in render_select(select)
+
+  cases = [
+    ("escape_html", lambda: [legacy_escape_html(v) for v in corpus], lambda: [escape_html(v) for v in corpus]),
+    ("radio-group", lambda: legacy_render_choice_group(radio, "radio"), lambda: render_radio_group(radio)),
+    (
+      "checkbox-group",
+      lambda: legacy_render_choice_group(checkbox, "checkbox"),
+      lambda: render_checkbox_group(checkbox),
+    ),
+    ("select", lambda: legacy_render_select_options(select), lambda: render_select(select)),
+  ]
+
+  print(f"{args.options} options, median of {args.repeat} runs")
+  print(f"{'case':<16}{'legacy ms':>12}{'current ms':>12}{'speedup':>10}")
+  for name, legacy, current in cases:
+    legacy_ms = measure(legacy, args.repeat)
+    current_ms = measure(current, args.repeat)
+    print(f"{name:<16}{legacy_ms:>12.2f}{current_ms:>12.2f}{legacy_ms / current_ms:>9.2f}x")
+
+
+if __name__ == "__main__":
+  main()
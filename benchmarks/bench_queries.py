@@ -0,0 +1,118 @@
+"""Per-query latency of the hot repository queries, unprepared vs prepared.
+
+Needs a database with ``schema.sql`` applied (connection from the usual PG_*
+settings). Seeds one template/instance/submission, runs each query
+``--repeat`` times on a single connection with ``prepare=False`` and then
+``prepare=True``, and removes the seed rows afterwards::
+
+  python benchmarks/bench_queries.py --repeat 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import psycopg
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic import flat_form  # noqa: E402
+
+from antd_to_html.config import get_settings  # noqa: E402
+from antd_to_html.ids import generate_short_id  # noqa: E402
+from antd_to_html.models import SubmissionCreate, TemplateCreate  # noqa: E402
+from antd_to_html.repositories import (  # noqa: E402
+  INSERT_TEMPLATE_SQL,
+  INSTANCE_VERSIONS_SQL,
+  INSTANCE_WITH_TEMPLATE_SQL,
+  LATEST_SUBMISSION_SQL,
+  TEMPLATE_VERSIONS_SQL,
+  submission_write,
+  template_insert_params,
+)
+
+
+def seed(conn: psycopg.Connection) -> Tuple[str, str]:
+  template_id = f"bench-{generate_short_id()}"
+  data = TemplateCreate(id=template_id, title="Query benchmark", definition=flat_form(100))
+  conn.execute(INSERT_TEMPLATE_SQL, template_insert_params(data))
+  instance_id = f"bench-{generate_short_id()}"
+  conn.execute(
+    "INSERT INTO form_instances (id, template_id, name, runtime_config) VALUES (%s, %s, %s, %s::jsonb)",
+    (instance_id, template_id, "bench", json.dumps({"submit": {"callback": {"params": {"task_id": "bench"}}}})),
+  )
+  return template_id, instance_id
+
+
+def cleanup(conn: psycopg.Connection, template_id: str, instance_id: str) -> None:
+  conn.execute("DELETE FROM form_instances WHERE id = %s", (instance_id,))
+  conn.execute("DELETE FROM form_templates WHERE id = %s", (template_id,))
+
+
+def build_cases(template_id: str, instance_id: str) -> Dict[str, Tuple[str, Any]]:
+  submission = SubmissionCreate(payload={"values": {f"field_{n}": n for n in range(50)}}, status="submitted")
+  upsert_sql, upsert_params = submission_write(instance_id, submission)
+  return {
+    "get_instance_with_template": (INSTANCE_WITH_TEMPLATE_SQL, (instance_id,)),
+    "get_instance_versions": (INSTANCE_VERSIONS_SQL, (instance_id,)),
+    "get_template_versions": (TEMPLATE_VERSIONS_SQL, (template_id, template_id, template_id)),
+    "save_submission (upsert)": (upsert_sql, upsert_params),
+    "get_submission (latest)": (LATEST_SUBMISSION_SQL, (instance_id,)),
+  }
+
+
+def measure(runs: Dict[bool, Callable[[], Any]], repeat: int) -> Dict[bool, List[float]]:
+  """Alternate the variants on every iteration so drift affects both equally."""
+  for _ in range(min(20, repeat)):
+    for run in runs.values():
+      run()
+  samples: Dict[bool, List[float]] = {flag: [] for flag in runs}
+  for _ in range(repeat):
+    for flag, run in runs.items():
+      start = time.perf_counter()
+      run()
+      samples[flag].append(time.perf_counter() - start)
+  for values in samples.values():
+    values.sort()
+  return samples
+
+
+def _runner(cur: psycopg.Cursor, query: str, params: Any, prepare: bool) -> Callable[[], None]:
+  def run() -> None:
+    cur.execute(query, params, prepare=prepare)
+    cur.fetchall()
+
+  return run
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--repeat", type=int, default=1000)
+  args = parser.parse_args()
+
+  with psycopg.connect(get_settings().pg_dsn, autocommit=True) as conn:
+    # Unprepared runs must not be auto-prepared behind our back; None would
+    # also disable prepare=True, so use a threshold that is never reached.
+    conn.prepare_threshold = 2**31
+    template_id, instance_id = seed(conn)
+    try:
+      print(f"median / p99 of {args.repeat} runs, microseconds")
+      print(f"{'query':<30}{'unprepared':>22}{'prepared':>22}{'speedup':>10}")
+      for name, (query, params) in build_cases(template_id, instance_id).items():
+        with conn.cursor() as cur:
+          results = measure({flag: _runner(cur, query, params, flag) for flag in (False, True)}, args.repeat)
+        cold, warm = (statistics.median(results[flag]) * 1e6 for flag in (False, True))
+        cold_p99, warm_p99 = (results[flag][int(0.99 * (len(results[flag]) - 1))] * 1e6 for flag in (False, True))
+        print(f"{name:<30}{cold:>12.1f} / {cold_p99:>7.1f}{warm:>12.1f} / {warm_p99:>7.1f}{cold / warm:>9.2f}x")
+    finally:
+      cleanup(conn, template_id, instance_id)
+
+
+if __name__ == "__main__":
+  main()
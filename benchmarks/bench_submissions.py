@@ -0,0 +1,100 @@
+"""Sustained submission-save throughput, direct autocommit upserts vs the write-behind queue.
+
+Needs a database with ``schema.sql`` applied (connection from the usual PG_*
+settings). Seeds one template with ``--clients`` instances, then each client
+saves to its own instance in a loop for ``--seconds``, first with direct
+writes and then through :class:`SubmissionWriteQueue`::
+
+  python benchmarks/bench_submissions.py --clients 64 --seconds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic import flat_form  # noqa: E402
+
+from antd_to_html import async_db  # noqa: E402
+from antd_to_html.config import get_settings  # noqa: E402
+from antd_to_html.ids import generate_short_id  # noqa: E402
+from antd_to_html.models import SubmissionCreate, TemplateCreate  # noqa: E402
+from antd_to_html.repositories import INSERT_TEMPLATE_SQL, submission_write, template_insert_params  # noqa: E402
+from antd_to_html.write_behind import SubmissionWriteQueue  # noqa: E402
+
+Save = Callable[[str, SubmissionCreate], Awaitable[Any]]
+
+
+async def direct_save(instance_id: str, data: SubmissionCreate) -> Any:
+  query, params = submission_write(instance_id, data)
+  return await async_db.execute(query, params)
+
+
+async def run(save: Save, instance_ids: List[str], seconds: float) -> Dict[str, float]:
+  data = SubmissionCreate(payload={"values": {f"field_{n}": n for n in range(50)}}, status="submitted")
+  latencies: List[float] = []
+  deadline = time.perf_counter() + seconds
+
+  async def client(instance_id: str) -> None:
+    while time.perf_counter() < deadline:
+      start = time.perf_counter()
+      await save(instance_id, data)
+      latencies.append(time.perf_counter() - start)
+
+  started = time.perf_counter()
+  await asyncio.gather(*(client(instance_id) for instance_id in instance_ids))
+  elapsed = time.perf_counter() - started
+  latencies.sort()
+  return {
+    "saves_per_s": len(latencies) / elapsed,
+    "p50_ms": statistics.median(latencies) * 1000,
+    "p99_ms": latencies[int(0.99 * (len(latencies) - 1))] * 1000,
+  }
+
+
+async def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--clients", type=int, default=64)
+  parser.add_argument("--seconds", type=float, default=5.0)
+  parser.add_argument("--batch-size", type=int, default=get_settings().submission_batch_size)
+  parser.add_argument("--delay-ms", type=float, default=get_settings().submission_batch_delay_ms)
+  args = parser.parse_args()
+
+  template_id = f"bench-{generate_short_id()}"
+  await async_db.execute(
+    INSERT_TEMPLATE_SQL,
+    template_insert_params(TemplateCreate(id=template_id, title="Submission benchmark", definition=flat_form(20))),
+  )
+  instance_ids = [f"bench-{generate_short_id()}" for _ in range(args.clients)]
+  async with async_db.get_connection() as conn:
+    async with conn.cursor() as cur:
+      await cur.executemany(
+        "INSERT INTO form_instances (id, template_id) VALUES (%s, %s)",
+        [(instance_id, template_id) for instance_id in instance_ids],
+      )
+
+  try:
+    queue = SubmissionWriteQueue(args.batch_size, args.delay_ms / 1000)
+    print(f"{args.clients} clients, {args.seconds:g}s each, pool max_size={get_settings().pg_pool_max_size}")
+    print(f"{'mode':<14}{'saves/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, save in (("direct", direct_save), ("write-behind", queue.save)):
+      result = await run(save, instance_ids, args.seconds)
+      print(f"{name:<14}{result['saves_per_s']:>10.0f}{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}")
+    await queue.drain()
+    stats = queue.stats()
+    print(f"write-behind: {stats['batches']} batches, avg {stats['avg_batch']:.1f} writes/batch")
+  finally:
+    await async_db.execute("DELETE FROM form_instances WHERE template_id = %s", (template_id,))
+    await async_db.execute("DELETE FROM form_templates WHERE id = %s", (template_id,))
+    await async_db.close_pool()
+
+
+if __name__ == "__main__":
+  asyncio.run(main())
@@ -0,0 +1,156 @@
+"""Render benchmark suite with JSON baselines and regression checks.
+
+Examples::
+
+  python benchmarks/run.py                                  # print results
+  python benchmarks/run.py --save benchmarks/baseline.json  # record a baseline
+  python benchmarks/run.py --compare benchmarks/baseline.json --threshold 0.25
+
+``--compare`` exits with status 1 when any stage's p50 is slower than the
+baseline by more than ``--threshold`` (a fraction, 0.25 = 25%).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic import SCENARIOS, runtime_config  # noqa: E402
+
+from antd_to_html.api.runtime import merge_definition_with_runtime  # noqa: E402
+from antd_to_html.render import RENDER_PLAN_CACHE, RENDERER_VERSION, convert_antd_form_to_html  # noqa: E402
+from antd_to_html.schema_validator import validate_form_definition  # noqa: E402
+from antd_to_html.submit_script import build_submit_script  # noqa: E402
+
+
+def build_stages(definition: Dict[str, Any]) -> Dict[str, Callable[[], Any]]:
+  template = {"definition": definition, "html_options": {"title": "Benchmark"}}
+  runtime = runtime_config()
+
+  def render_cold() -> str:
+    RENDER_PLAN_CACHE.clear()
+    return convert_antd_form_to_html(definition)
+
+  def render_warm() -> str:
+    return convert_antd_form_to_html(definition)
+
+  return {
+    "convert_antd_form_to_html": render_cold,
+    "convert_antd_form_to_html[cached]": render_warm,
+    "validate_form_definition": lambda: validate_form_definition(definition),
+    "build_submit_script": lambda: build_submit_script(definition["submit"]),
+    "merge_definition_with_runtime": lambda: merge_definition_with_runtime(template, runtime, "bench"),
+  }
+
+
+def measure(fn: Callable[[], Any], *, min_runs: int, min_seconds: float) -> Dict[str, float]:
+  fn()  # warm-up, and primes the plan cache for the cached stage
+  samples: List[float] = []
+  started = time.perf_counter()
+  while len(samples) < min_runs or time.perf_counter() - started < min_seconds:
+    start = time.perf_counter()
+    fn()
+    samples.append(time.perf_counter() - start)
+
+  tracemalloc.start()
+  try:
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+  finally:
+    tracemalloc.stop()
+
+  samples.sort()
+  return {
+    "runs": len(samples),
+    "ops_per_sec": len(samples) / sum(samples),
+    "p50_ms": _percentile(samples, 0.50) * 1000,
+    "p99_ms": _percentile(samples, 0.99) * 1000,
+    "mean_ms": statistics.fmean(samples) * 1000,
+    "peak_alloc_kb": peak / 1024,
+  }
+
+
+def _percentile(sorted_samples: List[float], fraction: float) -> float:
+  index = min(len(sorted_samples) - 1, max(0, round(fraction * (len(sorted_samples) - 1))))
+  return sorted_samples[index]
+
+
+def run_suite(scenarios: List[str], *, min_runs: int, min_seconds: float) -> Dict[str, Dict[str, float]]:
+  results: Dict[str, Dict[str, float]] = {}
+  for name in scenarios:
+    definition = SCENARIOS[name]()
+    for stage, fn in build_stages(definition).items():
+      key = f"{name}/{stage}"
+      results[key] = measure(fn, min_runs=min_runs, min_seconds=min_seconds)
+      row = results[key]
+      print(
+        f"{key:<62} {row['ops_per_sec']:>10.1f} ops/s  p50 {row['p50_ms']:>9.3f} ms"
+        f"  p99 {row['p99_ms']:>9.3f} ms  peak {row['peak_alloc_kb']:>10.1f} KiB"
+      )
+  return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Any], threshold: float) -> List[str]:
+  regressions = []
+  for key, previous in baseline.get("results", {}).items():
+    current = results.get(key)
+    if not current:
+      continue
+    limit = previous["p50_ms"] * (1 + threshold)
+    if current["p50_ms"] > limit:
+      slowdown = current["p50_ms"] / previous["p50_ms"] - 1
+      regressions.append(
+        f"{key}: p50 {current['p50_ms']:.3f} ms vs baseline {previous['p50_ms']:.3f} ms (+{slowdown:.0%})"
+      )
+  return regressions
+
+
+def main() -> int:
+  parser = argparse.ArgumentParser(description="Render benchmark suite.")
+  parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="repeatable; default all")
+  parser.add_argument("--min-runs", type=int, default=5)
+  parser.add_argument("--min-seconds", type=float, default=0.5)
+  parser.add_argument("--save", type=Path, help="write results to this JSON baseline")
+  parser.add_argument("--compare", type=Path, help="fail if slower than this JSON baseline")
+  parser.add_argument("--threshold", type=float, default=0.25)
+  args = parser.parse_args()
+
+  scenarios = args.scenario or list(SCENARIOS)
+  results = run_suite(scenarios, min_runs=args.min_runs, min_seconds=args.min_seconds)
+
+  if args.save:
+    payload = {
+      "meta": {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "renderer_version": RENDERER_VERSION,
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+      },
+      "results": results,
+    }
+    args.save.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    print(f"Saved baseline to {args.save}")
+
+  if args.compare:
+    baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+      print(f"\n{len(regressions)} stage(s) regressed by more than {args.threshold:.0%}:")
+      for line in regressions:
+        print(f"  {line}")
+      return 1
+    print(f"\nNo stage regressed by more than {args.threshold:.0%}.")
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,91 @@
+"""Synthetic form definitions for the render benchmarks."""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List
+
+FIELD_CYCLE = ["input", "textarea", "number", "select", "radio-group", "checkbox-group", "switch", "date-picker"]
+
+
+def build_options(count: int, prefix: str = "option") -> List[Dict[str, Any]]:
+  return [{"label": f"{prefix} {index} & <{index}>", "value": f"{prefix}-{index}"} for index in range(count)]
+
+
+def build_item(index: int, field_type: str, *, options: int = 5) -> Dict[str, Any]:
+  item: Dict[str, Any] = {
+    "type": field_type,
+    "name": f"field_{index}",
+    "label": f"字段 {index}",
+    "placeholder": f"请输入 {index}",
+    "required": index % 3 == 0,
+    "description": f"Description for field {index}",
+  }
+  if field_type in {"select", "radio-group", "checkbox-group"}:
+    item["options"] = build_options(options, prefix=f"f{index}")
+  return item
+
+
+def flat_form(size: int) -> Dict[str, Any]:
+  items = [build_item(index, FIELD_CYCLE[index % len(FIELD_CYCLE)]) for index in range(size)]
+  return {"title": f"Flat form ({size} items)", "items": items, "submit": submit_config()}
+
+
+def huge_select(options: int) -> Dict[str, Any]:
+  return {
+    "title": f"Select with {options} options",
+    "items": [
+      build_item(0, "select", options=options),
+      build_item(1, "radio-group", options=min(options, 1000)),
+    ],
+    "submit": submit_config(),
+  }
+
+
+def deep_form_list(depth: int) -> Dict[str, Any]:
+  child: Dict[str, Any] = build_item(depth, "input")
+  for level in range(depth):
+    child = {"type": "form-list", "name": f"list_{level}", "label": f"列表 {level}", "item": child}
+  return {"title": f"Form list nested {depth} deep", "items": [child, build_item(0, "input")], "submit": submit_config()}
+
+
+def heavy_attributes(size: int) -> Dict[str, Any]:
+  items = []
+  for index in range(size):
+    item = build_item(index, FIELD_CYCLE[index % len(FIELD_CYCLE)])
+    item["htmlAttributes"] = {f"data-attr-{n}": f"value \"{n}\" & {index}" for n in range(12)}
+    item["style"] = {"marginTop": f"{index % 8}px", "paddingLeft": "4px", "backgroundColor": "#fafafa"}
+    item["controlClassName"] = f"control-{index}"
+    items.append(item)
+  return {"title": f"Attribute-heavy form ({size} items)", "items": items, "submit": submit_config()}
+
+
+def submit_config() -> Dict[str, Any]:
+  return {
+    "callback_url": "https://example.com/callback",
+    "callback_params": {"task_id": "bench"},
+    "headers": {"X-Trace": "bench"},
+    "submissionEndpoint": "/forms/bench/submissions",
+  }
+
+
+def runtime_config() -> Dict[str, Any]:
+  return {
+    "submit": {
+      "callback": {"url": "https://example.com/callback", "params": {"task_id": "bench"}},
+      "persistence": {"endpoint": "/forms/bench/submissions", "load_on_init": True},
+    },
+    "html": {"title": "Benchmark"},
+  }
+
+
+SCENARIOS: Dict[str, Callable[[], Dict[str, Any]]] = {
+  "flat-10": lambda: flat_form(10),
+  "flat-100": lambda: flat_form(100),
+  "flat-1000": lambda: flat_form(1_000),
+  "flat-10000": lambda: flat_form(10_000),
+  "select-10k-options": lambda: huge_select(10_000),
+  # Each form-list level renders its child twice (initial row + <template>),
+  # so output doubles per level; 8 levels is already a ~100 KB page.
+  "form-list-depth-8": lambda: deep_form_list(8),
+  "heavy-attributes-500": lambda: heavy_attributes(500),
+}
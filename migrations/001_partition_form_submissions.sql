@@ -0,0 +1,48 @@
+-- Convert an existing form_submissions table to the hash-partitioned layout in
+-- schema.sql and drop the one-submission-per-instance constraint. Existing
+-- rows keep their ids and become the single (empty respondent key) submission
+-- of their instance. The table is locked while rows are copied.
+--
+--   psql -v ON_ERROR_STOP=1 -h <host> -U postgres -d form -f migrations/001_partition_form_submissions.sql
+
+BEGIN;
+
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'form_submissions'::regclass) THEN
+    RAISE EXCEPTION 'form_submissions is already partitioned';
+  END IF;
+END $$;
+
+LOCK TABLE form_submissions IN ACCESS EXCLUSIVE MODE;
+
+ALTER TABLE form_submissions RENAME TO form_submissions_unpartitioned;
+ALTER TABLE form_submissions_unpartitioned RENAME CONSTRAINT form_submissions_pkey TO form_submissions_unpartitioned_pkey;
+ALTER TABLE form_submissions_unpartitioned DROP CONSTRAINT IF EXISTS form_submissions_instance_unique;
+ALTER TABLE form_submissions_unpartitioned DROP CONSTRAINT IF EXISTS form_submissions_instance_id_fkey;
+DROP TRIGGER IF EXISTS form_submissions_set_template_id ON form_submissions_unpartitioned;
+DROP INDEX IF EXISTS
+  idx_form_submissions_instance,
+  idx_form_submissions_instance_recent,
+  idx_form_submissions_template_recent,
+  form_submissions_respondent_unique;
+
+\ir ../schema.sql
+
+-- template_id comes from the instance, so this also works for tables that
+-- predate the denormalized column.
+INSERT INTO form_submissions (
+  id, instance_id, respondent_key, submitted_at, updated_at,
+  payload, status, callback_status, callback_info, template_id
+)
+SELECT
+  s.id, s.instance_id, '', s.submitted_at, s.updated_at,
+  s.payload, s.status, s.callback_status, s.callback_info, i.template_id
+FROM form_submissions_unpartitioned s
+JOIN form_instances i ON i.id = s.instance_id;
+
+DROP TABLE form_submissions_unpartitioned;
+
+COMMIT;
+
+ANALYZE form_submissions;
@@ -38,18 +38,145 @@ CREATE TABLE IF NOT EXISTS form_instances (
   updated_at     TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
+-- Hash-partitioned by instance_id so busy public forms (append mode) spread
+-- writes across partitions and each partition's indexes stay small. Databases
+-- created before partitioning: run migrations/001_partition_form_submissions.sql.
 CREATE TABLE IF NOT EXISTS form_submissions (
-  id             TEXT PRIMARY KEY DEFAULT generate_short_id(12),
-  instance_id    TEXT NOT NULL REFERENCES form_instances(id) ON DELETE CASCADE,
-  submitted_at   TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-  updated_at     TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-  payload        JSONB NOT NULL,
-  status         TEXT NOT NULL DEFAULT 'draft',
+  id              TEXT NOT NULL DEFAULT generate_short_id(12),
+  instance_id     TEXT NOT NULL REFERENCES form_instances(id) ON DELETE CASCADE,
+  respondent_key  TEXT NOT NULL DEFAULT '',
+  submitted_at    TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  updated_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  payload         JSONB NOT NULL,
+  status          TEXT NOT NULL DEFAULT 'draft',
   callback_status TEXT NOT NULL DEFAULT 'idle',
-  callback_info  JSONB,
-  CONSTRAINT form_submissions_instance_unique UNIQUE (instance_id)
+  callback_info   JSONB,
+  template_id     TEXT,
+  PRIMARY KEY (instance_id, id)
+) PARTITION BY HASH (instance_id);
+
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'form_submissions'::regclass) THEN
+    FOR remainder IN 0..15 LOOP
+      EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I PARTITION OF form_submissions FOR VALUES WITH (MODULUS 16, REMAINDER %s)',
+        'form_submissions_p' || remainder,
+        remainder
+      );
+    END LOOP;
+  END IF;
+END $$;
+
+-- One row per (instance, respondent). Single-submission instances always use
+-- the empty key; append-mode instances get a key per respondent.
+ALTER TABLE form_submissions ADD COLUMN IF NOT EXISTS respondent_key TEXT NOT NULL DEFAULT '';
+CREATE UNIQUE INDEX IF NOT EXISTS form_submissions_respondent_unique
+  ON form_submissions (instance_id, respondent_key);
+
+-- Denormalized from form_instances so per-template listings need no join.
+ALTER TABLE form_submissions ADD COLUMN IF NOT EXISTS template_id TEXT;
+UPDATE form_submissions s
+   SET template_id = i.template_id
+  FROM form_instances i
+ WHERE i.id = s.instance_id AND s.template_id IS NULL;
+
+CREATE OR REPLACE FUNCTION set_submission_template_id()
+RETURNS trigger AS $$
+BEGIN
+  IF NEW.template_id IS NULL THEN
+    SELECT template_id INTO NEW.template_id FROM form_instances WHERE id = NEW.instance_id;
+  END IF;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS form_submissions_set_template_id ON form_submissions;
+CREATE TRIGGER form_submissions_set_template_id
+BEFORE INSERT ON form_submissions
+FOR EACH ROW EXECUTE FUNCTION set_submission_template_id();
+
+CREATE TABLE IF NOT EXISTS static_assets (
+  filename    TEXT PRIMARY KEY,
+  media_type  TEXT NOT NULL,
+  content     BYTEA NOT NULL,
+  created_at  TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Pages rendered at write time (PRERENDER_PAGES=1). A row is current while its
+-- version columns match the instance/template and the running renderer.
+CREATE TABLE IF NOT EXISTS form_rendered_pages (
+  instance_id         TEXT PRIMARY KEY REFERENCES form_instances(id) ON DELETE CASCADE,
+  template_id         TEXT NOT NULL,
+  template_version    INTEGER NOT NULL,
+  template_updated_at TIMESTAMPTZ NOT NULL,
+  instance_updated_at TIMESTAMPTZ NOT NULL,
+  renderer_version    TEXT NOT NULL,
+  content_hash        TEXT NOT NULL,
+  html                BYTEA NOT NULL,
+  html_gzip           BYTEA,
+  html_br             BYTEA,
+  rendered_at         TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Idempotency-Key headers seen on submission writes, with the response to
+-- replay. A row without a response is a write still in progress. Rows expire
+-- after IDEMPOTENCY_KEY_TTL and are deleted in batches by the service.
+CREATE TABLE IF NOT EXISTS submission_idempotency_keys (
+  instance_id   TEXT NOT NULL,
+  key           TEXT NOT NULL,
+  request_hash  TEXT NOT NULL,
+  response      JSONB,
+  created_at    TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (instance_id, key)
 );
 
 CREATE INDEX IF NOT EXISTS idx_form_templates_slug ON form_templates(slug);
 CREATE INDEX IF NOT EXISTS idx_form_instances_template ON form_instances(template_id);
-CREATE INDEX IF NOT EXISTS idx_form_submissions_instance ON form_submissions(instance_id);
+CREATE INDEX IF NOT EXISTS idx_submission_idempotency_keys_created
+  ON submission_idempotency_keys (created_at);
+-- Keyset pagination on (updated_at, id), newest first. The filter columns are
+-- INCLUDEd so a page of ids comes from an index-only scan.
+DROP INDEX IF EXISTS idx_form_submissions_instance;
+CREATE INDEX IF NOT EXISTS idx_form_submissions_instance_recent
+  ON form_submissions (instance_id, updated_at DESC, id DESC) INCLUDE (status, callback_status);
+CREATE INDEX IF NOT EXISTS idx_form_submissions_template_recent
+  ON form_submissions (template_id, updated_at DESC, id DESC) INCLUDE (status, callback_status, instance_id);
+
+-- Per-worker caches (rendered pages, option indexes) listen on this channel
+-- and evict entries for the changed template/instance ids. Only key columns
+-- go into the payload: NOTIFY rejects payloads over 8000 bytes, and whole rows
+-- carry the template definition.
+CREATE OR REPLACE FUNCTION notify_form_cache_change()
+RETURNS trigger AS $$
+DECLARE
+  changed jsonb;
+BEGIN
+  IF TG_TABLE_NAME = 'form_templates' THEN
+    IF TG_OP = 'DELETE' THEN
+      changed := jsonb_build_object('id', OLD.id, 'slug', OLD.slug, 'updated_at', OLD.updated_at);
+    ELSE
+      changed := jsonb_build_object('id', NEW.id, 'slug', NEW.slug, 'updated_at', NEW.updated_at);
+    END IF;
+  ELSIF TG_OP = 'DELETE' THEN
+    changed := jsonb_build_object('id', OLD.id, 'template_id', OLD.template_id, 'updated_at', OLD.updated_at);
+  ELSE
+    changed := jsonb_build_object('id', NEW.id, 'template_id', NEW.template_id, 'updated_at', NEW.updated_at);
+  END IF;
+  PERFORM pg_notify(
+    'form_cache_invalidation',
+    (jsonb_build_object('table', TG_TABLE_NAME, 'op', TG_OP) || changed)::text
+  );
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS form_templates_notify_cache ON form_templates;
+CREATE TRIGGER form_templates_notify_cache
+AFTER UPDATE OR DELETE ON form_templates
+FOR EACH ROW EXECUTE FUNCTION notify_form_cache_change();
+
+DROP TRIGGER IF EXISTS form_instances_notify_cache ON form_instances;
+CREATE TRIGGER form_instances_notify_cache
+AFTER UPDATE OR DELETE ON form_instances
+FOR EACH ROW EXECUTE FUNCTION notify_form_cache_change();
@@ -0,0 +1,50 @@
+"""Bulk-import form templates from an NDJSON file of ``TemplateCreate`` records.
+
+Usage::
+
+  python scripts/import_templates.py templates.ndjson [--batch-size 1000]
+  cat templates.ndjson | python scripts/import_templates.py -
+
+Prints one JSON line per rejected record (invalid or conflicting) and a summary.
+Exits with status 1 if any record was rejected.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+from antd_to_html import db
+from antd_to_html.batch import shutdown_render_pool
+from antd_to_html.template_import import import_templates
+
+
+def main() -> int:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("path", help="NDJSON file, or - for stdin")
+  parser.add_argument("--batch-size", type=int, default=None, help="rows per COPY/merge transaction")
+  args = parser.parse_args()
+
+  try:
+    if args.path == "-":
+      summary = import_templates(sys.stdin.buffer, batch_size=args.batch_size)
+    else:
+      with open(args.path, "rb") as handle:
+        summary = import_templates(handle, batch_size=args.batch_size)
+  finally:
+    shutdown_render_pool()
+    db.close_pool()
+
+  for result in summary["results"]:
+    if result["status"] != "created":
+      print(json.dumps(result, ensure_ascii=False))
+  print(
+    f"created={summary['created']} conflicts={summary['conflicts']} invalid={summary['invalid']}",
+    file=sys.stderr,
+  )
+  return 1 if summary["conflicts"] or summary["invalid"] else 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
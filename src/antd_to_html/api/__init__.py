@@ -1,5 +1,5 @@
 """Expose API routers."""
 
-from . import instances, runtime, templates
+from . import assets, instances, metrics, render, runtime, templates
 
-__all__ = ["instances", "runtime", "templates"]
+__all__ = ["assets", "instances", "metrics", "render", "runtime", "templates"]
@@ -0,0 +1,21 @@
+"""Serve content-fingerprinted scripts and stylesheets."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from ..assets import ASSET_CACHE_CONTROL, ASSET_URL_PREFIX, get_asset
+
+router = APIRouter(prefix=ASSET_URL_PREFIX, tags=["assets"])
+
+
+@router.get("/{filename}", response_class=Response)
+def read_asset(filename: str, request: Request) -> Response:
+  asset = get_asset(filename)
+  if not asset:
+    raise HTTPException(status_code=404, detail="Asset not found.")
+
+  headers = {"Cache-Control": ASSET_CACHE_CONTROL, "ETag": asset.etag}
+  if request.headers.get("if-none-match") == asset.etag:
+    return Response(status_code=304, headers=headers)
+  return Response(content=asset.content, media_type=asset.media_type, headers=headers)
@@ -2,49 +2,83 @@
 
 from __future__ import annotations
 
+import json
 import logging
+from tempfile import SpooledTemporaryFile
+from typing import Any, Iterator, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
-from ..models import Instance, InstanceCreate, InstanceDetail, Template
+from ..config import get_settings
+from ..instance_import import create_instances
+from ..models import Instance, InstanceCreate, InstanceDetail, SubmissionPage, Template
 from ..repositories import (
+  InvalidCursorError,
   RepositoryError,
   create_instance,
+  get_instance,
   get_instance_with_template,
   get_template_by_id,
   get_template_by_slug,
+  list_submissions,
 )
+from .runtime import prerender_instance_page
 
 router = APIRouter(prefix="/form-instances", tags=["form-instances"])
 logger = logging.getLogger(__name__)
 
+# Bulk uploads larger than this are spooled to a temporary file, not memory.
+UPLOAD_SPOOL_SIZE = 4 * 1024 * 1024
+
 
 @router.post("", response_model=Instance)
 def create_form_instance(payload: InstanceCreate) -> Instance:
-  template_row = None
-  if payload.template_id:
-    template_row = get_template_by_id(payload.template_id)
-    if not template_row and payload.template_slug:
-      template_row = get_template_by_slug(payload.template_slug)
-  elif payload.template_slug:
-    template_row = get_template_by_slug(payload.template_slug)
-
-  if not template_row:
-    logger.warning(
-      "Template not found when creating instance (template_id=%s, template_slug=%s).",
-      payload.template_id,
-      payload.template_slug,
-    )
-    raise HTTPException(status_code=404, detail="Template not found.")
+  template_row = _find_template(payload.template_id, payload.template_slug)
 
   try:
     row = create_instance(payload, str(template_row["id"]))
   except RepositoryError as exc:
     raise HTTPException(status_code=500, detail=str(exc)) from exc
 
+  if get_settings().prerender_pages:
+    # Best effort: a failed pre-render is retried on the first view.
+    try:
+      prerender_instance_page(row["id"])
+    except Exception:
+      logger.exception("Failed to pre-render instance %s.", row["id"])
+
   return Instance.model_validate(row)
 
 
+@router.post("/bulk")
+async def create_form_instances_bulk(
+  request: Request,
+  template_id: Optional[str] = None,
+  template_slug: Optional[str] = None,
+) -> StreamingResponse:
+  """Create one instance per NDJSON line (``{"id", "name", "runtime_config"}``) or CSV row.
+
+  The template is resolved once. Results stream back as NDJSON while batches
+  commit, ending with a ``{"summary": ...}`` line.
+  """
+  if not template_id and not template_slug:
+    raise HTTPException(status_code=422, detail="template_id or template_slug is required.")
+  template_row = await run_in_threadpool(_find_template, template_id, template_slug)
+  csv_format = request.headers.get("content-type", "").split(";")[0].strip() == "text/csv"
+  # The upload is read in full before responding (a streaming response listens
+  # for disconnects on the same receive channel), so spool it rather than hold it.
+  upload = await _spool_upload(request)
+  results = create_instances(str(template_row["id"]), upload, csv_format=csv_format)
+  return StreamingResponse(
+    _ndjson_chunks(results),
+    media_type="application/x-ndjson",
+    background=BackgroundTask(upload.close),
+  )
+
+
 @router.get("/{instance_id}", response_model=InstanceDetail)
 def read_form_instance(instance_id: str) -> InstanceDetail:
   record = get_instance_with_template(instance_id)
@@ -54,3 +88,67 @@ def read_form_instance(instance_id: str) -> InstanceDetail:
   instance = Instance.model_validate(record["instance"])
   template = Template.model_validate(record["template"])
   return InstanceDetail(instance=instance, template=template)
+
+
+@router.get("/{instance_id}/submissions", response_model=SubmissionPage)
+def list_instance_submissions(
+  instance_id: str,
+  limit: int = Query(50, ge=1, le=200),
+  cursor: Optional[str] = None,
+  status: Optional[str] = None,
+  callback_status: Optional[str] = None,
+) -> SubmissionPage:
+  """Newest first; pass ``next_cursor`` back as ``cursor`` for the following page."""
+  if not get_instance(instance_id):
+    raise HTTPException(status_code=404, detail="Instance not found.")
+  try:
+    page = list_submissions(
+      "instance_id", instance_id, limit=limit, cursor=cursor, status=status, callback_status=callback_status
+    )
+  except InvalidCursorError as exc:
+    raise HTTPException(status_code=422, detail=str(exc)) from exc
+  return SubmissionPage.model_validate(page)
+
+
+async def _spool_upload(request: Request) -> SpooledTemporaryFile:
+  """The request body as a file positioned at its start; iterating it yields lines."""
+  upload = SpooledTemporaryFile(max_size=UPLOAD_SPOOL_SIZE)
+  try:
+    async for chunk in request.stream():
+      upload.write(chunk)
+  except BaseException:
+    upload.close()
+    raise
+  upload.seek(0)
+  return upload
+
+
+def _ndjson_chunks(results: Iterator[dict[str, Any]], lines_per_chunk: int = 1000) -> Iterator[str]:
+  # One chunk per result line would mean 100k sends for a large upload.
+  chunk: list[str] = []
+  for result in results:
+    chunk.append(json.dumps(result, ensure_ascii=False))
+    if len(chunk) >= lines_per_chunk:
+      yield "\n".join(chunk) + "\n"
+      chunk.clear()
+  if chunk:
+    yield "\n".join(chunk) + "\n"
+
+
+def _find_template(template_id: Optional[str], template_slug: Optional[str]) -> dict[str, Any]:
+  template_row = None
+  if template_id:
+    template_row = get_template_by_id(template_id)
+    if not template_row and template_slug:
+      template_row = get_template_by_slug(template_slug)
+  elif template_slug:
+    template_row = get_template_by_slug(template_slug)
+
+  if not template_row:
+    logger.warning(
+      "Template not found when creating instance (template_id=%s, template_slug=%s).",
+      template_id,
+      template_slug,
+    )
+    raise HTTPException(status_code=404, detail="Template not found.")
+  return template_row
@@ -0,0 +1,26 @@
+"""Operational counters for sizing caches and pools."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import APIRouter
+
+from .. import async_db, db
+from ..callbacks import callback_dispatcher_stats
+from ..compression import PAGE_CACHE
+from ..render import RENDER_PLAN_CACHE
+from ..write_behind import write_queue_stats
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("")
+def read_metrics() -> dict[str, Any]:
+  return {
+    "render_plan_cache": RENDER_PLAN_CACHE.stats(),
+    "page_cache": PAGE_CACHE.stats(),
+    "db_pool": {"sync": db.pool_stats(), "async": async_db.pool_stats()},
+    "submission_write_queue": write_queue_stats(),
+    "callback_dispatcher": callback_dispatcher_stats(),
+  }
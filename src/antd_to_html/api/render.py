@@ -0,0 +1,44 @@
+"""Batch rendering endpoint."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import APIRouter
+
+from ..batch import render_batch
+from ..models import BatchRenderRequest, BatchRenderResponse, BatchRenderResult
+from ..repositories import get_instances_with_templates
+from .runtime import merge_definition_with_runtime
+
+router = APIRouter(prefix="/render", tags=["render"])
+
+
+@router.post("/batch", response_model=BatchRenderResponse)
+def render_forms_batch(payload: BatchRenderRequest) -> BatchRenderResponse:
+  instance_ids = sorted({item.instance_id for item in payload.items if item.instance_id})
+  records = get_instances_with_templates(instance_ids)
+
+  jobs: list[dict[str, Any]] = []
+  results: list[BatchRenderResult] = []
+  pending: list[int] = []
+  for index, item in enumerate(payload.items):
+    result = BatchRenderResult(index=index, instance_id=item.instance_id)
+    results.append(result)
+    if item.instance_id:
+      record = records.get(item.instance_id)
+      if not record:
+        result.error = "Instance not found."
+        continue
+      runtime_config = record["instance"].get("runtime_config") or {}
+      definition, html_options = merge_definition_with_runtime(record["template"], runtime_config, item.instance_id)
+      html_options = {**html_options, **item.html_options}
+    else:
+      definition, html_options = item.definition, item.html_options
+    jobs.append({"definition": definition, "html_options": html_options})
+    pending.append(index)
+
+  for index, rendered in zip(pending, render_batch(jobs)):
+    results[index] = results[index].model_copy(update=rendered)
+
+  return BatchRenderResponse(results=results)
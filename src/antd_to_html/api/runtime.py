@@ -2,74 +2,330 @@
 
 from __future__ import annotations
 
+import hashlib
 from copy import deepcopy
-
-from fastapi import APIRouter, HTTPException, Response
-
-from ..models import Submission, SubmissionCreate
-from ..render import convert_antd_form_to_html
-from ..repositories import (
-  RepositoryError,
-  get_instance,
-  get_instance_with_template,
-  get_submission,
-  save_submission,
+from typing import Any, Iterator, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from .. import async_repositories
+from ..callbacks import callback_job, get_callback_dispatcher
+from ..compression import (
+  SUPPORTED_ENCODINGS,
+  CompressedPage,
+  cached_page,
+  negotiate_encoding,
+  page_response,
+  page_tags,
+  store_page,
 )
+from ..config import get_settings
+from ..http_cache import is_not_modified, latest_modified, not_modified_response, validator_headers, version_etag
+from ..idempotency import IDEMPOTENCY_KEY_MAX_LENGTH, request_fingerprint
+from ..models import Submission, SubmissionCreate
+from ..option_index import OPTION_INDEX_CACHE, build_option_index, select_options
+from ..render import RENDERER_VERSION, convert_antd_form_to_html, iter_antd_form_html
+from ..repositories import RepositoryError, get_instance_with_template, save_rendered_page
 
 router = APIRouter(tags=["runtime"])
 
 
 @router.get("/forms/{instance_id}/view", response_class=Response)
-def render_form(instance_id: str) -> Response:
+async def render_form(instance_id: str, request: Request, stream: bool = False) -> Response:
+  if stream:
+    record = await _require_instance_record(instance_id)
+    try:
+      chunks = await run_in_threadpool(_stream_instance_page, record)
+    except ValueError as exc:
+      raise _validation_error(exc) from exc
+    return StreamingResponse(chunks, media_type="text/html; charset=utf-8")
+
+  versions = await async_repositories.get_instance_versions(instance_id)
+  if not versions:
+    raise HTTPException(status_code=404, detail="Instance not found.")
+
+  key = _page_key(versions)
+  encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+  last_modified = latest_modified(versions["instance_updated_at"], versions["template_updated_at"])
+  headers = validator_headers(version_etag(key, encoding), last_modified)
+  if is_not_modified(request.headers, headers["ETag"], last_modified):
+    return not_modified_response(headers)
+
+  page = cached_page(key)
+  if page is None:
+    try:
+      page = await _build_instance_page(versions)
+    except ValueError as exc:
+      raise _validation_error(exc) from exc
+    store_page(key, page, page_tags(versions["template_id"], instance_id))
+
+  if encoding is None or encoding in page.variants:
+    return page_response(page, encoding, headers)
+  # The first request for an encoding compresses the page; keep that off the event loop.
+  return await run_in_threadpool(page_response, page, encoding, headers)
+
+
+async def _build_instance_page(versions: dict) -> CompressedPage:
+  instance_id = versions["instance_id"]
+  prerender = get_settings().prerender_pages
+  if prerender:
+    stored = _stored_page(await async_repositories.get_rendered_page(instance_id), versions)
+    if stored:
+      return stored
+
+  record = await _require_instance_record(instance_id)
+  page = await run_in_threadpool(render_instance_page, record, encode_all=prerender)
+  if prerender:
+    await async_repositories.save_rendered_page(instance_id, rendered_page_row(record, page))
+  return page
+
+
+def prerender_instance_page(instance_id: str) -> CompressedPage:
+  """Render an instance page with every encoded variant and store it in ``form_rendered_pages``."""
   record = get_instance_with_template(instance_id)
   if not record:
     raise HTTPException(status_code=404, detail="Instance not found.")
+  page = render_instance_page(record, encode_all=True)
+  save_rendered_page(instance_id, rendered_page_row(record, page))
+  return page
+
+
+def render_instance_page(record: dict, *, encode_all: bool = False) -> CompressedPage:
+  definition, html_options = _merged_definition(record)
+  html = convert_antd_form_to_html(definition, options={"html": html_options}, version=_plan_version(record))
+  page = CompressedPage(html.encode("utf-8"))
+  if encode_all:
+    for encoding in SUPPORTED_ENCODINGS:
+      page.encoded(encoding)
+  return page
+
+
+def rendered_page_row(record: dict, page: CompressedPage) -> dict[str, Any]:
+  instance, template = record["instance"], record["template"]
+  return {
+    "template_id": template["id"],
+    "template_version": template["version"],
+    "template_updated_at": template["updated_at"],
+    "instance_updated_at": instance["updated_at"],
+    "renderer_version": page_version(),
+    "content_hash": hashlib.sha256(page.body).hexdigest(),
+    "html": page.body,
+    "html_gzip": page.variants.get("gzip"),
+    "html_br": page.variants.get("br"),
+  }
+
+
+_STORED_PAGE_VERSION_COLUMNS = ("template_id", "template_version", "template_updated_at", "instance_updated_at")
+
+
+def _stored_page(row: Optional[dict], versions: dict) -> Optional[CompressedPage]:
+  """The stored page, unless the template, instance or renderer changed since it was rendered."""
+  if not row or row["renderer_version"] != page_version():
+    return None
+  if any(row[column] != versions[column] for column in _STORED_PAGE_VERSION_COLUMNS):
+    return None
+  variants = {
+    encoding: bytes(row[column])
+    for encoding, column in (("gzip", "html_gzip"), ("br", "html_br"))
+    if row[column] is not None
+  }
+  return CompressedPage(bytes(row["html"]), variants=variants)
+
+
+def _stream_instance_page(record: dict) -> Iterator[str]:
+  definition, html_options = _merged_definition(record)
+  return iter_antd_form_html(definition, options={"html": html_options}, version=_plan_version(record))
+
 
-  instance = record["instance"]
-  template = record["template"]
+# runtime_config keys merged into the static (non-submit) parts of the page.
+_STATIC_RUNTIME_KEYS = ("definition", "definitionOverrides", "html", "htmlOptions")
+
+
+def _plan_version(record: dict) -> tuple:
+  """Render plan cache key: instances without static overrides share their template's plan."""
+  instance, template = record["instance"], record["template"]
+  version: tuple = ("template", template["id"], template["version"], template["updated_at"])
   runtime_config = instance.get("runtime_config") or {}
+  if any(runtime_config.get(key) for key in _STATIC_RUNTIME_KEYS):
+    version += ("instance", instance["id"], instance["updated_at"])
+  return version
 
-  definition, html_options = merge_definition_with_runtime(template, runtime_config, instance["id"])
 
-  try:
-    html = convert_antd_form_to_html(definition, options={"html": html_options})
-  except ValueError as exc:
-    detail = getattr(exc, "details", None)
-    raise HTTPException(status_code=422, detail=detail or str(exc)) from exc
+def _merged_definition(record: dict) -> tuple[dict, dict]:
+  runtime_config = record["instance"].get("runtime_config") or {}
+  return merge_definition_with_runtime(record["template"], runtime_config, record["instance"]["id"])
+
+
+async def _require_instance_record(instance_id: str) -> dict:
+  record = await async_repositories.get_instance_with_template(instance_id)
+  if not record:
+    raise HTTPException(status_code=404, detail="Instance not found.")
+  return record
 
-  return Response(content=html, media_type="text/html; charset=utf-8")
+
+def _validation_error(exc: ValueError) -> HTTPException:
+  detail = getattr(exc, "details", None)
+  return HTTPException(status_code=422, detail=detail or str(exc))
 
 
 @router.post("/forms/{instance_id}/submissions", response_model=Submission)
-def submit_form(instance_id: str, payload: SubmissionCreate) -> Submission:
-  record = get_instance_with_template(instance_id)
-  if not record:
+async def submit_form(
+  instance_id: str,
+  payload: SubmissionCreate,
+  response: Response,
+  idempotency_key: str | None = Header(default=None, min_length=1, max_length=IDEMPOTENCY_KEY_MAX_LENGTH),
+) -> Submission:
+  # Server-side callbacks need the template's submit config as well.
+  dispatch = get_settings().callback_dispatch
+  if dispatch:
+    record = await async_repositories.get_instance_with_template(instance_id)
+    instance = record["instance"] if record else None
+  else:
+    instance = await async_repositories.get_instance(instance_id)
+  if not instance:
     raise HTTPException(status_code=404, detail="Instance not found.")
 
   if not payload.status:
     payload.status = "submitted"
 
+  runtime_config = instance.get("runtime_config") or {}
+  append = submission_mode(runtime_config) == "append"
   try:
-    row = save_submission(instance_id, payload)
+    row, replayed = await _save_submission(instance_id, payload, append, idempotency_key)
   except RepositoryError as exc:
     raise HTTPException(status_code=500, detail=str(exc)) from exc
+  if replayed:
+    response.headers["Idempotent-Replayed"] = "true"
+    return Submission.model_validate(row)
+
+  if dispatch and row["callback_status"] == "pending":
+    job = callback_job(runtime_submit_config(record["template"], runtime_config, instance_id), row)
+    if job:
+      get_callback_dispatcher().enqueue(job)
 
   return Submission.model_validate(row)
 
 
+async def _save_submission(
+  instance_id: str,
+  payload: SubmissionCreate,
+  append: bool,
+  idempotency_key: Optional[str],
+) -> tuple[dict[str, Any], bool]:
+  """The saved row, or the stored response for a retried ``Idempotency-Key`` (second item True)."""
+  if not idempotency_key:
+    return await async_repositories.save_submission(instance_id, payload, append=append), False
+
+  settings = get_settings()
+  fingerprint = request_fingerprint(payload)
+  claim, row = await async_repositories.save_submission_once(
+    instance_id,
+    payload,
+    append=append,
+    key=idempotency_key,
+    request_hash=fingerprint,
+    ttl=settings.idempotency_key_ttl,
+    # Re-running an abandoned append-mode write could add a second row.
+    claim_timeout=None if append else settings.idempotency_claim_timeout,
+  )
+  if row is not None:
+    return row, False
+  if claim["request_hash"] is not None and claim["request_hash"] != fingerprint:
+    raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request.")
+  if claim["response"] is None:
+    raise HTTPException(
+      status_code=409,
+      detail="A request with this Idempotency-Key is still in progress.",
+      headers={"Retry-After": "1"},
+    )
+  return claim["response"], True
+
+
 @router.get("/forms/{instance_id}/submissions", response_model=Submission)
-def load_submission(instance_id: str, submission_id: str | None = None) -> Submission:
-  instance = get_instance(instance_id)
+async def load_submission(
+  instance_id: str,
+  submission_id: str | None = None,
+  respondent_key: str | None = None,
+) -> Submission:
+  instance = await async_repositories.get_instance(instance_id)
   if not instance:
     raise HTTPException(status_code=404, detail="Instance not found.")
 
-  row = get_submission(instance_id, submission_id=submission_id)
+  append = submission_mode(instance.get("runtime_config") or {}) == "append"
+  if append and not submission_id and respondent_key is None:
+    # "Latest" would be another respondent's answers.
+    raise HTTPException(status_code=404, detail="Submission not found.")
+
+  row = await async_repositories.get_submission(
+    instance_id, submission_id=submission_id, respondent_key=respondent_key if append else None
+  )
   if not row:
     raise HTTPException(status_code=404, detail="Submission not found.")
 
   return Submission.model_validate(row)
 
 
+@router.get("/forms/{instance_id}/fields/{name}/options")
+async def search_field_options(
+  instance_id: str,
+  name: str,
+  q: str = "",
+  limit: int = Query(20, ge=1, le=200),
+) -> dict[str, Any]:
+  versions = await async_repositories.get_instance_versions(instance_id)
+  if not versions:
+    raise HTTPException(status_code=404, detail="Instance not found.")
+
+  # Instances that override the definition get their own index; others share the template's.
+  overrides = bool(versions["has_definition_overrides"])
+  key = (
+    versions["template_id"],
+    versions["template_version"],
+    versions["template_updated_at"],
+    instance_id if overrides else None,
+    versions["instance_updated_at"] if overrides else None,
+    name,
+  )
+
+  index = OPTION_INDEX_CACHE.get(key)
+  if index is None:
+    record = await async_repositories.get_instance_with_template(instance_id)
+    options = await run_in_threadpool(_instance_select_options, record, name) if record else None
+    if options is None:
+      raise HTTPException(status_code=404, detail="Select field not found.")
+    index = await run_in_threadpool(build_option_index, key, options)
+  return {"options": index.search(q, limit), "total": len(index)}
+
+
+def _instance_select_options(record: dict, name: str) -> Optional[list]:
+  definition, _ = _merged_definition(record)
+  return select_options(definition, name)
+
+
+def _page_key(versions: dict) -> tuple:
+  return (
+    "view",
+    versions["instance_id"],
+    versions["instance_updated_at"],
+    versions["template_id"],
+    versions["template_version"],
+    versions["template_updated_at"],
+    page_version(),
+  )
+
+
+def page_version() -> str:
+  """``RENDERER_VERSION`` plus the settings baked into instance pages.
+
+  ``CALLBACK_DISPATCH`` decides whether the page's script sends callbacks itself,
+  so pages (cached, stored or held by browsers via their ETag) rendered under
+  the other setting must not be reused.
+  """
+  return f"{RENDERER_VERSION}+server-callbacks" if get_settings().callback_dispatch else RENDERER_VERSION
+
+
 def merge_definition_with_runtime(template: dict, runtime_config: dict, instance_id: str) -> tuple[dict, dict]:
   definition = deepcopy(template.get("definition") or {})
   html_options = deepcopy(template.get("html_options") or {})
@@ -86,7 +342,25 @@ def merge_definition_with_runtime(template: dict, runtime_config: dict, instance
   if isinstance(html_overrides, dict):
     html_options.update(html_overrides)
 
-  submit_config = definition.setdefault("submit", {})
+  _finish_submit_config(definition.setdefault("submit", {}), runtime_config, instance_id)
+  return definition, html_options
+
+
+def runtime_submit_config(template: dict, runtime_config: dict, instance_id: str) -> dict:
+  """The ``submit`` section :func:`merge_definition_with_runtime` would produce, without copying the fields."""
+  submit_override = runtime_config.get("submit")
+  if isinstance(submit_override, dict):
+    submit_config = deepcopy(submit_override)
+  else:
+    submit_config = deepcopy((template.get("definition") or {}).get("submit") or {})
+    definition_overrides = runtime_config.get("definition") or runtime_config.get("definitionOverrides")
+    if isinstance(definition_overrides, dict) and isinstance(definition_overrides.get("submit"), dict):
+      _deep_merge(submit_config, definition_overrides["submit"])
+  _finish_submit_config(submit_config, runtime_config, instance_id)
+  return submit_config
+
+
+def _finish_submit_config(submit_config: dict, runtime_config: dict, instance_id: str) -> None:
   submission_runtime = runtime_config.get("submission") or {}
   _normalize_submit_config(submit_config, submission_runtime)
 
@@ -104,7 +378,8 @@ def merge_definition_with_runtime(template: dict, runtime_config: dict, instance
   if submission_runtime.get("loadOnInit") is not None:
     submit_config["loadSubmissionOnInit"] = bool(submission_runtime["loadOnInit"])
   elif "loadSubmissionOnInit" not in submit_config:
-    submit_config["loadSubmissionOnInit"] = True
+    # Append-mode pages start blank: the latest row belongs to someone else.
+    submit_config["loadSubmissionOnInit"] = submission_mode(runtime_config) != "append"
 
   if "updateText" not in submit_config:
     submit_config["updateText"] = (
@@ -114,7 +389,26 @@ def merge_definition_with_runtime(template: dict, runtime_config: dict, instance
   if submission_runtime.get("submissionId"):
     submit_config["submissionId"] = submission_runtime["submissionId"]
 
-  return definition, html_options
+  # With CALLBACK_DISPATCH the service sends callbacks; an instance can opt out with serverCallback: false.
+  submit_config["serverCallback"] = bool(
+    get_settings().callback_dispatch
+    and submit_config.get("callback_url")
+    and submit_config.get("serverCallback", True)
+  )
+
+
+def submission_mode(runtime_config: dict) -> str:
+  """``"append"`` (one submission per respondent) or ``"single"`` (default, one per instance).
+
+  Set per instance via ``submit.persistence.mode`` or ``submission.mode`` in ``runtime_config``.
+  """
+  submit = runtime_config.get("submit")
+  persistence = submit.get("persistence") if isinstance(submit, dict) else None
+  submission = runtime_config.get("submission")
+  for source in (persistence, submission):
+    if isinstance(source, dict) and source.get("mode"):
+      return "append" if source["mode"] == "append" else "single"
+  return "single"
 
 
 def _deep_merge(target: dict, overrides: dict) -> None:
@@ -3,21 +3,29 @@
 from __future__ import annotations
 
 from copy import deepcopy
-from typing import Any, Mapping
-
-from fastapi import APIRouter, HTTPException, Response
-
-from ..models import Template, TemplateCreate
-from ..render import convert_antd_form_to_html
-from ..repositories import (
-  RepositoryError,
-  TemplateConflictError,
-  create_template,
-  delete_template_by_id,
-  get_template_by_id,
-  get_template_by_slug,
+from typing import Any, Iterator, Literal, Mapping, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from .. import async_repositories
+from ..compression import (
+  CompressedPage,
+  cached_page,
+  invalidate_pages,
+  negotiate_encoding,
+  page_response,
+  page_tags,
+  store_page,
 )
+from ..http_cache import is_not_modified, latest_modified, not_modified_response, validator_headers, version_etag
+from ..models import SubmissionPage, Template, TemplateCreate, TemplateImportResponse
+from ..option_index import OPTION_INDEX_CACHE, build_option_index, select_options
+from ..render import RENDERER_VERSION, collect_field_names, convert_antd_form_to_html, iter_antd_form_html
+from ..repositories import InvalidCursorError, RepositoryError, TemplateConflictError
 from ..schema_validator import validate_form_definition
+from ..template_import import import_templates
 
 router = APIRouter(prefix="/form-templates", tags=["form-templates"])
 
@@ -51,13 +59,13 @@ PREVIEW_BANNER_HTML = (
 
 
 @router.post("", response_model=Template)
-def create_form_template(payload: TemplateCreate) -> Template:
-  errors = validate_form_definition(payload.definition)
+async def create_form_template(payload: TemplateCreate) -> Template:
+  errors = await run_in_threadpool(validate_form_definition, payload.definition)
   if errors:
     raise HTTPException(status_code=422, detail=errors)
 
   try:
-    row = create_template(payload)
+    row = await async_repositories.create_template(payload)
   except TemplateConflictError as exc:
     raise HTTPException(status_code=409, detail=str(exc)) from exc
   except RepositoryError as exc:
@@ -66,21 +74,164 @@ def create_form_template(payload: TemplateCreate) -> Template:
   return Template.model_validate(row)
 
 
+@router.post("/import", response_model=TemplateImportResponse)
+async def import_form_templates(request: Request) -> TemplateImportResponse:
+  """Bulk-create templates from an NDJSON body, one ``TemplateCreate`` per line."""
+  body = await request.body()
+  summary = await run_in_threadpool(import_templates, body.splitlines())
+  return TemplateImportResponse.model_validate(summary)
+
+
 @router.get("/{identifier}", response_model=Template)
-def read_form_template(identifier: str) -> Template:
-  template = _get_template_by_identifier(identifier)
+async def read_form_template(identifier: str) -> Template:
+  template = await _get_template_by_identifier(identifier)
   return Template.model_validate(template)
 
 
 @router.delete("/{identifier}", status_code=204)
-def delete_form_template(identifier: str) -> None:
-  template = _get_template_by_identifier(identifier)
-  delete_template_by_id(str(template["id"]))
+async def delete_form_template(identifier: str) -> None:
+  template = await _get_template_by_identifier(identifier)
+  await async_repositories.delete_template_by_id(str(template["id"]))
+  invalidate_pages(template_id=str(template["id"]))
 
 
 @router.get("/{identifier}/preview", response_class=Response)
-def preview_form_template(identifier: str) -> Response:
-  template = _get_template_by_identifier(identifier)
+async def preview_form_template(identifier: str, request: Request, stream: bool = False) -> Response:
+  if stream:
+    template = await _get_template_by_identifier(identifier)
+    chunks = await run_in_threadpool(_stream_preview, template)
+    return StreamingResponse(_inject_preview_chrome_stream(chunks), media_type="text/html; charset=utf-8")
+
+  versions = await async_repositories.get_template_versions(identifier)
+  if not versions:
+    raise HTTPException(status_code=404, detail="Template not found.")
+
+  key = ("preview", versions["template_id"], versions["template_version"], versions["template_updated_at"], RENDERER_VERSION)
+  encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+  last_modified = latest_modified(versions["template_updated_at"])
+  headers = validator_headers(version_etag(key, encoding), last_modified)
+  if is_not_modified(request.headers, headers["ETag"], last_modified):
+    return not_modified_response(headers)
+
+  page = cached_page(key)
+  if page is None:
+    template = await _get_template_by_identifier(versions["template_id"])
+    body = await run_in_threadpool(_render_preview, template)
+    page = store_page(key, CompressedPage(body.encode("utf-8")), page_tags(versions["template_id"]))
+
+  if encoding is None or encoding in page.variants:
+    return page_response(page, encoding, headers)
+  return await run_in_threadpool(page_response, page, encoding, headers)
+
+
+@router.get("/{identifier}/fields/{name}/options")
+async def search_template_field_options(
+  identifier: str,
+  name: str,
+  q: str = "",
+  limit: int = Query(20, ge=1, le=200),
+) -> dict[str, Any]:
+  versions = await async_repositories.get_template_versions(identifier)
+  if not versions:
+    raise HTTPException(status_code=404, detail="Template not found.")
+
+  key = (
+    versions["template_id"],
+    versions["template_version"],
+    versions["template_updated_at"],
+    None,
+    None,
+    name,
+  )
+
+  index = OPTION_INDEX_CACHE.get(key)
+  if index is None:
+    template = await async_repositories.get_template_by_id(versions["template_id"])
+    options = await run_in_threadpool(_template_select_options, template, name) if template else None
+    if options is None:
+      raise HTTPException(status_code=404, detail="Select field not found.")
+    index = await run_in_threadpool(build_option_index, key, options)
+  return {"options": index.search(q, limit), "total": len(index)}
+
+
+@router.get("/{identifier}/submissions", response_model=SubmissionPage)
+async def list_template_submissions(
+  identifier: str,
+  limit: int = Query(50, ge=1, le=200),
+  cursor: Optional[str] = None,
+  status: Optional[str] = None,
+  callback_status: Optional[str] = None,
+) -> SubmissionPage:
+  """Submissions across all instances of the template, newest first, keyset-paginated."""
+  versions = await async_repositories.get_template_versions(identifier)
+  if not versions:
+    raise HTTPException(status_code=404, detail="Template not found.")
+  try:
+    page = await async_repositories.list_submissions(
+      "template_id",
+      versions["template_id"],
+      limit=limit,
+      cursor=cursor,
+      status=status,
+      callback_status=callback_status,
+    )
+  except InvalidCursorError as exc:
+    raise HTTPException(status_code=422, detail=str(exc)) from exc
+  return SubmissionPage.model_validate(page)
+
+
+@router.get("/{identifier}/submissions/export")
+async def export_template_submissions(
+  identifier: str,
+  format: Literal["ndjson", "csv"] = "ndjson",
+) -> StreamingResponse:
+  """Stream all submissions of the template's instances without buffering them.
+
+  CSV has one column per form field (``payload.values``); NDJSON keeps the full payload.
+  """
+  template = await _get_template_by_identifier(identifier)
+  template_id = str(template["id"])
+  headers = {"Content-Disposition": f'attachment; filename="submissions.{format}"'}
+  if format == "csv":
+    field_names = collect_field_names((template.get("definition") or {}).get("items") or [])
+    chunks = async_repositories.export_submissions_csv(template_id, field_names)
+    return StreamingResponse(chunks, media_type="text/csv; charset=utf-8", headers=headers)
+  chunks = async_repositories.export_submissions_ndjson(template_id)
+  return StreamingResponse(chunks, media_type="application/x-ndjson", headers=headers)
+
+
+async def _get_template_by_identifier(identifier: str) -> Mapping[str, Any]:
+  template = (
+    await async_repositories.get_template_by_id(identifier)
+    or await async_repositories.get_template_by_slug(identifier)
+  )
+  if not template:
+    raise HTTPException(status_code=404, detail="Template not found.")
+  return template
+
+
+def _template_select_options(template: Mapping[str, Any], name: str) -> Optional[list]:
+  return select_options(template.get("definition") or {}, name)
+
+
+def _render_preview(template: Mapping[str, Any]) -> str:
+  preview_definition, html_options = _build_preview(template)
+  html = convert_antd_form_to_html(
+    preview_definition, options={"html": html_options}, version=_preview_version(template)
+  )
+  return _inject_preview_chrome(html)
+
+
+def _stream_preview(template: Mapping[str, Any]) -> Iterator[str]:
+  preview_definition, html_options = _build_preview(template)
+  return iter_antd_form_html(preview_definition, options={"html": html_options}, version=_preview_version(template))
+
+
+def _preview_version(template: Mapping[str, Any]) -> tuple:
+  return ("preview", template["id"], template["version"], template["updated_at"])
+
+
+def _build_preview(template: Mapping[str, Any]) -> tuple[Mapping[str, Any], dict[str, Any]]:
   definition = deepcopy(template.get("definition") or {})
   html_options = deepcopy(template.get("html_options") or {})
 
@@ -95,17 +246,7 @@ def preview_form_template(identifier: str) -> Response:
     html_options["title"] = f"{current_title} · 预览"
   else:
     html_options["title"] = "表单模板 · 预览"
-
-  html = convert_antd_form_to_html(preview_definition, options={"html": html_options})
-  html = _inject_preview_chrome(html)
-  return Response(content=html, media_type="text/html; charset=utf-8")
-
-
-def _get_template_by_identifier(identifier: str) -> Mapping[str, Any]:
-  template = get_template_by_id(identifier) or get_template_by_slug(identifier)
-  if not template:
-    raise HTTPException(status_code=404, detail="Template not found.")
-  return template
+  return preview_definition, html_options
 
 
 def _build_preview_definition(definition: Mapping[str, Any]) -> Mapping[str, Any]:
@@ -136,3 +277,10 @@ def _inject_preview_chrome(html: str) -> str:
   if '<div class="form-container">' in updated:
     updated = updated.replace('<div class="form-container">', f"{PREVIEW_BANNER_HTML}\n  <div class=\"form-container\">", 1)
   return updated
+
+
+def _inject_preview_chrome_stream(chunks: Iterator[str]) -> Iterator[str]:
+  # The first chunk always carries both </head> and the form container opening tag.
+  first = next(chunks, "")
+  yield _inject_preview_chrome(first)
+  yield from chunks
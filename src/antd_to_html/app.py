@@ -2,14 +2,73 @@
 
 from __future__ import annotations
 
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
-from .api import instances, runtime, templates
+from fastapi import FastAPI, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
+from psycopg_pool import PoolTimeout, TooManyRequests
+
+from . import async_db, db, repositories
+from .api import assets, instances, metrics, render, runtime, templates
+from .assets import configure_asset_store, persist_shared_assets
+from .batch import shutdown_render_pool
+from .callbacks import close_callback_dispatcher
+from .config import get_settings
+from .idempotency import create_idempotency_cleaner
+from .invalidation import create_invalidation_listener
+from .write_behind import close_write_queue
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+  db.open_pool()
+  await async_db.open_pool()
+  listener = create_invalidation_listener() if get_settings().cache_invalidation_listen else None
+  if listener:
+    listener.start()
+  cleaner = create_idempotency_cleaner()
+  if cleaner:
+    cleaner.start()
+  try:
+    yield
+  finally:
+    if cleaner:
+      await cleaner.stop()
+    if listener:
+      await asyncio.to_thread(listener.stop)
+    shutdown_render_pool()
+    await asyncio.to_thread(persist_shared_assets)
+    await close_callback_dispatcher()
+    await close_write_queue()
+    await async_db.close_pool()
+    db.close_pool()
+
+
+async def database_unavailable(request: Request, exc: Exception) -> JSONResponse:
+  """Pool saturated (acquire timeout or too many waiters): tell clients to retry instead of hanging."""
+  return JSONResponse(
+    status_code=503,
+    content={"detail": "Database connection unavailable, please retry."},
+    headers={"Retry-After": "1"},
+  )
 
 
 def create_app() -> FastAPI:
-  app = FastAPI(title="antd-to-html service", version="0.1.0")
+  configure_asset_store(load=repositories.get_static_asset, save=repositories.save_static_asset)
+  settings = get_settings()
+  app = FastAPI(title="antd-to-html service", version="0.1.0", lifespan=lifespan)
+  # Rendered pages arrive pre-compressed (Content-Encoding set) and are skipped here;
+  # this covers JSON and streamed responses.
+  app.add_middleware(GZipMiddleware, minimum_size=settings.compression_min_size, compresslevel=settings.gzip_level)
+  app.add_exception_handler(PoolTimeout, database_unavailable)
+  app.add_exception_handler(TooManyRequests, database_unavailable)
   app.include_router(templates.router)
   app.include_router(instances.router)
   app.include_router(runtime.router)
+  app.include_router(render.router)
+  app.include_router(metrics.router)
+  app.include_router(assets.router)
   return app
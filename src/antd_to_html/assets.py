@@ -0,0 +1,161 @@
+"""Content-fingerprinted static assets served alongside rendered forms."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from .cache import LRUCache
+from .config import get_settings
+
+ASSET_URL_PREFIX = "/static"
+ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+MEDIA_TYPES = {
+  "js": "text/javascript; charset=utf-8",
+  "css": "text/css; charset=utf-8",
+}
+
+# Lookups of unknown filenames are remembered briefly so /static probes do not each cost a query.
+MISSING_ASSET_TTL = 5.0
+# Unsaved shared assets are retried this often while the store is failing.
+PERSIST_RETRY_DELAY = 5.0
+
+_builtin: Dict[str, "StaticAsset"] = {}
+_shared: LRUCache[str, "StaticAsset"] = LRUCache(get_settings().asset_cache_size)
+# Shared assets not yet in the store; kept out of the LRU so they cannot be evicted before they are saved.
+_unsaved: Dict[str, "StaticAsset"] = {}
+_missing: LRUCache[str, bool] = LRUCache(1024, ttl=MISSING_ASSET_TTL)
+_lock = threading.Lock()
+_persist_wakeup = threading.Event()
+_persister: Optional[threading.Thread] = None
+_store_loader: Optional[Callable[[str], Optional[Mapping[str, Any]]]] = None
+_store_saver: Optional[Callable[[str, str, bytes], None]] = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class StaticAsset:
+  filename: str
+  digest: str
+  content: bytes
+  media_type: str
+
+  @property
+  def etag(self) -> str:
+    return f'"{self.digest}"'
+
+  def url(self, base_url: Optional[str] = None) -> str:
+    return f"{(base_url or ASSET_URL_PREFIX).rstrip('/')}/{self.filename}"
+
+
+def configure_asset_store(
+  *,
+  load: Callable[[str], Optional[Mapping[str, Any]]],
+  save: Callable[[str, str, bytes], None],
+) -> None:
+  """Back shared assets with durable storage so every worker can serve them."""
+  global _store_loader, _store_saver
+  _store_loader = load
+  _store_saver = save
+
+
+def register_asset(stem: str, content: str, extension: str, *, shared: bool = False) -> StaticAsset:
+  """Register ``content`` under ``<stem>.<hash>.<extension>`` and return it.
+
+  Built-in assets are identical in every process and stay registered. ``shared``
+  assets come from user data (custom styles): they live in a bounded LRU and are
+  written to the configured store by a background thread, not by the render, so
+  workers that did not render the page can serve them too.
+  """
+  data = content.encode("utf-8")
+  digest = hashlib.sha256(data).hexdigest()[:16]
+  filename = f"{stem}.{digest}.{extension}"
+  asset = StaticAsset(
+    filename=filename,
+    digest=digest,
+    content=data,
+    media_type=MEDIA_TYPES.get(extension, "application/octet-stream"),
+  )
+  if not shared:
+    with _lock:
+      return _builtin.setdefault(filename, asset)
+
+  existing = _shared.get(filename)
+  if existing is not None:
+    return existing
+  with _lock:
+    existing = _unsaved.get(filename)
+    if existing is not None:
+      return existing
+    if _store_saver is None:
+      _shared.set(filename, asset)
+      return asset
+    _unsaved[filename] = asset
+  _missing.pop(filename)
+  _wake_persister()
+  return asset
+
+
+def get_asset(filename: str) -> Optional[StaticAsset]:
+  with _lock:
+    asset = _builtin.get(filename) or _unsaved.get(filename)
+  if asset is None:
+    asset = _shared.get(filename)
+  if asset is not None or _store_loader is None or filename in _missing:
+    return asset
+
+  row = _store_loader(filename)
+  if not row:
+    _missing.set(filename, True)
+    return None
+  asset = StaticAsset(
+    filename=filename,
+    digest=filename.split(".")[-2],
+    content=bytes(row["content"]),
+    media_type=row["media_type"],
+  )
+  _shared.set(filename, asset)
+  return asset
+
+
+def persist_shared_assets() -> int:
+  """Write unsaved shared assets to the store; returns how many are still unsaved."""
+  saver = _store_saver
+  with _lock:
+    pending = list(_unsaved.values())
+  if saver is None:
+    return len(pending)
+  for asset in pending:
+    try:
+      saver(asset.filename, asset.media_type, asset.content)
+    except Exception:  # noqa: BLE001 - kept unsaved and retried
+      logger.warning("Failed to persist static asset %s; will retry.", asset.filename, exc_info=True)
+      continue
+    _shared.set(asset.filename, asset)
+    with _lock:
+      _unsaved.pop(asset.filename, None)
+  with _lock:
+    return len(_unsaved)
+
+
+def _wake_persister() -> None:
+  global _persister
+  with _lock:
+    if _persister is None:
+      _persister = threading.Thread(target=_persist_loop, name="asset-persister", daemon=True)
+      _persister.start()
+  _persist_wakeup.set()
+
+
+def _persist_loop() -> None:
+  while True:
+    _persist_wakeup.wait()
+    _persist_wakeup.clear()
+    if persist_shared_assets():
+      _persist_wakeup.wait(PERSIST_RETRY_DELAY)
+      _persist_wakeup.set()
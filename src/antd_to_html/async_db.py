@@ -0,0 +1,76 @@
+"""Async PostgreSQL connection utilities, mirroring :mod:`db` for ``async def`` endpoints."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Iterable, Optional
+
+from psycopg import AsyncConnection, rows
+from psycopg.abc import Query
+from psycopg_pool import AsyncConnectionPool
+
+from .db import apply_prepare_settings, describe_pool, pool_options, prepare_flag
+
+_pool: Optional[AsyncConnectionPool] = None
+_pool_lock = asyncio.Lock()
+
+
+async def _ensure_pool() -> AsyncConnectionPool:
+  global _pool
+  if _pool is None:
+    async with _pool_lock:
+      if _pool is None:
+        pool = AsyncConnectionPool(name="async", open=False, configure=_configure_connection, **pool_options())
+        await pool.open(wait=False)
+        _pool = pool
+  return _pool
+
+
+async def _configure_connection(conn: AsyncConnection) -> None:
+  apply_prepare_settings(conn)
+
+
+async def open_pool() -> None:
+  await _ensure_pool()
+
+
+async def close_pool() -> None:
+  global _pool
+  if _pool is not None:
+    pool, _pool = _pool, None
+    await pool.close()
+
+
+def pool_stats() -> Optional[dict[str, Any]]:
+  return describe_pool(_pool) if _pool is not None else None
+
+
+@asynccontextmanager
+async def get_connection() -> AsyncIterator[AsyncConnection]:
+  pool = await _ensure_pool()
+  async with pool.connection() as conn:
+    yield conn
+
+
+async def fetch_one(query: Query, params: Iterable[Any] | None = None):
+  async with get_connection() as conn:
+    async with conn.cursor(row_factory=rows.dict_row) as cur:
+      await cur.execute(query, params or (), prepare=prepare_flag(query))
+      return await cur.fetchone()
+
+
+async def fetch_all(query: Query, params: Iterable[Any] | None = None):
+  async with get_connection() as conn:
+    async with conn.cursor(row_factory=rows.dict_row) as cur:
+      await cur.execute(query, params or (), prepare=prepare_flag(query))
+      return await cur.fetchall()
+
+
+async def execute(query: Query, params: Iterable[Any] | None = None):
+  async with get_connection() as conn:
+    async with conn.cursor(row_factory=rows.dict_row) as cur:
+      await cur.execute(query, params or (), prepare=prepare_flag(query))
+      if cur.description:
+        return await cur.fetchone()
+      return None
@@ -0,0 +1,247 @@
+"""Async counterparts of :mod:`repositories`, sharing its SQL and row mapping."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Literal, Optional
+
+from psycopg import rows
+from psycopg.errors import UniqueViolation
+
+from . import async_db
+from .config import get_settings
+from .db import prepare_flag
+from .models import SubmissionCreate, TemplateCreate
+from .repositories import (
+  CALLBACK_RESULT_SQL,
+  CLAIM_IDEMPOTENCY_KEY_SQL,
+  DELETE_EXPIRED_IDEMPOTENCY_KEYS_SQL,
+  DELETE_TEMPLATE_SQL,
+  INSERT_TEMPLATE_SQL,
+  INSTANCE_BY_ID_SQL,
+  INSTANCE_VERSIONS_SQL,
+  INSTANCE_WITH_TEMPLATE_SQL,
+  RELEASE_IDEMPOTENCY_KEY_SQL,
+  RENDERED_PAGE_SQL,
+  SAVE_RENDERED_PAGE_SQL,
+  STORE_IDEMPOTENT_RESPONSE_SQL,
+  SUBMISSION_EXPORT_NDJSON_SQL,
+  TEMPLATE_BY_ID_SQL,
+  TEMPLATE_BY_SLUG_SQL,
+  TEMPLATE_VERSIONS_SQL,
+  RepositoryError,
+  idempotency_claim_params,
+  idempotent_response,
+  split_instance_with_template,
+  submission_page,
+  submission_page_query,
+  submission_read,
+  submission_export_csv_sql,
+  submission_write,
+  template_conflict,
+  template_insert_params,
+)
+from .write_behind import get_write_queue
+
+
+async def create_template(data: TemplateCreate) -> dict[str, Any]:
+  try:
+    row = await async_db.execute(INSERT_TEMPLATE_SQL, template_insert_params(data))
+  except UniqueViolation as exc:
+    raise template_conflict(exc) from exc
+
+  if not row:
+    raise RepositoryError("Failed to insert template.")
+  return row
+
+
+async def get_template_by_id(template_id: str) -> Optional[dict[str, Any]]:
+  return await async_db.fetch_one(TEMPLATE_BY_ID_SQL, (template_id,))
+
+
+async def get_template_by_slug(slug: str) -> Optional[dict[str, Any]]:
+  return await async_db.fetch_one(TEMPLATE_BY_SLUG_SQL, (slug,))
+
+
+async def delete_template_by_id(template_id: str) -> None:
+  await async_db.execute(DELETE_TEMPLATE_SQL, (template_id,))
+
+
+async def get_instance(instance_id: str) -> Optional[dict[str, Any]]:
+  return await async_db.fetch_one(INSTANCE_BY_ID_SQL, (instance_id,))
+
+
+async def get_instance_versions(instance_id: str) -> Optional[dict[str, Any]]:
+  return await async_db.fetch_one(INSTANCE_VERSIONS_SQL, (instance_id,))
+
+
+async def get_template_versions(identifier: str) -> Optional[dict[str, Any]]:
+  return await async_db.fetch_one(TEMPLATE_VERSIONS_SQL, (identifier, identifier, identifier))
+
+
+async def get_instance_with_template(instance_id: str) -> Optional[dict[str, Any]]:
+  row = await async_db.fetch_one(INSTANCE_WITH_TEMPLATE_SQL, (instance_id,))
+  if not row:
+    return None
+  return split_instance_with_template(row)
+
+
+async def save_submission(instance_id: str, data: SubmissionCreate, *, append: bool = False) -> dict[str, Any]:
+  if get_settings().submission_write_behind:
+    return await get_write_queue().save(instance_id, data, append=append)
+  query, params = submission_write(instance_id, data, append=append)
+  row = await async_db.execute(query, params)
+  if not row:
+    raise RepositoryError("Failed to save submission.")
+  return row
+
+
+async def get_submission(
+  instance_id: str,
+  submission_id: Optional[str] = None,
+  respondent_key: Optional[str] = None,
+) -> Optional[dict[str, Any]]:
+  query, params = submission_read(instance_id, submission_id, respondent_key)
+  return await async_db.fetch_one(query, params)
+
+
+async def record_callback_result(
+  instance_id: str,
+  submission_id: str,
+  version: datetime,
+  *,
+  status: str,
+  callback_status: str,
+  callback_info: Optional[dict[str, Any]],
+) -> bool:
+  """Store a callback outcome unless the submission changed since ``version``; True if stored."""
+  info_json = json.dumps(callback_info) if callback_info is not None else None
+  row = await async_db.execute(
+    CALLBACK_RESULT_SQL, (status, callback_status, info_json, instance_id, submission_id, version)
+  )
+  return row is not None
+
+
+async def save_submission_once(
+  instance_id: str,
+  data: SubmissionCreate,
+  *,
+  append: bool,
+  key: str,
+  request_hash: str,
+  ttl: float,
+  claim_timeout: Optional[float],
+) -> tuple[dict[str, Any], Optional[dict[str, Any]]]:
+  """Save a submission at most once per Idempotency-Key; returns ``(claim, row)``.
+
+  ``row`` is None when the key was already taken; ``claim`` then carries the
+  stored ``request_hash`` and ``response`` (None while that write is unfinished).
+  Direct writes claim the key, save and store the response in one transaction,
+  so a failure anywhere leaves no trace and a concurrent retry waits for the
+  outcome. With write-behind the batch commits the write on its own: a process
+  that dies before storing the response leaves the claim without one, which
+  is taken over after ``claim_timeout`` (never, if it is None).
+  """
+  claim_params = idempotency_claim_params(
+    instance_id, key, request_hash, ttl=ttl, claim_timeout=claim_timeout
+  )
+  if get_settings().submission_write_behind:
+    claim = await async_db.execute(CLAIM_IDEMPOTENCY_KEY_SQL, claim_params)
+    if not claim["claimed"]:
+      return claim, None
+    try:
+      row = await get_write_queue().save(instance_id, data, append=append)
+    except Exception:
+      await async_db.execute(RELEASE_IDEMPOTENCY_KEY_SQL, (instance_id, key))
+      raise
+    await async_db.execute(STORE_IDEMPOTENT_RESPONSE_SQL, (idempotent_response(row), instance_id, key))
+    return claim, row
+
+  query, params = submission_write(instance_id, data, append=append)
+  async with async_db.get_connection() as conn:
+    async with conn.transaction(), conn.cursor(row_factory=rows.dict_row) as cur:
+      await cur.execute(CLAIM_IDEMPOTENCY_KEY_SQL, claim_params, prepare=prepare_flag(CLAIM_IDEMPOTENCY_KEY_SQL))
+      claim = await cur.fetchone()
+      if not claim["claimed"]:
+        return claim, None
+      await cur.execute(query, params, prepare=prepare_flag(query))
+      row = await cur.fetchone()
+      if not row:
+        raise RepositoryError("Failed to save submission.")
+      await cur.execute(
+        STORE_IDEMPOTENT_RESPONSE_SQL,
+        (idempotent_response(row), instance_id, key),
+        prepare=prepare_flag(STORE_IDEMPOTENT_RESPONSE_SQL),
+      )
+  return claim, row
+
+
+async def delete_expired_idempotency_keys(ttl: float, limit: int) -> int:
+  async with async_db.get_connection() as conn:
+    cur = await conn.execute(DELETE_EXPIRED_IDEMPOTENCY_KEYS_SQL, (ttl, limit))
+    return cur.rowcount
+
+
+async def get_rendered_page(instance_id: str) -> Optional[dict[str, Any]]:
+  return await async_db.fetch_one(RENDERED_PAGE_SQL, (instance_id,))
+
+
+async def save_rendered_page(instance_id: str, page: dict[str, Any]) -> None:
+  await async_db.execute(SAVE_RENDERED_PAGE_SQL, {"instance_id": instance_id, **page})
+
+
+async def list_submissions(
+  scope: Literal["instance_id", "template_id"],
+  scope_id: str,
+  *,
+  limit: int,
+  cursor: Optional[str] = None,
+  status: Optional[str] = None,
+  callback_status: Optional[str] = None,
+) -> dict[str, Any]:
+  query, params = submission_page_query(
+    scope, scope_id, limit=limit, cursor=cursor, status=status, callback_status=callback_status
+  )
+  return submission_page(await async_db.fetch_all(query, params), limit)
+
+
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+async def export_submissions_csv(template_id: str, field_names: list[str]) -> AsyncIterator[bytes]:
+  """Stream every submission of ``template_id`` as CSV via ``COPY ... TO STDOUT``, in ~64 KiB chunks."""
+  async with async_db.get_connection() as conn:
+    async with conn.transaction(), conn.cursor() as cur:
+      # Exports of millions of rows outlive any per-request statement timeout.
+      await cur.execute("SET LOCAL statement_timeout = 0")
+      async with cur.copy(submission_export_csv_sql(field_names), (template_id,)) as copy:
+        buffer = bytearray()
+        async for data in copy:
+          buffer += data
+          if len(buffer) >= EXPORT_CHUNK_BYTES:
+            yield bytes(buffer)
+            buffer.clear()
+        if buffer:
+          yield bytes(buffer)
+
+
+async def export_submissions_ndjson(template_id: str, *, fetch_size: int = 2000) -> AsyncIterator[bytes]:
+  """Stream every submission of ``template_id`` as NDJSON through a server-side cursor."""
+  async with async_db.get_connection() as conn:
+    async with conn.transaction():
+      await conn.execute("SET LOCAL statement_timeout = 0")
+      async with conn.cursor(name="submission_export") as cur:
+        cur.itersize = fetch_size
+        await cur.execute(SUBMISSION_EXPORT_NDJSON_SQL, (template_id,))
+        buffer: list[str] = []
+        size = 0
+        async for (line,) in cur:
+          buffer.append(line)
+          size += len(line) + 1
+          if size >= EXPORT_CHUNK_BYTES:
+            yield ("\n".join(buffer) + "\n").encode("utf-8")
+            buffer.clear()
+            size = 0
+        if buffer:
+          yield ("\n".join(buffer) + "\n").encode("utf-8")
@@ -0,0 +1,90 @@
+"""Render or validate many form definitions in parallel across worker processes."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, TypeVar
+
+from .config import get_settings
+from .render import convert_antd_form_to_html, register_page_assets
+from .schema_validator import validate_form_definition
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def render_batch(
+  jobs: Sequence[Mapping[str, Any]],
+  *,
+  executor: Optional[ProcessPoolExecutor] = None,
+) -> List[Dict[str, Any]]:
+  """Render ``{"definition": ..., "html_options": ...}`` jobs, preserving order.
+
+  Each result is ``{"html": ...}`` or ``{"error": ..., "details": [...]}`` so one
+  invalid definition does not fail the whole batch.
+  """
+  results = _map(render_job, jobs, executor)
+  # Worker processes register custom-style assets in their own memory only.
+  for job, result in zip(jobs, results):
+    if "html" in result:
+      register_page_assets({"html": job.get("html_options") or {}})
+  return results
+
+
+def validate_batch(
+  definitions: Sequence[Any],
+  *,
+  executor: Optional[ProcessPoolExecutor] = None,
+) -> List[List[str]]:
+  """Run :func:`validate_form_definition` over ``definitions``, preserving order."""
+  return _map(validate_form_definition, definitions, executor)
+
+
+def render_job(job: Mapping[str, Any]) -> Dict[str, Any]:
+  try:
+    html = convert_antd_form_to_html(job["definition"], options={"html": job.get("html_options") or {}})
+  except ValueError as exc:
+    return {"error": str(exc), "details": getattr(exc, "details", None)}
+  return {"html": html}
+
+
+def _map(fn: Callable[[T], R], items: Sequence[T], executor: Optional[ProcessPoolExecutor]) -> List[R]:
+  if not items:
+    return []
+  pool = executor or get_render_pool()
+  if pool is None or len(items) == 1:
+    return [fn(item) for item in items]
+
+  workers = getattr(pool, "_max_workers", None) or os.cpu_count() or 1
+  chunksize = max(1, len(items) // (workers * 4))
+  return list(pool.map(fn, items, chunksize=chunksize))
+
+
+def get_render_pool() -> Optional[ProcessPoolExecutor]:
+  """Shared pool sized by ``RENDER_POOL_WORKERS``; ``0`` renders in-process."""
+  global _executor
+  workers = get_settings().render_pool_workers
+  if workers == 0:
+    return None
+  with _executor_lock:
+    if _executor is None:
+      # spawn: the API process is multi-threaded, which makes fork unsafe.
+      _executor = ProcessPoolExecutor(
+        max_workers=workers if workers > 0 else None,
+        mp_context=multiprocessing.get_context("spawn"),
+      )
+    return _executor
+
+
+def shutdown_render_pool() -> None:
+  global _executor
+  with _executor_lock:
+    if _executor is not None:
+      _executor.shutdown(wait=False, cancel_futures=True)
+      _executor = None
@@ -0,0 +1,161 @@
+"""Small in-process caches shared by the renderer and the API layer."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Generic, Hashable, Iterable, Optional, Set, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class _Entry(Generic[V]):
+  value: V
+  size: int
+  expires_at: Optional[float]
+  tags: Tuple[Hashable, ...]
+
+
+class LRUCache(Generic[K, V]):
+  """Thread-safe, size-bounded LRU mapping with hit/miss/eviction counters.
+
+  Optionally bounded by total ``maxbytes`` (as measured by ``sizeof``), with
+  entries expiring ``ttl`` seconds after they are stored, and invalidation by
+  tag (e.g. every page rendered from one template).
+  """
+
+  def __init__(
+    self,
+    maxsize: int,
+    *,
+    maxbytes: Optional[int] = None,
+    ttl: Optional[float] = None,
+    sizeof: Optional[Callable[[V], int]] = None,
+  ) -> None:
+    if maxsize < 0:
+      raise ValueError("maxsize must not be negative")
+    self.maxsize = maxsize
+    self.maxbytes = maxbytes or None
+    self.ttl = ttl or None
+    self._sizeof = sizeof
+    self._data: "OrderedDict[K, _Entry[V]]" = OrderedDict()
+    self._tags: Dict[Hashable, Set[K]] = {}
+    self._lock = threading.Lock()
+    self.bytes = 0
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+    self.expirations = 0
+    self.invalidations = 0
+
+  def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+    with self._lock:
+      entry = self._data.get(key)
+      if entry is not None and entry.expires_at is not None and entry.expires_at <= time.monotonic():
+        self._remove(key)
+        self.expirations += 1
+        entry = None
+      if entry is None:
+        self.misses += 1
+        return default
+      self._data.move_to_end(key)
+      self.hits += 1
+      return entry.value
+
+  def set(self, key: K, value: V, tags: Iterable[Hashable] = ()) -> None:
+    if self.maxsize == 0:
+      return
+    size = self._sizeof(value) if self._sizeof else 0
+    if self.maxbytes is not None and size > self.maxbytes:
+      return
+    expires_at = time.monotonic() + self.ttl if self.ttl else None
+    with self._lock:
+      if key in self._data:
+        self._remove(key)
+      entry = _Entry(value, size, expires_at, tuple(tags))
+      self._data[key] = entry
+      self.bytes += size
+      for tag in entry.tags:
+        self._tags.setdefault(tag, set()).add(key)
+      self._enforce_bounds()
+
+  def reweigh(self, key: K) -> None:
+    """Re-measure ``key`` after its value grew in place, evicting others if needed."""
+    if self._sizeof is None:
+      return
+    with self._lock:
+      entry = self._data.get(key)
+      if entry is None:
+        return
+      size = self._sizeof(entry.value)
+      self.bytes += size - entry.size
+      entry.size = size
+      self._enforce_bounds()
+
+  def pop(self, key: K) -> Optional[V]:
+    with self._lock:
+      entry = self._remove(key)
+      return entry.value if entry else None
+
+  def invalidate_tag(self, tag: Hashable) -> int:
+    """Drop every entry stored with ``tag``; returns how many were removed."""
+    with self._lock:
+      keys = self._tags.pop(tag, set())
+      for key in keys:
+        self._remove(key)
+      self.invalidations += len(keys)
+      return len(keys)
+
+  def clear(self) -> None:
+    with self._lock:
+      self._data.clear()
+      self._tags.clear()
+      self.bytes = 0
+
+  def stats(self) -> Dict[str, Any]:
+    with self._lock:
+      lookups = self.hits + self.misses
+      return {
+        "size": len(self._data),
+        "maxsize": self.maxsize,
+        "bytes": self.bytes,
+        "maxbytes": self.maxbytes,
+        "ttl": self.ttl,
+        "hits": self.hits,
+        "misses": self.misses,
+        "evictions": self.evictions,
+        "expirations": self.expirations,
+        "invalidations": self.invalidations,
+        "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+      }
+
+  def _enforce_bounds(self) -> None:
+    while len(self._data) > self.maxsize or (self.maxbytes is not None and self.bytes > self.maxbytes):
+      oldest = next(iter(self._data))
+      self._remove(oldest)
+      self.evictions += 1
+
+  def _remove(self, key: K) -> Optional[_Entry[V]]:
+    entry = self._data.pop(key, None)
+    if entry is None:
+      return None
+    self.bytes -= entry.size
+    for tag in entry.tags:
+      keys = self._tags.get(tag)
+      if keys is not None:
+        keys.discard(key)
+        if not keys:
+          del self._tags[tag]
+    return entry
+
+  def __contains__(self, key: object) -> bool:
+    with self._lock:
+      return key in self._data
+
+  def __len__(self) -> int:
+    with self._lock:
+      return len(self._data)
@@ -0,0 +1,254 @@
+"""Server-side delivery of submission callbacks (``submit.callback.url``)."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from . import async_repositories
+from .config import get_settings
+from .submit_script import DEFAULT_HEADERS
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth another attempt: the receiver is overloaded or briefly broken.
+RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+@dataclass(eq=False)
+class CallbackJob:
+  instance_id: str
+  submission_id: str
+  version: datetime  # updated_at of the saved row
+  url: str
+  method: str
+  headers: dict[str, str]
+  body: dict[str, Any]
+  attempts: int = 0
+
+
+def callback_job(submit_config: Mapping[str, Any], row: Mapping[str, Any]) -> Optional[CallbackJob]:
+  """The delivery for a saved submission ``row``, or None if the server does not send its callback.
+
+  The request matches what the browser script sends: ``callback_params`` plus
+  ``feedback_data.user_collect_data``, with the configured method and headers.
+  """
+  url = submit_config.get("callback_url")
+  if not url or not submit_config.get("serverCallback"):
+    return None
+  params = submit_config.get("callback_params")
+  body = dict(params) if isinstance(params, Mapping) else {}
+  body["feedback_data"] = {"user_collect_data": row["payload"]}
+  return CallbackJob(
+    instance_id=row["instance_id"],
+    submission_id=row["id"],
+    version=row["updated_at"],
+    url=str(url),
+    method=str(submit_config.get("method") or "POST").upper(),
+    headers={**DEFAULT_HEADERS, **(submit_config.get("headers") or {})},
+    body=body,
+  )
+
+
+class CallbackDispatcher:
+  """Delivers callbacks off the request path.
+
+  Jobs are queued and picked up by one worker task, which starts a delivery
+  per job over a shared keep-alive connection pool. At most
+  ``host_concurrency`` deliveries run against one host at a time, so a slow
+  receiver cannot take every connection. Network errors and retryable
+  statuses are retried ``max_attempts`` times in total with exponential
+  backoff (full jitter). The outcome goes to the submission's ``status``,
+  ``callback_status`` and ``callback_info``. A delivery that never completes
+  (e.g. the process stops) leaves the row ``pending``.
+  """
+
+  def __init__(
+    self,
+    *,
+    max_attempts: int = 5,
+    backoff_base: float = 0.5,
+    backoff_max: float = 60.0,
+    host_concurrency: int = 4,
+    max_connections: int = 100,
+    timeout: float = 10.0,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+  ) -> None:
+    self.max_attempts = max(1, max_attempts)
+    self.backoff_base = max(0.0, backoff_base)
+    self.backoff_max = max(self.backoff_base, backoff_max)
+    self.host_concurrency = max(1, host_concurrency)
+    self._limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    self._timeout = timeout
+    self._transport = transport
+    self._client: Optional[httpx.AsyncClient] = None
+    self._queue: asyncio.Queue[CallbackJob] = asyncio.Queue()
+    self._worker: Optional[asyncio.Task[None]] = None
+    self._deliveries: set[asyncio.Task[None]] = set()
+    self._backoffs: set[asyncio.Task[None]] = set()
+    self._hosts: dict[str, asyncio.Semaphore] = {}
+    self._closing = False
+    self.enqueued = 0
+    self.delivered = 0
+    self.failed = 0
+    self.retries = 0
+    self.abandoned = 0
+
+  def enqueue(self, job: CallbackJob) -> None:
+    if self._closing:
+      self.abandoned += 1
+      logger.warning("Callback for submission %s not queued: dispatcher is shutting down.", job.submission_id)
+      return
+    if self._worker is None:
+      self._worker = asyncio.get_running_loop().create_task(self._run())
+    self.enqueued += 1
+    self._queue.put_nowait(job)
+
+  async def close(self, timeout: float = 5.0) -> None:
+    """Give queued and in-flight deliveries ``timeout`` seconds, then stop (used at shutdown)."""
+    self._closing = True
+    for task in self._backoffs:
+      task.cancel()
+    self.abandoned += len(self._backoffs)
+    while not self._queue.empty():
+      self._start(self._queue.get_nowait())
+    if self._deliveries:
+      await asyncio.wait(self._deliveries, timeout=timeout)
+    self.abandoned += len(self._deliveries)
+    tasks = [*self._deliveries, *self._backoffs, *([self._worker] if self._worker else [])]
+    for task in tasks:
+      task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    if self._client is not None:
+      await self._client.aclose()
+      self._client = None
+
+  def stats(self) -> dict[str, Any]:
+    return {
+      "queued": self._queue.qsize(),
+      "in_flight": len(self._deliveries),
+      "backing_off": len(self._backoffs),
+      "hosts": len(self._hosts),
+      "enqueued": self.enqueued,
+      "delivered": self.delivered,
+      "failed": self.failed,
+      "retries": self.retries,
+      "abandoned": self.abandoned,
+    }
+
+  async def _run(self) -> None:
+    while True:
+      self._start(await self._queue.get())
+
+  def _start(self, job: CallbackJob) -> None:
+    task = asyncio.get_running_loop().create_task(self._deliver(job))
+    self._deliveries.add(task)
+    task.add_done_callback(self._deliveries.discard)
+
+  async def _deliver(self, job: CallbackJob) -> None:
+    job.attempts += 1
+    async with self._host_slot(job.url):
+      try:
+        response = await self._http().request(job.method, job.url, json=job.body, headers=job.headers)
+      except httpx.HTTPError as exc:
+        response, error, retry = None, f"{type(exc).__name__}: {exc}", True
+      else:
+        error = f"Request failed with status {response.status_code}"
+        retry = response.status_code in RETRY_STATUSES
+
+    if response is not None and response.is_success:
+      self.delivered += 1
+      await self._record(job, "completed", "success", _response_info(response))
+      return
+    if retry and job.attempts < self.max_attempts and not self._closing:
+      self.retries += 1
+      task = asyncio.get_running_loop().create_task(self._retry_later(job))
+      self._backoffs.add(task)
+      task.add_done_callback(self._backoffs.discard)
+      return
+    self.failed += 1
+    logger.warning("Callback for submission %s failed after %d attempt(s): %s", job.submission_id, job.attempts, error)
+    await self._record(job, "failed", "failed", {"error": error, "attempts": job.attempts})
+
+  async def _retry_later(self, job: CallbackJob) -> None:
+    ceiling = min(self.backoff_max, self.backoff_base * 2 ** (job.attempts - 1))
+    await asyncio.sleep(random.uniform(0, ceiling))
+    self._queue.put_nowait(job)
+
+  async def _record(self, job: CallbackJob, status: str, callback_status: str, info: Optional[dict[str, Any]]) -> None:
+    try:
+      await async_repositories.record_callback_result(
+        job.instance_id,
+        job.submission_id,
+        job.version,
+        status=status,
+        callback_status=callback_status,
+        callback_info=info,
+      )
+    except Exception:
+      logger.exception("Could not record the callback result for submission %s.", job.submission_id)
+
+  def _host_slot(self, url: str) -> asyncio.Semaphore:
+    host = urlsplit(url).netloc.lower()
+    slot = self._hosts.get(host)
+    if slot is None:
+      slot = self._hosts[host] = asyncio.Semaphore(self.host_concurrency)
+    return slot
+
+  def _http(self) -> httpx.AsyncClient:
+    if self._client is None:
+      self._client = httpx.AsyncClient(
+        limits=self._limits,
+        timeout=self._timeout,
+        transport=self._transport,
+        follow_redirects=True,
+      )
+    return self._client
+
+
+def _response_info(response: httpx.Response) -> Optional[dict[str, Any]]:
+  """The receiver's JSON reply, stored as ``callback_info`` like the browser script does."""
+  if response.status_code == 204 or "application/json" not in response.headers.get("content-type", ""):
+    return None
+  try:
+    body = response.json()
+  except ValueError:
+    return None
+  return body if isinstance(body, dict) else {"response": body}
+
+
+_dispatcher: Optional[CallbackDispatcher] = None
+
+
+def get_callback_dispatcher() -> CallbackDispatcher:
+  global _dispatcher
+  if _dispatcher is None:
+    settings = get_settings()
+    _dispatcher = CallbackDispatcher(
+      max_attempts=settings.callback_max_attempts,
+      backoff_base=settings.callback_backoff_base,
+      backoff_max=settings.callback_backoff_max,
+      host_concurrency=settings.callback_host_concurrency,
+      max_connections=settings.callback_max_connections,
+      timeout=settings.callback_timeout,
+    )
+  return _dispatcher
+
+
+async def close_callback_dispatcher() -> None:
+  global _dispatcher
+  if _dispatcher is not None:
+    dispatcher, _dispatcher = _dispatcher, None
+    await dispatcher.close()
+
+
+def callback_dispatcher_stats() -> Optional[dict[str, Any]]:
+  return _dispatcher.stats() if _dispatcher is not None else None
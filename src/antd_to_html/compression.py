@@ -0,0 +1,138 @@
+"""Pre-compressed variants of rendered pages, negotiated from ``Accept-Encoding``."""
+
+from __future__ import annotations
+
+import gzip
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, Iterable, Mapping, Optional, Tuple
+
+from fastapi import Response
+
+from .cache import LRUCache
+from .config import get_settings
+
+try:
+  import brotli
+except ImportError:  # optional: pip install "antd-to-html-service[brotli]"
+  brotli = None
+
+HTML_MEDIA_TYPE = "text/html; charset=utf-8"
+# Server preference order when the client weighs several encodings equally.
+SUPPORTED_ENCODINGS: Tuple[str, ...] = ("br", "gzip") if brotli else ("gzip",)
+
+
+@dataclass
+class CompressedPage:
+  """A rendered page plus its encoded variants, each produced at most once."""
+
+  body: bytes
+  key: Optional[Hashable] = None
+  variants: Dict[str, bytes] = field(default_factory=dict)
+  _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+  @property
+  def nbytes(self) -> int:
+    return len(self.body) + sum(len(variant) for variant in self.variants.values())
+
+  def encoded(self, encoding: str) -> bytes:
+    variant = self.variants.get(encoding)
+    if variant is None:
+      with self._lock:
+        variant = self.variants.get(encoding)
+        if variant is None:
+          variant = compress(self.body, encoding)
+          self.variants[encoding] = variant
+      if self.key is not None:
+        PAGE_CACHE.reweigh(self.key)
+    return variant
+
+
+def _build_page_cache() -> LRUCache[Hashable, CompressedPage]:
+  settings = get_settings()
+  return LRUCache(
+    settings.page_cache_size if settings.page_cache_enabled else 0,
+    maxbytes=settings.page_cache_max_bytes,
+    ttl=settings.page_cache_ttl,
+    sizeof=lambda page: page.nbytes,
+  )
+
+
+PAGE_CACHE = _build_page_cache()
+
+
+def cached_page(key: Hashable) -> Optional[CompressedPage]:
+  return PAGE_CACHE.get(key)
+
+
+def store_page(key: Hashable, page: CompressedPage, tags: Iterable[Hashable] = ()) -> CompressedPage:
+  """Cache ``page`` under ``key``; async callers build the page off-loop and then store it."""
+  page.key = key
+  PAGE_CACHE.set(key, page, tags)
+  return page
+
+
+def page_tags(template_id: Optional[str] = None, instance_id: Optional[str] = None) -> Tuple[Hashable, ...]:
+  tags: Tuple[Hashable, ...] = ()
+  if template_id is not None:
+    tags += (("template", str(template_id)),)
+  if instance_id is not None:
+    tags += (("instance", str(instance_id)),)
+  return tags
+
+
+def invalidate_pages(template_id: Optional[str] = None, instance_id: Optional[str] = None) -> int:
+  """Evict cached pages rendered from a template (including its instances) or for one instance."""
+  return sum(PAGE_CACHE.invalidate_tag(tag) for tag in page_tags(template_id, instance_id))
+
+
+def page_response(
+  page: CompressedPage,
+  encoding: Optional[str],
+  headers: Optional[Mapping[str, str]] = None,
+  media_type: str = HTML_MEDIA_TYPE,
+) -> Response:
+  """Respond with the ``encoding`` variant (see :func:`negotiate_encoding`); small pages go out as-is."""
+  headers = {"Vary": "Accept-Encoding", **(headers or {})}
+  if encoding is None or len(page.body) < get_settings().compression_min_size:
+    return Response(content=page.body, media_type=media_type, headers=headers)
+  headers["Content-Encoding"] = encoding
+  return Response(content=page.encoded(encoding), media_type=media_type, headers=headers)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+  """Pick the best supported encoding, or None for identity."""
+  if not accept_encoding:
+    return None
+  weights: Dict[str, float] = {}
+  for part in accept_encoding.split(","):
+    name, _, params = part.strip().partition(";")
+    name = name.strip().lower()
+    if not name:
+      continue
+    quality = 1.0
+    params = params.strip()
+    if params.startswith("q="):
+      try:
+        quality = float(params[2:])
+      except ValueError:
+        quality = 0.0
+    weights[name] = quality
+
+  best: Optional[str] = None
+  best_quality = 0.0
+  for encoding in SUPPORTED_ENCODINGS:
+    quality = weights.get(encoding, weights.get("*", 0.0))
+    if quality > best_quality:
+      best, best_quality = encoding, quality
+  return best
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+  settings = get_settings()
+  if encoding == "gzip":
+    # mtime=0 keeps the bytes (and therefore any ETag over them) deterministic.
+    return gzip.compress(data, compresslevel=settings.gzip_level, mtime=0)
+  if encoding == "br" and brotli is not None:
+    return brotli.compress(data, quality=settings.brotli_quality, mode=brotli.MODE_TEXT)
+  raise ValueError(f"Unsupported content encoding: {encoding}")
@@ -19,6 +19,45 @@ class Settings:
   pg_database: str = "form"
   pg_user: str = "postgres"
   pg_password: str = ""
+  pg_pool_min_size: int = 1
+  pg_pool_max_size: int = 5
+  pg_pool_timeout: float = 10.0
+  pg_pool_max_waiting: int = 0
+  pg_pool_max_idle: float = 600.0
+  pg_pool_max_lifetime: float = 3600.0
+  pg_statement_timeout_ms: int = 0
+  pg_prepare_statements: bool = True
+  render_plan_cache_size: int = 256
+  render_plan_cache_max_bytes: int = 32 * 1024 * 1024
+  minify_submit_script: bool = True
+  option_index_cache_size: int = 64
+  asset_cache_size: int = 512
+  render_pool_workers: int = -1
+  page_cache_enabled: bool = True
+  page_cache_size: int = 128
+  page_cache_max_bytes: int = 64 * 1024 * 1024
+  page_cache_ttl: float = 300.0
+  gzip_level: int = 6
+  brotli_quality: int = 9
+  compression_min_size: int = 500
+  cache_invalidation_listen: bool = True
+  prerender_pages: bool = False
+  template_import_batch_size: int = 1000
+  instance_import_batch_size: int = 5000
+  submission_write_behind: bool = False
+  submission_batch_size: int = 64
+  submission_batch_delay_ms: float = 2.0
+  callback_dispatch: bool = False
+  callback_max_attempts: int = 5
+  callback_backoff_base: float = 0.5
+  callback_backoff_max: float = 60.0
+  callback_host_concurrency: int = 4
+  callback_max_connections: int = 100
+  callback_timeout: float = 10.0
+  idempotency_key_ttl: float = 24 * 3600.0
+  idempotency_claim_timeout: float = 60.0
+  idempotency_cleanup_interval: float = 300.0
+  idempotency_cleanup_batch_size: int = 5000
 
   @property
   def pg_dsn(self) -> str:
@@ -38,4 +77,56 @@ def get_settings() -> Settings:
     pg_database=os.getenv("PG_DATABASE", Settings.pg_database),
     pg_user=os.getenv("PG_USER", Settings.pg_user),
     pg_password=os.getenv("PG_PASSWORD", Settings.pg_password),
+    pg_pool_min_size=int(os.getenv("PG_POOL_MIN_SIZE", Settings.pg_pool_min_size)),
+    pg_pool_max_size=int(os.getenv("PG_POOL_MAX_SIZE", Settings.pg_pool_max_size)),
+    pg_pool_timeout=float(os.getenv("PG_POOL_TIMEOUT", Settings.pg_pool_timeout)),
+    pg_pool_max_waiting=int(os.getenv("PG_POOL_MAX_WAITING", Settings.pg_pool_max_waiting)),
+    pg_pool_max_idle=float(os.getenv("PG_POOL_MAX_IDLE", Settings.pg_pool_max_idle)),
+    pg_pool_max_lifetime=float(os.getenv("PG_POOL_MAX_LIFETIME", Settings.pg_pool_max_lifetime)),
+    pg_statement_timeout_ms=int(os.getenv("PG_STATEMENT_TIMEOUT_MS", Settings.pg_statement_timeout_ms)),
+    pg_prepare_statements=_env_bool("PG_PREPARE_STATEMENTS", Settings.pg_prepare_statements),
+    render_plan_cache_size=int(os.getenv("RENDER_PLAN_CACHE_SIZE", Settings.render_plan_cache_size)),
+    render_plan_cache_max_bytes=int(
+      os.getenv("RENDER_PLAN_CACHE_MAX_BYTES", Settings.render_plan_cache_max_bytes)
+    ),
+    minify_submit_script=_env_bool("SUBMIT_SCRIPT_MINIFY", Settings.minify_submit_script),
+    option_index_cache_size=int(os.getenv("OPTION_INDEX_CACHE_SIZE", Settings.option_index_cache_size)),
+    asset_cache_size=int(os.getenv("ASSET_CACHE_SIZE", Settings.asset_cache_size)),
+    render_pool_workers=int(os.getenv("RENDER_POOL_WORKERS", Settings.render_pool_workers)),
+    page_cache_enabled=_env_bool("PAGE_CACHE_ENABLED", Settings.page_cache_enabled),
+    page_cache_size=int(os.getenv("PAGE_CACHE_SIZE", Settings.page_cache_size)),
+    page_cache_max_bytes=int(os.getenv("PAGE_CACHE_MAX_BYTES", Settings.page_cache_max_bytes)),
+    page_cache_ttl=float(os.getenv("PAGE_CACHE_TTL", Settings.page_cache_ttl)),
+    gzip_level=int(os.getenv("GZIP_LEVEL", Settings.gzip_level)),
+    brotli_quality=int(os.getenv("BROTLI_QUALITY", Settings.brotli_quality)),
+    compression_min_size=int(os.getenv("COMPRESSION_MIN_SIZE", Settings.compression_min_size)),
+    cache_invalidation_listen=_env_bool("CACHE_INVALIDATION_LISTEN", Settings.cache_invalidation_listen),
+    prerender_pages=_env_bool("PRERENDER_PAGES", Settings.prerender_pages),
+    template_import_batch_size=int(os.getenv("TEMPLATE_IMPORT_BATCH_SIZE", Settings.template_import_batch_size)),
+    instance_import_batch_size=int(os.getenv("INSTANCE_IMPORT_BATCH_SIZE", Settings.instance_import_batch_size)),
+    submission_write_behind=_env_bool("SUBMISSION_WRITE_BEHIND", Settings.submission_write_behind),
+    submission_batch_size=int(os.getenv("SUBMISSION_BATCH_SIZE", Settings.submission_batch_size)),
+    submission_batch_delay_ms=float(os.getenv("SUBMISSION_BATCH_DELAY_MS", Settings.submission_batch_delay_ms)),
+    callback_dispatch=_env_bool("CALLBACK_DISPATCH", Settings.callback_dispatch),
+    callback_max_attempts=int(os.getenv("CALLBACK_MAX_ATTEMPTS", Settings.callback_max_attempts)),
+    callback_backoff_base=float(os.getenv("CALLBACK_BACKOFF_BASE", Settings.callback_backoff_base)),
+    callback_backoff_max=float(os.getenv("CALLBACK_BACKOFF_MAX", Settings.callback_backoff_max)),
+    callback_host_concurrency=int(os.getenv("CALLBACK_HOST_CONCURRENCY", Settings.callback_host_concurrency)),
+    callback_max_connections=int(os.getenv("CALLBACK_MAX_CONNECTIONS", Settings.callback_max_connections)),
+    callback_timeout=float(os.getenv("CALLBACK_TIMEOUT", Settings.callback_timeout)),
+    idempotency_key_ttl=float(os.getenv("IDEMPOTENCY_KEY_TTL", Settings.idempotency_key_ttl)),
+    idempotency_claim_timeout=float(os.getenv("IDEMPOTENCY_CLAIM_TIMEOUT", Settings.idempotency_claim_timeout)),
+    idempotency_cleanup_interval=float(
+      os.getenv("IDEMPOTENCY_CLEANUP_INTERVAL", Settings.idempotency_cleanup_interval)
+    ),
+    idempotency_cleanup_batch_size=int(
+      os.getenv("IDEMPOTENCY_CLEANUP_BATCH_SIZE", Settings.idempotency_cleanup_batch_size)
+    ),
   )
+
+
+def _env_bool(name: str, default: bool) -> bool:
+  value = os.getenv(name)
+  if value is None:
+    return default
+  return value.strip().lower() in {"1", "true", "yes", "on"}
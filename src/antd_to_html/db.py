@@ -2,30 +2,116 @@
 
 from __future__ import annotations
 
+import logging
+import threading
 from contextlib import contextmanager
-from typing import Any, Iterable, Optional
+from typing import Any, Callable, Iterable, Optional
 
-from psycopg import rows
+import psycopg
+from psycopg import rows, sql
+from psycopg.abc import Query
 from psycopg_pool import ConnectionPool
 
 from .config import get_settings
 
+logger = logging.getLogger(__name__)
+
 _pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+# Queries registered through prepared(); executed with prepare=True.
+_PREPARED_QUERIES: set[str] = set()
+# Headroom in psycopg's per-connection prepared-statement LRU for ad-hoc queries.
+_PREPARED_HEADROOM = 50
+
+
+def prepared(query: str) -> str:
+  """Register a hot query for server-side preparation and return it unchanged.
+
+  psycopg prepares it on its first execution on each connection (instead of
+  after ``prepare_threshold`` runs) and reuses the named statement afterwards.
+  """
+  _PREPARED_QUERIES.add(query)
+  return query
+
+
+def prepare_flag(query: Query) -> Optional[bool]:
+  # Composed queries are built per call and never registered.
+  registered = isinstance(query, str) and query in _PREPARED_QUERIES
+  return True if registered and get_settings().pg_prepare_statements else None
+
+
+def configure_connection(conn: psycopg.Connection) -> None:
+  """Pool ``configure`` hook applied to every new connection."""
+  apply_prepare_settings(conn)
+
+
+def apply_prepare_settings(conn: Any) -> None:
+  if get_settings().pg_prepare_statements:
+    # Keep every registered statement cached alongside ad-hoc ones.
+    conn.prepared_max = max(conn.prepared_max or 0, len(_PREPARED_QUERIES) + _PREPARED_HEADROOM)
+  else:
+    # Transaction-pooling proxies (e.g. PgBouncer) cannot route named statements.
+    conn.prepare_threshold = None
+
+
+def pool_options() -> dict[str, Any]:
+  """Pool arguments from ``Settings``, shared by the sync pool and :mod:`async_db`."""
+  settings = get_settings()
+  connection_kwargs: dict[str, Any] = {"autocommit": True}
+  if settings.pg_statement_timeout_ms > 0:
+    connection_kwargs["options"] = f"-c statement_timeout={settings.pg_statement_timeout_ms}"
+  return {
+    "conninfo": settings.pg_dsn,
+    "min_size": settings.pg_pool_min_size,
+    "max_size": settings.pg_pool_max_size,
+    "timeout": settings.pg_pool_timeout,
+    "max_waiting": settings.pg_pool_max_waiting,
+    "max_idle": settings.pg_pool_max_idle,
+    "max_lifetime": settings.pg_pool_max_lifetime,
+    "kwargs": connection_kwargs,
+  }
 
 
 def _ensure_pool() -> ConnectionPool:
   global _pool
   if _pool is None:
-    settings = get_settings()
-    _pool = ConnectionPool(
-      conninfo=settings.pg_dsn,
-      min_size=1,
-      max_size=5,
-      kwargs={"autocommit": True},
-    )
+    with _pool_lock:
+      if _pool is None:
+        pool = ConnectionPool(name="sync", open=False, configure=configure_connection, **pool_options())
+        # Don't block on min_size: workers connect in the background and the
+        # pool keeps retrying if Postgres is not reachable yet.
+        pool.open(wait=False)
+        _pool = pool
   return _pool
 
 
+def open_pool() -> None:
+  """Create the pool eagerly (app startup) so the first request does not pay for connecting."""
+  _ensure_pool()
+
+
+def close_pool() -> None:
+  global _pool
+  with _pool_lock:
+    if _pool is not None:
+      pool, _pool = _pool, None
+      pool.close()
+
+
+def pool_stats() -> Optional[dict[str, Any]]:
+  return describe_pool(_pool) if _pool is not None else None
+
+
+def describe_pool(pool: Any) -> dict[str, Any]:
+  """psycopg_pool counters plus derived saturation figures."""
+  stats: dict[str, Any] = pool.get_stats()
+  stats["connections_in_use"] = stats.get("pool_size", 0) - stats.get("pool_available", 0)
+  requests = stats.get("requests_num", 0)
+  stats["avg_wait_ms"] = stats.get("requests_wait_ms", 0) / requests if requests else 0.0
+  return stats
+
+
 @contextmanager
 def get_connection():
   pool = _ensure_pool()
@@ -33,24 +119,85 @@ def get_connection():
     yield conn
 
 
-def fetch_one(query: str, params: Iterable[Any] | None = None):
+def fetch_one(query: Query, params: Iterable[Any] | None = None):
   with get_connection() as conn:
     with conn.cursor(row_factory=rows.dict_row) as cur:
-      cur.execute(query, params or ())
+      cur.execute(query, params or (), prepare=prepare_flag(query))
       return cur.fetchone()
 
 
-def fetch_all(query: str, params: Iterable[Any] | None = None):
+def fetch_all(query: Query, params: Iterable[Any] | None = None):
   with get_connection() as conn:
     with conn.cursor(row_factory=rows.dict_row) as cur:
-      cur.execute(query, params or ())
+      cur.execute(query, params or (), prepare=prepare_flag(query))
       return cur.fetchall()
 
 
-def execute(query: str, params: Iterable[Any] | None = None):
+def execute(query: Query, params: Iterable[Any] | None = None):
   with get_connection() as conn:
     with conn.cursor(row_factory=rows.dict_row) as cur:
-      cur.execute(query, params or ())
+      cur.execute(query, params or (), prepare=prepare_flag(query))
       if cur.description:
         return cur.fetchone()
       return None
+
+
+class NotificationListener:
+  """Background thread that LISTENs on a channel and hands payloads to ``handler``.
+
+  Uses a dedicated connection outside the pool. ``on_reconnect`` runs after the
+  connection is (re-)established, since notifications sent while disconnected
+  are lost and callers usually need to drop everything they cached.
+  """
+
+  def __init__(
+    self,
+    channel: str,
+    handler: Callable[[str], None],
+    *,
+    on_reconnect: Optional[Callable[[], None]] = None,
+    poll_interval: float = 1.0,
+    retry_delay: float = 2.0,
+  ) -> None:
+    self.channel = channel
+    self.handler = handler
+    self.on_reconnect = on_reconnect
+    self.poll_interval = poll_interval
+    self.retry_delay = retry_delay
+    self._stop = threading.Event()
+    self._thread: Optional[threading.Thread] = None
+
+  def start(self) -> None:
+    if self._thread is not None:
+      return
+    self._stop.clear()
+    self._thread = threading.Thread(target=self._run, name=f"listen-{self.channel}", daemon=True)
+    self._thread.start()
+
+  def stop(self, timeout: Optional[float] = None) -> None:
+    self._stop.set()
+    if self._thread is not None:
+      self._thread.join(timeout if timeout is not None else self.poll_interval * 2)
+      self._thread = None
+
+  def _run(self) -> None:
+    connected_once = False
+    while not self._stop.is_set():
+      try:
+        with psycopg.connect(get_settings().pg_dsn, autocommit=True) as conn:
+          conn.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+          if connected_once and self.on_reconnect:
+            self.on_reconnect()
+          connected_once = True
+          while not self._stop.is_set():
+            for notify in conn.notifies(timeout=self.poll_interval):
+              self._dispatch(notify.payload)
+      except psycopg.Error:
+        logger.warning("LISTEN %s connection lost; retrying in %.1fs.", self.channel, self.retry_delay, exc_info=True)
+        self._stop.wait(self.retry_delay)
+
+  def _dispatch(self, payload: str) -> None:
+    try:
+      self.handler(payload)
+    except Exception:  # a bad payload must not kill the listener
+      logger.exception("Failed to handle notification on %s: %r", self.channel, payload)
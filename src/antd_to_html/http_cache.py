@@ -0,0 +1,59 @@
+"""Validators (ETag / Last-Modified) for conditional GETs on rendered pages."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from fastapi import Response
+
+# Pages are revalidated on every use; a matching validator costs one version lookup.
+PAGE_CACHE_CONTROL = "no-cache"
+
+
+def version_etag(version_key: Iterable[Any], encoding: Optional[str] = None) -> str:
+  """Strong ETag for a page version; each content encoding gets its own tag."""
+  digest = hashlib.sha256(json.dumps(list(version_key), default=str).encode("utf-8")).hexdigest()[:32]
+  return f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+
+
+def latest_modified(*timestamps: Optional[datetime]) -> Optional[datetime]:
+  present = [_as_utc(stamp) for stamp in timestamps if stamp is not None]
+  return max(present) if present else None
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+  headers = {"ETag": etag, "Cache-Control": PAGE_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+  if last_modified is not None:
+    headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+  return headers
+
+
+def is_not_modified(request_headers: Mapping[str, str], etag: str, last_modified: Optional[datetime]) -> bool:
+  """RFC 9110 evaluation: If-None-Match (weak comparison) wins over If-Modified-Since."""
+  if_none_match = request_headers.get("if-none-match")
+  if if_none_match is not None:
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+  if_modified_since = request_headers.get("if-modified-since")
+  if if_modified_since and last_modified is not None:
+    try:
+      since = _as_utc(parsedate_to_datetime(if_modified_since))
+    except (TypeError, ValueError):
+      return False
+    return last_modified.replace(microsecond=0) <= since
+  return False
+
+
+def not_modified_response(headers: Mapping[str, str]) -> Response:
+  return Response(status_code=304, headers=dict(headers))
+
+
+def _as_utc(value: datetime) -> datetime:
+  if value.tzinfo is None:
+    return value.replace(tzinfo=timezone.utc)
+  return value.astimezone(timezone.utc)
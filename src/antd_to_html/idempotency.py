@@ -0,0 +1,73 @@
+"""Idempotency-Key support for submission writes: request fingerprints and key expiry."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Optional
+
+from . import async_repositories
+from .config import get_settings
+from .models import SubmissionCreate
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+
+def request_fingerprint(payload: SubmissionCreate) -> str:
+  """Hash of the request body; a key reused with a different body is rejected, not replayed."""
+  body = json.dumps(payload.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+  return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class IdempotencyKeyCleaner:
+  """Deletes expired keys every ``interval`` seconds, ``batch_size`` rows per statement."""
+
+  def __init__(self, ttl: float, interval: float, batch_size: int) -> None:
+    self.ttl = ttl
+    self.interval = interval
+    self.batch_size = max(1, batch_size)
+    self._task: Optional[asyncio.Task[None]] = None
+
+  def start(self) -> None:
+    self._task = asyncio.get_running_loop().create_task(self._run())
+
+  async def stop(self) -> None:
+    if self._task is not None:
+      self._task.cancel()
+      await asyncio.gather(self._task, return_exceptions=True)
+      self._task = None
+
+  async def purge(self) -> int:
+    """Delete every expired key; short batches keep each transaction and its locks small."""
+    total = 0
+    while True:
+      deleted = await async_repositories.delete_expired_idempotency_keys(self.ttl, self.batch_size)
+      total += deleted
+      if deleted < self.batch_size:
+        return total
+
+  async def _run(self) -> None:
+    while True:
+      await asyncio.sleep(self.interval)
+      try:
+        deleted = await self.purge()
+      except Exception:
+        logger.warning("Idempotency key cleanup failed; retrying next interval.", exc_info=True)
+      else:
+        logger.debug("Deleted %d expired idempotency key(s).", deleted)
+
+
+def create_idempotency_cleaner() -> Optional[IdempotencyKeyCleaner]:
+  """The cleaner configured by ``IDEMPOTENCY_CLEANUP_INTERVAL``; ``0`` turns cleanup off."""
+  settings = get_settings()
+  if settings.idempotency_cleanup_interval <= 0:
+    return None
+  return IdempotencyKeyCleaner(
+    settings.idempotency_key_ttl,
+    settings.idempotency_cleanup_interval,
+    settings.idempotency_cleanup_batch_size,
+  )
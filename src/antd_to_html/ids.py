@@ -14,3 +14,16 @@ def generate_short_id(length: int = 9) -> str:
     raise ValueError("length must be positive")
   return "".join(secrets.choice(ALPHABET) for _ in range(length))
 
+
+def generate_short_ids(count: int, length: int = 9) -> list[str]:
+  """Batch variant of :func:`generate_short_id` drawing from one random buffer."""
+  if length <= 0:
+    raise ValueError("length must be positive")
+  needed = count * length
+  # Reject bytes >= 252 (7 * 36) so every character stays uniformly distributed.
+  limit = 256 - 256 % len(ALPHABET)
+  chars: list[str] = []
+  while len(chars) < needed:
+    chars.extend(ALPHABET[byte % len(ALPHABET)] for byte in secrets.token_bytes(needed - len(chars) + 16) if byte < limit)
+  text = "".join(chars[:needed])
+  return [text[start:start + length] for start in range(0, needed, length)]
@@ -0,0 +1,108 @@
+"""Bulk instance creation from NDJSON or CSV recipient lists."""
+
+from __future__ import annotations
+
+import csv
+import json
+from typing import Any, Iterable, Iterator, Optional, Union
+
+from pydantic import ValidationError
+
+from . import repositories
+from .config import get_settings
+from .models import InstanceBulkItem
+
+Line = Union[str, bytes]
+# CSV columns taken as-is; every other column is a dotted path into runtime_config.
+CSV_ITEM_COLUMNS = ("id", "name", "runtime_config")
+
+
+def create_instances(
+  template_id: str,
+  lines: Iterable[Line],
+  *,
+  csv_format: bool = False,
+  batch_size: Optional[int] = None,
+) -> Iterator[dict[str, Any]]:
+  """Create one instance of ``template_id`` per line, yielding per-line results as each batch commits.
+
+  The last item is ``{"summary": {"created", "conflicts", "invalid"}}``.
+  """
+  size = max(1, batch_size or get_settings().instance_import_batch_size)
+  counts = {"created": 0, "conflicts": 0, "invalid": 0}
+  pending: list[tuple[int, InstanceBulkItem]] = []
+
+  def flush() -> Iterator[dict[str, Any]]:
+    outcomes = repositories.create_instances(template_id, [item for _, item in pending])
+    for (line_number, _), outcome in zip(pending, outcomes):
+      counts["created" if outcome["created"] else "conflicts"] += 1
+      yield {
+        "line": line_number,
+        "id": outcome["id"],
+        "status": "created" if outcome["created"] else "conflict",
+        "error": outcome["error"],
+      }
+    pending.clear()
+
+  for line_number, item, error in parse_instance_lines(lines, csv_format=csv_format):
+    if item is None:
+      counts["invalid"] += 1
+      yield {"line": line_number, "id": None, "status": "invalid", **error}
+      continue
+    pending.append((line_number, item))
+    if len(pending) >= size:
+      yield from flush()
+  if pending:
+    yield from flush()
+  yield {"summary": counts}
+
+
+def parse_instance_lines(
+  lines: Iterable[Line],
+  *,
+  csv_format: bool = False,
+) -> Iterator[tuple[int, Optional[InstanceBulkItem], Optional[dict[str, Any]]]]:
+  """Yield ``(line_number, item, None)`` or ``(line_number, None, {"error", "details"})``; blank lines are skipped.
+
+  CSV input needs a header row and does not support newlines inside fields.
+  """
+  header: Optional[list[str]] = None
+  for line_number, raw in enumerate(lines, start=1):
+    line = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+    if not line.strip():
+      continue
+    if csv_format and header is None:
+      header = [column.strip() for column in next(csv.reader([line]))]
+      continue
+    try:
+      if csv_format:
+        item = _csv_item(header, next(csv.reader([line])))
+      else:
+        item = InstanceBulkItem.model_validate_json(line)
+    except ValidationError as exc:
+      yield line_number, None, {"error": "Invalid instance record.", "details": json.loads(exc.json(include_url=False))}
+    except ValueError as exc:
+      yield line_number, None, {"error": "Invalid instance record.", "details": str(exc)}
+    else:
+      yield line_number, item, None
+
+
+def _csv_item(header: list[str], values: list[str]) -> InstanceBulkItem:
+  if len(values) != len(header):
+    raise ValueError(f"Expected {len(header)} columns, got {len(values)}.")
+  row = dict(zip(header, values))
+  runtime_config = json.loads(row["runtime_config"]) if row.get("runtime_config") else {}
+  if not isinstance(runtime_config, dict):
+    raise ValueError("runtime_config must be a JSON object.")
+  for column, value in row.items():
+    if column in CSV_ITEM_COLUMNS or value == "":
+      continue
+    target = runtime_config
+    *parents, leaf = column.split(".")
+    for key in parents:
+      child = target.get(key)
+      if not isinstance(child, dict):
+        child = target[key] = {}
+      target = child
+    target[leaf] = value
+  return InstanceBulkItem(id=row.get("id") or None, name=row.get("name") or None, runtime_config=runtime_config)
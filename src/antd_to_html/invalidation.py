@@ -0,0 +1,42 @@
+"""Evict per-worker caches when templates or instances change in Postgres."""
+
+from __future__ import annotations
+
+import json
+import logging
+
+from .compression import PAGE_CACHE, invalidate_pages
+from .db import NotificationListener
+from .option_index import OPTION_INDEX_CACHE
+
+logger = logging.getLogger(__name__)
+
+# Must match the channel used by notify_form_cache_change() in schema.sql.
+CACHE_INVALIDATION_CHANNEL = "form_cache_invalidation"
+
+
+def handle_cache_notification(payload: str) -> None:
+  """Apply one trigger payload: ``{"table", "op", "id", "updated_at"}`` plus ``slug`` or ``template_id``."""
+  change = json.loads(payload)
+  table = change.get("table")
+  if table == "form_templates":
+    evicted = invalidate_pages(template_id=change["id"])
+  elif table == "form_instances":
+    evicted = invalidate_pages(instance_id=change["id"])
+  else:
+    return
+  logger.debug("%s %s %s evicted %d cached page(s).", change.get("op"), table, change.get("id"), evicted)
+
+
+def clear_caches() -> None:
+  """Drop everything; used after a listener reconnect, when notifications may have been missed."""
+  PAGE_CACHE.clear()
+  OPTION_INDEX_CACHE.clear()
+
+
+def create_invalidation_listener() -> NotificationListener:
+  return NotificationListener(
+    CACHE_INVALIDATION_CHANNEL,
+    handle_cache_notification,
+    on_reconnect=clear_caches,
+  )
@@ -27,6 +27,22 @@ class Template(TemplateCreate):
   updated_at: datetime
 
 
+class TemplateImportResult(BaseModel):
+  line: int
+  id: Optional[str] = None
+  slug: Optional[str] = None
+  status: str
+  error: Optional[str] = None
+  details: Optional[Any] = None
+
+
+class TemplateImportResponse(BaseModel):
+  created: int
+  conflicts: int
+  invalid: int
+  results: list[TemplateImportResult]
+
+
 class InstanceCreate(BaseModel):
   model_config = ConfigDict(extra="ignore")
 
@@ -43,6 +59,16 @@ class InstanceCreate(BaseModel):
     return self
 
 
+class InstanceBulkItem(BaseModel):
+  """One recipient in a bulk instance upload; the template comes from the request."""
+
+  model_config = ConfigDict(extra="ignore")
+
+  id: Optional[str] = None
+  name: Optional[str] = None
+  runtime_config: dict[str, Any] = Field(default_factory=dict)
+
+
 class Instance(InstanceCreate):
   id: str
   template_id: str
@@ -62,6 +88,8 @@ class SubmissionBase(BaseModel):
   status: str = "draft"
   callback_info: Optional[dict[str, Any]] = None
   callback_status: Optional[str] = Field(default=None, alias="callback_status")
+  # Append-mode instances keep one submission per respondent.
+  respondent_key: Optional[str] = None
 
 
 class SubmissionCreate(SubmissionBase):
@@ -71,5 +99,41 @@ class SubmissionCreate(SubmissionBase):
 class Submission(SubmissionBase):
   id: str
   instance_id: str
+  template_id: Optional[str] = None
   submitted_at: datetime
   updated_at: datetime
+
+
+class SubmissionPage(BaseModel):
+  items: list[Submission]
+  next_cursor: Optional[str] = None
+
+
+class BatchRenderItem(BaseModel):
+  model_config = ConfigDict(extra="ignore")
+
+  instance_id: Optional[str] = None
+  definition: Optional[dict[str, Any]] = None
+  html_options: dict[str, Any] = Field(default_factory=dict)
+
+  @model_validator(mode="after")
+  def ensure_single_source(self):
+    if bool(self.instance_id) == (self.definition is not None):
+      raise ValueError("Provide exactly one of instance_id or definition.")
+    return self
+
+
+class BatchRenderRequest(BaseModel):
+  items: list[BatchRenderItem]
+
+
+class BatchRenderResult(BaseModel):
+  index: int
+  instance_id: Optional[str] = None
+  html: Optional[str] = None
+  error: Optional[str] = None
+  details: Optional[Any] = None
+
+
+class BatchRenderResponse(BaseModel):
+  results: list[BatchRenderResult]
@@ -0,0 +1,93 @@
+"""Searchable indexes over large select option lists."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Iterable, Mapping
+from typing import Any, Dict, Hashable, List, Optional
+
+from .cache import LRUCache
+from .config import get_settings
+from .render import select_option_entry
+
+OPTION_INDEX_CACHE: LRUCache[Hashable, "OptionIndex"] = LRUCache(get_settings().option_index_cache_size)
+
+
+class OptionIndex:
+  """Prefix/substring search over ``(value, label)`` pairs, built once per template version."""
+
+  def __init__(self, options: Iterable[Any]) -> None:
+    self.entries: List[Dict[str, Any]] = []
+    for option in options:
+      if isinstance(option, Mapping):
+        value, label = select_option_entry(option)
+        self.entries.append({"value": value, "label": label})
+    self._folded = [_fold(entry["label"]) for entry in self.entries]
+    self._order = sorted(range(len(self.entries)), key=self._folded.__getitem__)
+    self._sorted_keys = [self._folded[index] for index in self._order]
+
+  def __len__(self) -> int:
+    return len(self.entries)
+
+  def search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+    """Prefix matches first (alphabetical), then substring matches (original order)."""
+    needle = _fold(query)
+    if not needle:
+      return self.entries[:limit]
+
+    matched: List[int] = []
+    position = bisect_left(self._sorted_keys, needle)
+    while position < len(self._sorted_keys) and len(matched) < limit:
+      if not self._sorted_keys[position].startswith(needle):
+        break
+      matched.append(self._order[position])
+      position += 1
+
+    if len(matched) < limit:
+      seen = set(matched)
+      for index, folded in enumerate(self._folded):
+        if index not in seen and needle in folded:
+          matched.append(index)
+          if len(matched) >= limit:
+            break
+
+    return [self.entries[index] for index in matched]
+
+
+def build_option_index(key: Hashable, options: Iterable[Any]) -> OptionIndex:
+  """Build and cache the index for ``key``; async callers run this in a worker thread."""
+  index = OptionIndex(options)
+  OPTION_INDEX_CACHE.set(key, index)
+  return index
+
+
+def select_options(definition: Mapping[str, Any], name: str) -> Optional[List[Any]]:
+  """Options of the select field ``name`` in ``definition``, or None if there is no such select."""
+  field = find_field(definition.get("items") or [], name)
+  if not field or field.get("type") != "select" or not isinstance(field.get("options"), list):
+    return None
+  return field["options"]
+
+
+def find_field(items: Iterable[Any], name: str) -> Optional[Mapping[str, Any]]:
+  """Locate a field by name, descending into nested ``items`` and form-list children."""
+  for item in items:
+    if not isinstance(item, Mapping):
+      continue
+    if item.get("name") == name:
+      return item
+    child_items = item.get("items")
+    if isinstance(child_items, list):
+      found = find_field(child_items, name)
+      if found:
+        return found
+    child = item.get("item")
+    if isinstance(child, Mapping):
+      found = find_field([child], name)
+      if found:
+        return found
+  return None
+
+
+def _fold(value: Any) -> str:
+  return str(value).casefold()
@@ -2,19 +2,34 @@
 
 from __future__ import annotations
 
-from collections.abc import Iterable, Mapping
-from typing import Any, Dict, List
-
-from .schema_validator import validate_form_definition
-from .submit_script import build_submit_script
+import hashlib
+import json
+import re
+from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+from urllib.parse import quote
+
+from .assets import StaticAsset, register_asset
+from .cache import LRUCache
+from .config import get_settings
+from .schema_validator import SUPPORTED_FIELD_TYPES, validate_form_definition, validate_submit_config
+from .submit_script import SUBMIT_SCRIPT_ASSET, build_submit_config_blob, build_submit_script
+
+# Bump whenever the generated markup changes so cached plans/pages are rebuilt.
+RENDERER_VERSION = "5"
 
 DEFAULT_HTML_OPTIONS = {
   "title": "Generated Form",
   "includeStyles": True,
   "styles": None,
+  "pruneStyles": True,
+  "assetMode": "inline",
+  "assetBaseUrl": None,
 }
 
-BASE_STYLES = """
+_CORE_STYLES = """
 :root {
   color-scheme: light;
   --primary-color: #1677ff;
@@ -83,18 +98,38 @@ body {
 }
 .form-label { font-size: 14px; font-weight: 600; color: var(--text-color); }
 .required-asterisk { color: var(--danger-color); margin-left: 4px; }
-.form-item > input,
-.form-item > select,
-.form-item > textarea,
-.form-item .radio-group,
-.form-item .checkbox-group,
-.form-item .switch,
-.form-item .form-list {
-  width: 100%;
+""".strip()
+
+# Width rule selector contributed by each field type (see TYPE_RENDERERS).
+_WIDTH_SELECTORS = {
+  "input": ".form-item > input",
+  "password": ".form-item > input",
+  "number": ".form-item > input",
+  "date-picker": ".form-item > input",
+  "select": ".form-item > select",
+  "textarea": ".form-item > textarea",
+  "radio-group": ".form-item .radio-group",
+  "checkbox-group": ".form-item .checkbox-group",
+  "switch": ".form-item .switch",
+  "form-list": ".form-item .form-list",
+  "remote-select": ".form-item .remote-select",
 }
-input,
-select,
-textarea {
+
+# Native control tag styled by each field type.
+_CONTROL_TAGS = {
+  "input": "input",
+  "password": "input",
+  "number": "input",
+  "date-picker": "input",
+  "switch": "input",
+  "radio-group": "input",
+  "checkbox-group": "input",
+  "select": "select",
+  "textarea": "textarea",
+  "remote-select": "input",
+}
+
+_CONTROL_DECLARATIONS = """
   width: 100%;
   border: 1px solid var(--border-color);
   border-radius: 10px;
@@ -104,19 +139,31 @@ textarea {
   transition: border-color 0.2s ease, box-shadow 0.2s ease;
   background-color: #fff;
   color: var(--text-color);
-}
-input:focus,
-select:focus,
-textarea:focus {
+""".strip("\n")
+
+_CONTROL_FOCUS_DECLARATIONS = """
   outline: none;
   border-color: var(--primary-color);
   box-shadow: 0 0 0 3px rgba(22, 119, 255, 0.15);
-}
+""".strip("\n")
+
+_DIVIDER_STYLES = """
 .form-divider {
   border: none;
   border-bottom: 1px dashed rgba(22, 119, 255, 0.3);
   margin: 32px 0;
 }
+""".strip()
+
+_REMOTE_SELECT_STYLES = """
+.remote-select {
+  display: flex;
+  flex-direction: column;
+  gap: 8px;
+}
+""".strip()
+
+_ACTION_STYLES = """
 .form-actions {
   display: flex;
   gap: 16px;
@@ -172,6 +219,38 @@ textarea:focus {
 }
 """.strip()
 
+
+@lru_cache(maxsize=128)
+def build_base_styles(field_types: frozenset[str]) -> str:
+  """Return BASE_STYLES reduced to the rules used by ``field_types``."""
+  blocks = [_CORE_STYLES]
+
+  width_selectors = list(
+    dict.fromkeys(selector for field_type, selector in _WIDTH_SELECTORS.items() if field_type in field_types)
+  )
+  if width_selectors:
+    blocks.append(_css_rule(width_selectors, "  width: 100%;"))
+
+  used_tags = {_CONTROL_TAGS.get(field_type) for field_type in field_types}
+  tags = [tag for tag in ("input", "select", "textarea") if tag in used_tags]
+  if tags:
+    blocks.append(_css_rule(tags, _CONTROL_DECLARATIONS))
+    blocks.append(_css_rule([f"{tag}:focus" for tag in tags], _CONTROL_FOCUS_DECLARATIONS))
+
+  if "divider" in field_types:
+    blocks.append(_DIVIDER_STYLES)
+  if "remote-select" in field_types:
+    blocks.append(_REMOTE_SELECT_STYLES)
+  blocks.append(_ACTION_STYLES)
+  return "\n".join(blocks)
+
+
+def _css_rule(selectors: List[str], declarations: str) -> str:
+  return ",\n".join(selectors) + " {\n" + declarations + "\n}"
+
+
+BASE_STYLES = build_base_styles(frozenset(SUPPORTED_FIELD_TYPES) | {"remote-select"})
+
 FORM_LIST_SCRIPT = """
 document.addEventListener('DOMContentLoaded', () => {
   document.querySelectorAll('.form-list').forEach(list => {
@@ -233,20 +312,311 @@ document.addEventListener('DOMContentLoaded', () => {
 });
 """.strip()
 
+REMOTE_SELECT_SCRIPT = """
+document.addEventListener('DOMContentLoaded', () => {
+  document.querySelectorAll('.remote-select').forEach(wrapper => {
+    const search = wrapper.querySelector('.remote-select-search');
+    const select = wrapper.querySelector('select');
+    const endpoint = wrapper.dataset.optionsEndpoint;
+    if (!search || !select || !endpoint) return;
+    const limit = parseInt(wrapper.dataset.limit, 10) || 20;
+    let timer = null;
+    let controller = null;
+
+    const applyOptions = entries => {
+      const kept = new Map();
+      Array.from(select.options).forEach(option => {
+        if (option.selected || option.value === '') kept.set(option.value, option);
+      });
+      select.textContent = '';
+      kept.forEach(option => select.appendChild(option));
+      entries.forEach(entry => {
+        const value = String(entry.value);
+        if (kept.has(value)) return;
+        const option = document.createElement('option');
+        option.value = value;
+        option.textContent = entry.label == null ? value : String(entry.label);
+        select.appendChild(option);
+      });
+    };
+
+    const query = () => {
+      if (controller) controller.abort();
+      controller = new AbortController();
+      const separator = endpoint.includes('?') ? '&' : '?';
+      const url = endpoint + separator + 'q=' + encodeURIComponent(search.value.trim()) + '&limit=' + limit;
+      fetch(url, { headers: { Accept: 'application/json' }, signal: controller.signal })
+        .then(response => (response.ok ? response.json() : { options: [] }))
+        .then(data => applyOptions(Array.isArray(data.options) ? data.options : []))
+        .catch(error => {
+          if (error && error.name !== 'AbortError' && console && console.warn) {
+            console.warn('[remote-select] search failed:', error);
+          }
+        });
+    };
+
+    search.addEventListener('input', () => {
+      clearTimeout(timer);
+      timer = setTimeout(query, 200);
+    });
+    search.addEventListener('focus', query, { once: true });
+  });
+});
+""".strip()
+
+BASE_STYLES_ASSET = register_asset("form", BASE_STYLES, "css")
+FORM_LIST_SCRIPT_ASSET = register_asset("form-list", FORM_LIST_SCRIPT, "js")
+REMOTE_SELECT_SCRIPT_ASSET = register_asset("remote-select", REMOTE_SELECT_SCRIPT, "js")
+
 DEFAULT_SPAN = 24
+DEFAULT_REMOTE_LIMIT = 20
+SUBMIT_SCRIPT_SLOT = "submit_script"
+
+
+def convert_antd_form_to_html(
+  definition: Mapping[str, Any],
+  *,
+  options: Mapping[str, Any] | None = None,
+  version: Hashable | None = None,
+) -> str:
+  """Render the page; ``version`` identifies the definition for the plan cache (see :func:`render_plan_key`)."""
+  html_options = resolve_html_options(options)
+  plan = get_render_plan(definition, html_options, version=version)
+  return plan.render(render_slot_values(definition, html_options))
+
+
+def iter_antd_form_html(
+  definition: Mapping[str, Any],
+  *,
+  options: Mapping[str, Any] | None = None,
+  version: Hashable | None = None,
+) -> Iterator[str]:
+  """Return an iterator over the page, ``<head>`` first and then one chunk per item.
+
+  Validation happens before the iterator is returned so callers can still turn
+  failures into an error response instead of a truncated page.
+  """
+  html_options = resolve_html_options(options)
+  key = render_plan_key(definition, html_options, version)
+  plan = RENDER_PLAN_CACHE.get(key)
+  if plan is not None:
+    _validate_submit_for_cached_plan(definition)
+    return plan.iter_chunks(render_slot_values(definition, html_options))
+
+  _raise_for_errors(validate_form_definition(definition))
+  return _stream_and_compile(definition, html_options, key, render_slot_values(definition, html_options))
+
+
+@dataclass(frozen=True)
+class RenderPlan:
+  """A compiled page: static segments with named slots between them."""
+
+  key: Hashable
+  segments: Tuple[str, ...]
+  slots: Tuple[str, ...]
+
+  @property
+  def size(self) -> int:
+    return sum(len(segment) for segment in self.segments)
+
+  def render(self, values: Mapping[str, str]) -> str:
+    parts = [self.segments[0]]
+    for name, segment in zip(self.slots, self.segments[1:]):
+      parts.append(values.get(name, ""))
+      parts.append(segment)
+    return "".join(parts).strip()
+
+  def iter_chunks(self, values: Mapping[str, str]) -> Iterator[str]:
+    yield self.segments[0]
+    for name, segment in zip(self.slots, self.segments[1:]):
+      value = values.get(name, "")
+      if value:
+        yield value
+      if segment:
+        yield segment
+
+
+@dataclass(frozen=True)
+class _Slot:
+  name: str
+
+
+def _build_render_plan_cache() -> LRUCache[Hashable, RenderPlan]:
+  settings = get_settings()
+  return LRUCache(
+    settings.render_plan_cache_size,
+    maxbytes=settings.render_plan_cache_max_bytes,
+    sizeof=lambda plan: plan.size,
+  )
+
+
+RENDER_PLAN_CACHE = _build_render_plan_cache()
+
+
+def resolve_html_options(options: Mapping[str, Any] | None) -> Dict[str, Any]:
+  html_options = dict(DEFAULT_HTML_OPTIONS)
+  if options:
+    html_options.update(options.get("html", {}))  # type: ignore[arg-type]
+  return html_options
+
+
+def render_plan_key(
+  definition: Mapping[str, Any],
+  html_options: Mapping[str, Any],
+  version: Hashable | None = None,
+) -> Hashable:
+  """Cache key for the static parts of the page.
+
+  Callers that know which stored template/instance versions produced
+  ``definition`` and ``html_options`` pass them as ``version``, which keeps
+  cache hits independent of the definition's size. Otherwise the key is a
+  content hash of both.
+  """
+  if version is not None:
+    return (RENDERER_VERSION, version)
+  static_definition = {key: value for key, value in definition.items() if key != "submit"}
+  raw = json.dumps(
+    [RENDERER_VERSION, static_definition, html_options],
+    sort_keys=True,
+    ensure_ascii=False,
+    separators=(",", ":"),
+    default=str,
+  )
+  return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def get_render_plan(
+  definition: Mapping[str, Any],
+  html_options: Mapping[str, Any],
+  *,
+  version: Hashable | None = None,
+) -> RenderPlan:
+  key = render_plan_key(definition, html_options, version)
+  plan = RENDER_PLAN_CACHE.get(key)
+  if plan is None:
+    plan = compile_render_plan(definition, html_options, key=key)
+    RENDER_PLAN_CACHE.set(key, plan)
+    return plan
+
+  _validate_submit_for_cached_plan(definition)
+  return plan
+
+
+def compile_render_plan(
+  definition: Mapping[str, Any],
+  html_options: Mapping[str, Any],
+  *,
+  key: Hashable | None = None,
+) -> RenderPlan:
+  _raise_for_errors(validate_form_definition(definition))
+  return _build_plan(
+    _iter_document(definition, html_options),
+    key or render_plan_key(definition, html_options),
+  )
+
+
+def _build_plan(parts: Iterable[str | _Slot], key: Hashable) -> RenderPlan:
+  segments: List[str] = []
+  slots: List[str] = []
+  current: List[str] = []
+  for part in parts:
+    if isinstance(part, _Slot):
+      segments.append("".join(current))
+      slots.append(part.name)
+      current = []
+    else:
+      current.append(part)
+  segments.append("".join(current))
+  return RenderPlan(key=key, segments=tuple(segments), slots=tuple(slots))
+
+
+def _stream_and_compile(
+  definition: Mapping[str, Any],
+  html_options: Mapping[str, Any],
+  key: Hashable,
+  values: Mapping[str, str],
+) -> Iterator[str]:
+  parts: List[str | _Slot] = []
+  for part in _iter_document(definition, html_options):
+    parts.append(part)
+    chunk = values.get(part.name, "") if isinstance(part, _Slot) else part
+    if chunk:
+      yield chunk
+  # Only cache once the whole page has been produced; abandoned streams are dropped.
+  RENDER_PLAN_CACHE.set(key, _build_plan(parts, key))
+
+
+def _validate_submit_for_cached_plan(definition: Mapping[str, Any]) -> None:
+  # Cached plans only cover the items; the submit config varies per instance.
+  if isinstance(definition, Mapping) and definition.get("submit") is not None:
+    errors: List[str] = []
+    validate_submit_config(definition["submit"], errors)
+    _raise_for_errors(errors)
+
+
+def render_slot_values(definition: Mapping[str, Any], html_options: Mapping[str, Any]) -> Dict[str, str]:
+  submit = definition.get("submit")
+  submit_block = ""
+  if submit and uses_external_assets(html_options):
+    src = escape_html(SUBMIT_SCRIPT_ASSET.url(html_options.get("assetBaseUrl")))
+    submit_block = f'  {build_submit_config_blob(submit)}\n  <script src="{src}" defer></script>\n'  # type: ignore[arg-type]
+  elif submit:
+    submit_block = f"  {script_tag(build_submit_script(submit))}\n"  # type: ignore[arg-type]
+  return {SUBMIT_SCRIPT_SLOT: submit_block}
+
+
+def uses_external_assets(html_options: Mapping[str, Any]) -> bool:
+  return html_options.get("assetMode") == "external"
+
+
+def _script_block(script: str, asset: StaticAsset, html_options: Mapping[str, Any]) -> str:
+  if uses_external_assets(html_options):
+    return f'<script src="{escape_html(asset.url(html_options.get("assetBaseUrl")))}" defer></script>'
+  return script_tag(script)
+
+
+def render_style_block(html_options: Mapping[str, Any], field_types: frozenset[str]) -> str:
+  if not html_options.get("includeStyles", True):
+    return ""
+  custom = html_options.get("styles")
+  if not uses_external_assets(html_options):
+    styles = custom or (build_base_styles(field_types) if html_options.get("pruneStyles", True) else BASE_STYLES)
+    return f"<style>\n{styles}\n</style>"
+
+  # External mode always links the full sheet: one cached file beats a variant per form.
+  asset = _custom_styles_asset(custom) if custom else BASE_STYLES_ASSET
+  href = escape_html(asset.url(html_options.get("assetBaseUrl")))
+  return f'<link rel="stylesheet" href="{href}" />'
+
+
+def register_page_assets(options: Mapping[str, Any] | None) -> List[StaticAsset]:
+  """Register the user-supplied assets a page rendered with ``options`` links to.
+
+  For pages rendered in another process, whose registrations stay there.
+  """
+  html_options = resolve_html_options(options)
+  custom = html_options.get("styles")
+  if not custom or not html_options.get("includeStyles", True) or not uses_external_assets(html_options):
+    return []
+  return [_custom_styles_asset(custom)]
+
+
+def _custom_styles_asset(styles: str) -> StaticAsset:
+  return register_asset("styles", styles, "css", shared=True)
+
+
+def script_tag(script: str) -> str:
+  return f"<script>\n{script}\n</script>"
 
 
-def convert_antd_form_to_html(definition: Mapping[str, Any], *, options: Mapping[str, Any] | None = None) -> str:
-  errors = validate_form_definition(definition)
+def _raise_for_errors(errors: List[str]) -> None:
   if errors:
     error = ValueError("Form definition failed validation.")
     error.details = errors  # type: ignore[attr-defined]
     raise error
 
-  html_options = dict(DEFAULT_HTML_OPTIONS)
-  if options:
-    html_options.update(options.get("html", {}))  # type: ignore[arg-type]
 
+def _iter_document(definition: Mapping[str, Any], html_options: Mapping[str, Any]) -> Iterator[str | _Slot]:
   page_title = (
     html_options.get("title")
     or definition.get("title")
@@ -254,11 +624,6 @@ def convert_antd_form_to_html(definition: Mapping[str, Any], *, options: Mapping
     or DEFAULT_HTML_OPTIONS["title"]
   )
 
-  layout_ctx = build_layout_context(definition.get("form") or {})
-  rendered_items = [render_item_with_layout(item, layout_ctx) for item in definition.get("items", [])]
-  header = render_form_header(definition)
-  actions_markup = default_actions()
-
   form_classes = ["generated-form"]
   form_options = definition.get("form") or {}
   if form_options.get("className"):
@@ -277,19 +642,10 @@ def convert_antd_form_to_html(definition: Mapping[str, Any], *, options: Mapping
   )
   form_attr_string = f" {form_attrs}" if form_attrs else ""
 
-  scripts: List[str] = []
-  if contains_form_list(definition.get("items", [])):
-    scripts.append(FORM_LIST_SCRIPT)
-  if definition.get("submit"):
-    scripts.append(build_submit_script(definition["submit"]))  # type: ignore[arg-type]
-  script_block = "\n".join(f"<script>\n{script}\n</script>" for script in scripts)
+  field_types = collect_field_types(definition.get("items", []))
+  style_block = render_style_block(html_options, field_types)
 
-  styles = None
-  if html_options.get("includeStyles", True):
-    styles = html_options.get("styles") or BASE_STYLES
-  style_block = f"<style>\n{styles}\n</style>" if styles else ""
-
-  html = f"""<!DOCTYPE html>
+  yield f"""<!DOCTYPE html>
 <html lang="en">
 <head>
   <meta charset="UTF-8" />
@@ -300,18 +656,26 @@ def convert_antd_form_to_html(definition: Mapping[str, Any], *, options: Mapping
 <body>
   <div class="form-container">
     <form{form_attr_string}>
-      {header}
-      {'\n'.join(rendered_items)}
-      <div class="form-actions">
-        {actions_markup}
+      {render_form_header(definition)}
+"""
+
+  layout_ctx = build_layout_context(form_options)
+  for item in definition.get("items", []):
+    yield f"      {render_item_with_layout(item, layout_ctx)}\n"
+
+  yield f"""      <div class="form-actions">
+        {default_actions()}
       </div>
     </form>
   </div>
-  {script_block}
-</body>
-</html>"""
+"""
 
-  return html.strip()
+  if contains_form_list(definition.get("items", [])):
+    yield f"  {_script_block(FORM_LIST_SCRIPT, FORM_LIST_SCRIPT_ASSET, html_options)}\n"
+  if "remote-select" in field_types:
+    yield f"  {_script_block(REMOTE_SELECT_SCRIPT, REMOTE_SELECT_SCRIPT_ASSET, html_options)}\n"
+  yield _Slot(SUBMIT_SCRIPT_SLOT)
+  yield "</body>\n</html>"
 
 
 def build_layout_context(form_options: Mapping[str, Any]) -> Dict[str, Any]:
@@ -422,6 +786,42 @@ def contains_form_list(items: Iterable[Any]) -> bool:
   return False
 
 
+def collect_field_types(items: Iterable[Any]) -> frozenset[str]:
+  """Field types that produce markup, including nested form-list children."""
+  found: set[str] = set()
+  for item in items:
+    if not isinstance(item, Mapping) or item.get("hidden"):
+      continue
+    if isinstance(item.get("type"), str):
+      found.add(item["type"])
+    if is_remote_select(item):
+      found.add("remote-select")
+    child_items = item.get("items")
+    if isinstance(child_items, Iterable) and not isinstance(child_items, (str, bytes)):
+      found |= collect_field_types(child_items)  # type: ignore[arg-type]
+    child = item.get("item")
+    if isinstance(child, Mapping):
+      found |= collect_field_types([child])
+  return frozenset(found)
+
+
+def collect_field_names(items: Iterable[Any]) -> list[str]:
+  """Names submitted under ``payload.values``, in form order; form-list rows stay under the list's name."""
+  names: list[str] = []
+  for item in items:
+    if not isinstance(item, Mapping):
+      continue
+    name = item.get("name")
+    if isinstance(name, str) and name:
+      if name not in names:
+        names.append(name)
+      continue
+    child_items = item.get("items")
+    if isinstance(child_items, Iterable) and not isinstance(child_items, (str, bytes)):
+      names.extend(child for child in collect_field_names(child_items) if child not in names)  # type: ignore[arg-type]
+  return names
+
+
 def render_field(item: Mapping[str, Any]) -> str:
   renderer = TYPE_RENDERERS.get(item.get("type"))
   if not renderer:
@@ -461,67 +861,75 @@ def render_number(item: Mapping[str, Any]) -> str:
 
 def render_select(item: Mapping[str, Any]) -> str:
   values = value_set(default_value(item))
-  attrs = control_attributes(
-    item,
-    {"multiple": item.get("mode") == "multiple" or item.get("multiple") or None},
-  )
+  multiple = item.get("mode") == "multiple" or item.get("multiple") or None
+  attrs = control_attributes(item, {"multiple": multiple})
+  remote = is_remote_select(item)
   options_markup = []
+  append = options_markup.append
+  if remote and not multiple:
+    append('<option value=""></option>')
   for option in item.get("options", []):
-    value = option.get("value") or option.get("key") or option.get("label") or ""
-    label = option.get("label") or option.get("value") or ""
-    option_attrs = attributes_to_string({"value": value, "selected": value in values})
-    options_markup.append(f"<option {option_attrs}>{escape_html(label)}</option>")
-  return f"<select {attrs}>\n  {'\\n  '.join(options_markup)}\n</select>"
+    value, label = select_option_entry(option)
+    selected = value in values
+    if remote and not selected:
+      continue
+    append(
+      f"<option{attribute_fragment('value', value)}{attribute_fragment('selected', selected)}>"
+      f"{escape_html(label)}</option>"
+    )
+  markup = f"<select {attrs}>\n  {'\n  '.join(options_markup)}\n</select>"
+  if not remote:
+    return markup
+
+  # Remote mode only ships the selected options; the rest come from the search endpoint.
+  endpoint = item.get("optionsEndpoint") or f"fields/{quote(str(item.get('name') or ''), safe='')}/options"
+  limit = item.get("remoteLimit") if isinstance(item.get("remoteLimit"), int) else DEFAULT_REMOTE_LIMIT
+  placeholder = item.get("searchPlaceholder") or "搜索"
+  return (
+    f'<div class="remote-select" data-options-endpoint="{escape_html(endpoint)}" data-limit="{limit}">'
+    f'<input type="search" class="remote-select-search" placeholder="{escape_html(placeholder)}" autocomplete="off" />'
+    f"{markup}</div>"
+  )
+
+
+def is_remote_select(item: Mapping[str, Any]) -> bool:
+  return item.get("type") == "select" and item.get("optionsMode") == "remote"
+
+
+def select_option_entry(option: Mapping[str, Any]) -> Tuple[Any, Any]:
+  value = option.get("value") or option.get("key") or option.get("label") or ""
+  label = option.get("label") or option.get("value") or ""
+  return value, label
 
 
 def render_radio_group(item: Mapping[str, Any]) -> str:
   selected = default_value(item)
-  group_name = item.get("name") or ""
-  options_markup = []
-  for index, option in enumerate(item.get("options", [])):
-    option_value = option.get("value") or option.get("key") or option.get("label") or ""
-    option_id = option.get("id") or f"{group_name}-{index}"
-    attrs = attributes_to_string(
-      {
-        "type": "radio",
-        "id": option_id,
-        "name": group_name,
-        "value": option_value,
-        "checked": option.get("checked") or option_value == selected,
-        "disabled": option.get("disabled"),
-      }
-    )
-    label = option.get("label") or option_value
-    options_markup.append(
-      f'<label for="{escape_html(option_id)}"><input {attrs} /> {escape_html(label)}</label>'
-    )
-  classes = " ".join(filter(None, ["radio-group", item.get("controlClassName")]))
-  return f'<div class="{classes}">{"".join(options_markup)}</div>'
+  return _render_choice_group(item, "radio", lambda value: value == selected)
 
 
 def render_checkbox_group(item: Mapping[str, Any]) -> str:
   values = value_set(default_value(item))
+  return _render_choice_group(item, "checkbox", lambda value: value in values)
+
+
+def _render_choice_group(item: Mapping[str, Any], input_type: str, is_checked: Callable[[Any], bool]) -> str:
   group_name = item.get("name") or ""
-  options_markup = []
+  name_attr = attribute_fragment("name", group_name)
+  classes = " ".join(filter(None, [f"{input_type}-group", item.get("controlClassName")]))
+  buffer = [f'<div class="{classes}">']
+  append = buffer.append
   for index, option in enumerate(item.get("options", [])):
     option_value = option.get("value") or option.get("key") or option.get("label") or ""
     option_id = option.get("id") or f"{group_name}-{index}"
-    attrs = attributes_to_string(
-      {
-        "type": "checkbox",
-        "id": option_id,
-        "name": group_name,
-        "value": option_value,
-        "checked": option.get("checked") or option_value in values,
-        "disabled": option.get("disabled"),
-      }
-    )
     label = option.get("label") or option_value
-    options_markup.append(
-      f'<label for="{escape_html(option_id)}"><input {attrs} /> {escape_html(label)}</label>'
+    append(
+      f'<label for="{escape_html(option_id)}"><input type="{input_type}"{attribute_fragment("id", option_id)}'
+      f'{name_attr}{attribute_fragment("value", option_value)}'
+      f'{attribute_fragment("checked", option.get("checked") or is_checked(option_value))}'
+      f'{attribute_fragment("disabled", option.get("disabled"))} /> {escape_html(label)}</label>'
     )
-  classes = " ".join(filter(None, ["checkbox-group", item.get("controlClassName")]))
-  return f'<div class="{classes}">{"".join(options_markup)}</div>'
+  append("</div>")
+  return "".join(buffer)
 
 
 def render_switch(item: Mapping[str, Any]) -> str:
@@ -618,7 +1026,34 @@ TYPE_RENDERERS = {
 }
 
 
+_CONTROL_ATTRIBUTE_KEYS = frozenset({"id", "name", "placeholder", "required", "disabled", "readonly", "class"})
+
+
 def control_attributes(item: Mapping[str, Any], extra: Mapping[str, Any] | None = None) -> str:
+  html_attributes = item.get("htmlAttributes")
+  if (isinstance(html_attributes, Mapping) and html_attributes) or (
+    extra and not _CONTROL_ATTRIBUTE_KEYS.isdisjoint(extra)
+  ):
+    return _merged_control_attributes(item, extra)
+
+  # Fast path: no key can be overridden, so write straight into one buffer.
+  buffer = [
+    attribute_fragment("id", item.get("id") or item.get("name")),
+    attribute_fragment("name", item.get("name")),
+    attribute_fragment("placeholder", item.get("placeholder")),
+    attribute_fragment("required", item.get("required")),
+    attribute_fragment("disabled", item.get("disabled")),
+    attribute_fragment("readonly", item.get("readOnly") or item.get("readonly")),
+  ]
+  if extra:
+    for key, value in extra.items():
+      buffer.append(attribute_fragment(key, value))
+  if item.get("controlClassName"):
+    buffer.append(attribute_fragment("class", item["controlClassName"]))
+  return "".join(buffer)[1:]
+
+
+def _merged_control_attributes(item: Mapping[str, Any], extra: Mapping[str, Any] | None) -> str:
   attrs: Dict[str, Any] = {
     "id": item.get("id") or item.get("name"),
     "name": item.get("name"),
@@ -664,8 +1099,17 @@ def normalize_array(value: Any) -> List[Any]:
   return [value]
 
 
+_ESCAPE_SEARCH = re.compile(r"[&<>\"']").search
+
+
 def escape_html(value: Any) -> str:
-  text = "" if value is None else str(value)
+  if value is None:
+    return ""
+  text = value if isinstance(value, str) else str(value)
+  if _ESCAPE_SEARCH(text) is None:
+    return text
+  # Chained replace beats str.translate here: CPython's translate falls back to
+  # a slow path for multi-character replacements.
   return (
     text.replace("&", "&amp;")
     .replace("<", "&lt;")
@@ -675,13 +1119,14 @@ def escape_html(value: Any) -> str:
   )
 
 
+def attribute_fragment(key: str, value: Any) -> str:
+  """Render one attribute with a leading space, or nothing for None/False."""
+  if value in (None, False):
+    return ""
+  if value is True:
+    return f" {key}"
+  return f' {key}="{escape_html(value)}"'
+
+
 def attributes_to_string(attrs: Mapping[str, Any]) -> str:
-  parts: List[str] = []
-  for key, value in attrs.items():
-    if value in (None, False):
-      continue
-    if value is True:
-      parts.append(str(key))
-    else:
-      parts.append(f'{key}="{escape_html(value)}"')
-  return " ".join(parts)
+  return "".join([attribute_fragment(str(key), value) for key, value in attrs.items()])[1:]
@@ -2,14 +2,232 @@
 
 from __future__ import annotations
 
+import base64
+import binascii
 import json
-from typing import Any, Optional
+from datetime import datetime
+from typing import Any, Literal, Optional
 
+from psycopg import sql
 from psycopg.errors import UniqueViolation
 
 from . import db
-from .ids import generate_short_id
-from .models import InstanceCreate, SubmissionCreate, TemplateCreate
+from .ids import generate_short_id, generate_short_ids
+from .models import InstanceBulkItem, InstanceCreate, Submission, SubmissionCreate, TemplateCreate
+
+# SQL shared with the async variants in ``async_repositories``. Hot per-request
+# queries are wrapped in db.prepared() so each connection prepares them once.
+# Prepared statements list their columns: a column added to the table would
+# change the result type of a prepared ``*`` and fail it on live connections.
+TEMPLATE_COLUMNS = "id, slug, title, description, theme, definition, html_options, version, created_at, updated_at"
+INSTANCE_COLUMNS = "id, template_id, name, runtime_config, created_at, updated_at"
+SUBMISSION_COLUMNS = (
+  "id, instance_id, template_id, respondent_key, submitted_at, updated_at,"
+  " payload, status, callback_status, callback_info"
+)
+RENDERED_PAGE_COLUMNS = (
+  "instance_id, template_id, template_version, template_updated_at, instance_updated_at,"
+  " renderer_version, content_hash, html, html_gzip, html_br, rendered_at"
+)
+INSERT_TEMPLATE_SQL = f"""
+  INSERT INTO form_templates (id, slug, title, description, theme, definition, html_options, version)
+  VALUES (%s, %s, %s, %s, %s, %s::jsonb, %s::jsonb, %s)
+  RETURNING {TEMPLATE_COLUMNS}
+"""
+TEMPLATE_IMPORT_COLUMNS = "id, slug, title, description, theme, definition, html_options, version"
+TEMPLATE_IMPORT_STAGING_SQL = """
+  CREATE TEMP TABLE form_template_import (
+    ord          INTEGER NOT NULL,
+    id           TEXT NOT NULL,
+    slug         TEXT NOT NULL,
+    title        TEXT NOT NULL,
+    description  TEXT,
+    theme        TEXT,
+    definition   JSONB NOT NULL,
+    html_options JSONB NOT NULL,
+    version      INTEGER NOT NULL
+  ) ON COMMIT DROP
+"""
+TEMPLATE_IMPORT_COPY_SQL = f"COPY form_template_import (ord, {TEMPLATE_IMPORT_COLUMNS}) FROM STDIN"
+# DO NOTHING (no conflict target) skips rows clashing on id or slug, including
+# with rows inserted earlier by the same statement.
+TEMPLATE_IMPORT_MERGE_SQL = f"""
+  INSERT INTO form_templates ({TEMPLATE_IMPORT_COLUMNS})
+  SELECT {TEMPLATE_IMPORT_COLUMNS} FROM form_template_import ORDER BY ord
+  ON CONFLICT DO NOTHING
+  RETURNING id, slug
+"""
+INSTANCE_IMPORT_STAGING_SQL = """
+  CREATE TEMP TABLE form_instance_import (
+    ord            INTEGER NOT NULL,
+    id             TEXT NOT NULL,
+    name           TEXT,
+    runtime_config JSONB NOT NULL
+  ) ON COMMIT DROP
+"""
+INSTANCE_IMPORT_COPY_SQL = "COPY form_instance_import (ord, id, name, runtime_config) FROM STDIN"
+INSTANCE_IMPORT_MERGE_SQL = """
+  INSERT INTO form_instances (id, template_id, name, runtime_config)
+  SELECT id, %s, name, runtime_config FROM form_instance_import ORDER BY ord
+  ON CONFLICT (id) DO NOTHING
+  RETURNING id
+"""
+SUBMISSION_EXPORT_COLUMNS = ("id", "instance_id", "status", "callback_status", "submitted_at", "updated_at")
+_SUBMISSION_EXPORT_FROM = """
+  FROM form_submissions s
+  WHERE s.template_id = %s
+"""
+SUBMISSION_EXPORT_NDJSON_SQL = """
+  SELECT row_to_json(r)::text FROM (
+    SELECT s.id, s.instance_id, s.status, s.callback_status, s.submitted_at, s.updated_at, s.payload
+""" + _SUBMISSION_EXPORT_FROM + """
+  ) r
+"""
+TEMPLATE_BY_ID_SQL = db.prepared(f"SELECT {TEMPLATE_COLUMNS} FROM form_templates WHERE id = %s")
+TEMPLATE_BY_SLUG_SQL = db.prepared(f"SELECT {TEMPLATE_COLUMNS} FROM form_templates WHERE slug = %s")
+DELETE_TEMPLATE_SQL = "DELETE FROM form_templates WHERE id = %s"
+INSTANCE_BY_ID_SQL = db.prepared(f"SELECT {INSTANCE_COLUMNS} FROM form_instances WHERE id = %s")
+INSTANCE_VERSIONS_SQL = db.prepared("""
+  SELECT
+    i.id AS instance_id,
+    i.updated_at AS instance_updated_at,
+    (i.runtime_config ? 'definition' OR i.runtime_config ? 'definitionOverrides') AS has_definition_overrides,
+    t.id AS template_id,
+    t.version AS template_version,
+    t.updated_at AS template_updated_at
+  FROM form_instances i
+  JOIN form_templates t ON t.id = i.template_id
+  WHERE i.id = %s
+""")
+TEMPLATE_VERSIONS_SQL = db.prepared("""
+  SELECT id AS template_id, version AS template_version, updated_at AS template_updated_at
+  FROM form_templates
+  WHERE id = %s OR slug = %s
+  ORDER BY (id = %s) DESC
+  LIMIT 1
+""")
+_INSTANCE_WITH_TEMPLATE_SELECT = """
+  SELECT
+    i.id AS instance_id,
+    i.template_id,
+    i.name AS instance_name,
+    i.runtime_config,
+    i.created_at AS instance_created_at,
+    i.updated_at AS instance_updated_at,
+    t.id AS template_id,
+    t.slug AS template_slug,
+    t.title AS template_title,
+    t.description AS template_description,
+    t.theme AS template_theme,
+    t.definition AS template_definition,
+    t.html_options AS template_html_options,
+    t.version AS template_version,
+    t.created_at AS template_created_at,
+    t.updated_at AS template_updated_at
+  FROM form_instances i
+  JOIN form_templates t ON t.id = i.template_id
+"""
+INSTANCE_WITH_TEMPLATE_SQL = db.prepared(_INSTANCE_WITH_TEMPLATE_SELECT + "  WHERE i.id = %s\n")
+INSTANCES_WITH_TEMPLATES_SQL = _INSTANCE_WITH_TEMPLATE_SELECT + "  WHERE i.id = ANY(%s)\n"
+UPDATE_SUBMISSION_SQL = db.prepared(f"""
+  UPDATE form_submissions
+     SET payload = %s::jsonb,
+         status = %s,
+         callback_info = %s::jsonb,
+         callback_status = %s,
+         updated_at = NOW()
+   WHERE id = %s AND instance_id = %s
+   RETURNING {SUBMISSION_COLUMNS}
+""")
+# Outcome of a server-side callback delivery; a row saved again since the
+# delivery was queued (newer updated_at) keeps its own, newer state.
+CALLBACK_RESULT_SQL = db.prepared("""
+  UPDATE form_submissions
+     SET status = %s,
+         callback_status = %s,
+         callback_info = %s::jsonb,
+         updated_at = NOW()
+   WHERE instance_id = %s AND id = %s AND updated_at = %s
+   RETURNING id
+""")
+# Claims (instance_id, key) for one write, taking over an expired key or, when
+# claim_timeout is not NULL, a claim abandoned mid-write. When the key is live,
+# ``claimed`` is false and the stored row, as of the statement start, comes
+# back for replay.
+CLAIM_IDEMPOTENCY_KEY_SQL = db.prepared("""
+  WITH claim AS (
+    INSERT INTO submission_idempotency_keys AS k (instance_id, key, request_hash)
+    VALUES (%(instance_id)s, %(key)s, %(request_hash)s)
+    ON CONFLICT (instance_id, key) DO UPDATE
+      SET request_hash = EXCLUDED.request_hash, response = NULL, created_at = NOW()
+      WHERE k.created_at < NOW() - make_interval(secs => %(ttl)s)
+         OR (k.response IS NULL AND k.created_at < NOW() - make_interval(secs => %(claim_timeout)s))
+    RETURNING 1
+  )
+  SELECT EXISTS (SELECT 1 FROM claim) AS claimed, k.request_hash, k.response
+  FROM (SELECT 1) AS one
+  LEFT JOIN submission_idempotency_keys k ON k.instance_id = %(instance_id)s AND k.key = %(key)s
+""")
+STORE_IDEMPOTENT_RESPONSE_SQL = db.prepared(
+  "UPDATE submission_idempotency_keys SET response = %s::jsonb WHERE instance_id = %s AND key = %s"
+)
+RELEASE_IDEMPOTENCY_KEY_SQL = db.prepared(
+  "DELETE FROM submission_idempotency_keys WHERE instance_id = %s AND key = %s AND response IS NULL"
+)
+DELETE_EXPIRED_IDEMPOTENCY_KEYS_SQL = """
+  DELETE FROM submission_idempotency_keys
+  WHERE ctid = ANY (ARRAY(
+    SELECT ctid FROM submission_idempotency_keys
+    WHERE created_at < NOW() - make_interval(secs => %s)
+    LIMIT %s
+  ))
+"""
+UPSERT_SUBMISSION_SQL = db.prepared(f"""
+  INSERT INTO form_submissions (instance_id, respondent_key, payload, status, callback_info, callback_status)
+  VALUES (%s, %s, %s::jsonb, %s, %s::jsonb, %s)
+  ON CONFLICT (instance_id, respondent_key)
+  DO UPDATE SET
+    payload = EXCLUDED.payload,
+    status = EXCLUDED.status,
+    callback_info = EXCLUDED.callback_info,
+    callback_status = EXCLUDED.callback_status,
+    updated_at = NOW()
+  RETURNING {SUBMISSION_COLUMNS}
+""")
+SUBMISSION_BY_ID_SQL = db.prepared(
+  f"SELECT {SUBMISSION_COLUMNS} FROM form_submissions WHERE id = %s AND instance_id = %s"
+)
+RESPONDENT_SUBMISSION_SQL = db.prepared(
+  f"SELECT {SUBMISSION_COLUMNS} FROM form_submissions WHERE instance_id = %s AND respondent_key = %s"
+)
+LATEST_SUBMISSION_SQL = db.prepared(f"""
+  SELECT {SUBMISSION_COLUMNS} FROM form_submissions
+  WHERE instance_id = %s
+  ORDER BY updated_at DESC
+  LIMIT 1
+""")
+RENDERED_PAGE_SQL = db.prepared(f"SELECT {RENDERED_PAGE_COLUMNS} FROM form_rendered_pages WHERE instance_id = %s")
+SAVE_RENDERED_PAGE_SQL = """
+  INSERT INTO form_rendered_pages (
+    instance_id, template_id, template_version, template_updated_at, instance_updated_at,
+    renderer_version, content_hash, html, html_gzip, html_br
+  )
+  VALUES (
+    %(instance_id)s, %(template_id)s, %(template_version)s, %(template_updated_at)s, %(instance_updated_at)s,
+    %(renderer_version)s, %(content_hash)s, %(html)s, %(html_gzip)s, %(html_br)s
+  )
+  ON CONFLICT (instance_id) DO UPDATE SET
+    template_id = EXCLUDED.template_id,
+    template_version = EXCLUDED.template_version,
+    template_updated_at = EXCLUDED.template_updated_at,
+    instance_updated_at = EXCLUDED.instance_updated_at,
+    renderer_version = EXCLUDED.renderer_version,
+    content_hash = EXCLUDED.content_hash,
+    html = EXCLUDED.html,
+    html_gzip = EXCLUDED.html_gzip,
+    html_br = EXCLUDED.html_br,
+    rendered_at = NOW()
+"""
 
 
 class RepositoryError(Exception):
@@ -21,60 +239,98 @@ class TemplateConflictError(RepositoryError):
 
 
 def create_template(data: TemplateCreate) -> dict[str, Any]:
-  template_id = data.id or generate_short_id()
-  slug = data.slug or template_id
   try:
-    row = db.execute(
-      """
-      INSERT INTO form_templates (id, slug, title, description, theme, definition, html_options, version)
-      VALUES (%s, %s, %s, %s, %s, %s::jsonb, %s::jsonb, %s)
-      RETURNING *
-      """,
-      (
-        template_id,
-        slug,
-        data.title,
-        data.description,
-        data.theme,
-        json.dumps(data.definition),
-        json.dumps(data.html_options),
-        data.version,
-      ),
-    )
+    row = db.execute(INSERT_TEMPLATE_SQL, template_insert_params(data))
   except UniqueViolation as exc:
-    constraint = getattr(getattr(exc, "diag", None), "constraint_name", "") or ""
-    if constraint.endswith("slug_key"):
-      message = "Template slug already exists."
-    elif constraint.endswith("pkey"):
-      message = "Template id already exists."
-    else:
-      message = "Template already exists."
-    raise TemplateConflictError(message) from exc
+    raise template_conflict(exc) from exc
 
   if not row:
     raise RepositoryError("Failed to insert template.")
   return row
 
 
+def template_insert_params(data: TemplateCreate) -> tuple[Any, ...]:
+  template_id = data.id or generate_short_id()
+  slug = data.slug or template_id
+  return (
+    template_id,
+    slug,
+    data.title,
+    data.description,
+    data.theme,
+    json.dumps(data.definition),
+    json.dumps(data.html_options),
+    data.version,
+  )
+
+
+def template_conflict(exc: UniqueViolation) -> TemplateConflictError:
+  constraint = getattr(getattr(exc, "diag", None), "constraint_name", "") or ""
+  if constraint.endswith("slug_key"):
+    message = "Template slug already exists."
+  elif constraint.endswith("pkey"):
+    message = "Template id already exists."
+  else:
+    message = "Template already exists."
+  return TemplateConflictError(message)
+
+
+def import_templates(records: list[TemplateCreate]) -> list[dict[str, Any]]:
+  """Insert ``records`` with one COPY and one merge; conflicting rows are skipped, not raised.
+
+  Returns ``{"id", "slug", "created", "error"}`` per record, in input order.
+  """
+  if not records:
+    return []
+  params = [template_insert_params(record) for record in records]
+  with db.get_connection() as conn:
+    with conn.transaction(), conn.cursor() as cur:
+      cur.execute(TEMPLATE_IMPORT_STAGING_SQL)
+      with cur.copy(TEMPLATE_IMPORT_COPY_SQL) as copy:
+        for ord, row in enumerate(params):
+          copy.write_row((ord, *row))
+      cur.execute(TEMPLATE_IMPORT_MERGE_SQL)
+      inserted = {(row[0], row[1]) for row in cur.fetchall()}
+      inserted_ids = {template_id for template_id, _ in inserted}
+      skipped_ids = [row[0] for row in params if row[0] not in inserted_ids]
+      cur.execute("SELECT id FROM form_templates WHERE id = ANY(%s)", (skipped_ids,))
+      taken_ids = inserted_ids | {row[0] for row in cur.fetchall()}
+
+  results: list[dict[str, Any]] = []
+  claimed: set[tuple[str, str]] = set()
+  for template_id, slug, *_ in params:
+    result = {"id": template_id, "slug": slug, "created": False, "error": None}
+    if (template_id, slug) in inserted and (template_id, slug) not in claimed:
+      # A row repeated within the batch is created for its first occurrence only.
+      claimed.add((template_id, slug))
+      result["created"] = True
+    elif template_id in taken_ids:
+      result["error"] = "Template id already exists."
+    else:
+      result["error"] = "Template slug already exists."
+    results.append(result)
+  return results
+
+
 def get_template_by_id(template_id: str) -> Optional[dict[str, Any]]:
-  return db.fetch_one("SELECT * FROM form_templates WHERE id = %s", (template_id,))
+  return db.fetch_one(TEMPLATE_BY_ID_SQL, (template_id,))
 
 
 def get_template_by_slug(slug: str) -> Optional[dict[str, Any]]:
-  return db.fetch_one("SELECT * FROM form_templates WHERE slug = %s", (slug,))
+  return db.fetch_one(TEMPLATE_BY_SLUG_SQL, (slug,))
 
 
 def delete_template_by_id(template_id: str) -> None:
-  db.execute("DELETE FROM form_templates WHERE id = %s", (template_id,))
+  db.execute(DELETE_TEMPLATE_SQL, (template_id,))
 
 
 def create_instance(data: InstanceCreate, template_id: str) -> dict[str, Any]:
   instance_id = data.id or generate_short_id()
   row = db.execute(
-    """
+    f"""
     INSERT INTO form_instances (id, template_id, name, runtime_config)
     VALUES (%s, %s, %s, %s::jsonb)
-    RETURNING *
+    RETURNING {INSTANCE_COLUMNS}
     """,
     (
       instance_id,
@@ -88,38 +344,63 @@ def create_instance(data: InstanceCreate, template_id: str) -> dict[str, Any]:
   return row
 
 
+def create_instances(template_id: str, items: list[InstanceBulkItem]) -> list[dict[str, Any]]:
+  """Insert one instance per item with a COPY and a single merge; existing ids are skipped.
+
+  Returns ``{"id", "created", "error"}`` per item, in input order.
+  """
+  if not items:
+    return []
+  generated = iter(generate_short_ids(sum(1 for item in items if not item.id)))
+  rows = [(item.id or next(generated), item.name, json.dumps(item.runtime_config)) for item in items]
+  with db.get_connection() as conn:
+    with conn.transaction(), conn.cursor() as cur:
+      cur.execute(INSTANCE_IMPORT_STAGING_SQL)
+      with cur.copy(INSTANCE_IMPORT_COPY_SQL) as copy:
+        for ord, row in enumerate(rows):
+          copy.write_row((ord, *row))
+      cur.execute(INSTANCE_IMPORT_MERGE_SQL, (template_id,))
+      inserted = {row[0] for row in cur.fetchall()}
+
+  results: list[dict[str, Any]] = []
+  for instance_id, *_ in rows:
+    created = instance_id in inserted
+    # An id repeated within the batch is created for its first row only.
+    inserted.discard(instance_id)
+    results.append({"id": instance_id, "created": created, "error": None if created else "Instance id already exists."})
+  return results
+
+
 def get_instance(instance_id: str) -> Optional[dict[str, Any]]:
-  return db.fetch_one("SELECT * FROM form_instances WHERE id = %s", (instance_id,))
+  return db.fetch_one(INSTANCE_BY_ID_SQL, (instance_id,))
+
+
+def get_instance_versions(instance_id: str) -> Optional[dict[str, Any]]:
+  """Version columns for an instance and its template, without the JSONB payloads."""
+  return db.fetch_one(INSTANCE_VERSIONS_SQL, (instance_id,))
+
+
+def get_template_versions(identifier: str) -> Optional[dict[str, Any]]:
+  """Version columns for a template looked up by id, falling back to slug."""
+  return db.fetch_one(TEMPLATE_VERSIONS_SQL, (identifier, identifier, identifier))
 
 
 def get_instance_with_template(instance_id: str) -> Optional[dict[str, Any]]:
-  row = db.fetch_one(
-    """
-    SELECT
-      i.id AS instance_id,
-      i.template_id,
-      i.name AS instance_name,
-      i.runtime_config,
-      i.created_at AS instance_created_at,
-      i.updated_at AS instance_updated_at,
-      t.id AS template_id,
-      t.slug AS template_slug,
-      t.title AS template_title,
-      t.description AS template_description,
-      t.theme AS template_theme,
-      t.definition AS template_definition,
-      t.html_options AS template_html_options,
-      t.version AS template_version,
-      t.created_at AS template_created_at,
-      t.updated_at AS template_updated_at
-    FROM form_instances i
-    JOIN form_templates t ON t.id = i.template_id
-    WHERE i.id = %s
-    """,
-    (instance_id,),
-  )
+  row = db.fetch_one(INSTANCE_WITH_TEMPLATE_SQL, (instance_id,))
   if not row:
     return None
+  return split_instance_with_template(row)
+
+
+def get_instances_with_templates(instance_ids: list[str]) -> dict[str, dict[str, Any]]:
+  """Batch variant of :func:`get_instance_with_template`, keyed by instance id."""
+  if not instance_ids:
+    return {}
+  rows = db.fetch_all(INSTANCES_WITH_TEMPLATES_SQL, (list(instance_ids),))
+  return {row["instance_id"]: split_instance_with_template(row) for row in rows}
+
+
+def split_instance_with_template(row: dict[str, Any]) -> dict[str, Any]:
   return {
     "instance": {
       "id": row["instance_id"],
@@ -144,78 +425,209 @@ def get_instance_with_template(instance_id: str) -> Optional[dict[str, Any]]:
   }
 
 
-def save_submission(instance_id: str, data: SubmissionCreate) -> dict[str, Any]:
+def save_submission(instance_id: str, data: SubmissionCreate, *, append: bool = False) -> dict[str, Any]:
+  query, params = submission_write(instance_id, data, append=append)
+  row = db.execute(query, params)
+  if not row:
+    raise RepositoryError("Failed to save submission.")
+  return row
+
+
+def submission_write(
+  instance_id: str,
+  data: SubmissionCreate,
+  *,
+  append: bool = False,
+) -> tuple[str, tuple[Any, ...]]:
+  """Statement and parameters for :func:`save_submission`: update by id, else upsert per respondent.
+
+  Single-submission instances always upsert the empty respondent key. In
+  append mode a save without ``respondent_key`` gets a fresh key, i.e. a new row.
+  """
   status = data.status or "draft"
   callback_status = data.callback_status or "idle"
   payload_json = json.dumps(data.payload)
   callback_info_json = json.dumps(data.callback_info) if data.callback_info is not None else None
-  submission_id = data.submission_id
 
-  if submission_id:
-    row = db.execute(
-      """
-      UPDATE form_submissions
-         SET payload = %s::jsonb,
-             status = %s,
-             callback_info = %s::jsonb,
-             callback_status = %s,
-             updated_at = NOW()
-       WHERE id = %s AND instance_id = %s
-       RETURNING *
-      """,
-      (
-        payload_json,
-        status,
-        callback_info_json,
-        callback_status,
-        submission_id,
-        instance_id,
-      ),
+  if data.submission_id:
+    return UPDATE_SUBMISSION_SQL, (
+      payload_json,
+      status,
+      callback_info_json,
+      callback_status,
+      data.submission_id,
+      instance_id,
     )
+  if append:
+    respondent_key = data.respondent_key or generate_short_id(16)
   else:
-    row = db.execute(
-      """
-      INSERT INTO form_submissions (instance_id, payload, status, callback_info, callback_status)
-      VALUES (%s, %s::jsonb, %s, %s::jsonb, %s)
-      ON CONFLICT (instance_id)
-      DO UPDATE SET
-        payload = EXCLUDED.payload,
-        status = EXCLUDED.status,
-        callback_info = EXCLUDED.callback_info,
-        callback_status = EXCLUDED.callback_status,
-        updated_at = NOW()
-      RETURNING *
-      """,
-      (
-        instance_id,
-        payload_json,
-        status,
-        callback_info_json,
-        callback_status,
-      ),
-    )
+    respondent_key = ""
+  return UPSERT_SUBMISSION_SQL, (
+    instance_id,
+    respondent_key,
+    payload_json,
+    status,
+    callback_info_json,
+    callback_status,
+  )
 
-  if not row:
-    raise RepositoryError("Failed to save submission.")
-  return row
+
+def idempotent_response(row: dict[str, Any]) -> str:
+  """The submission response stored for an Idempotency-Key, as JSON text."""
+  return Submission.model_validate(row).model_dump_json()
+
+
+def idempotency_claim_params(
+  instance_id: str,
+  key: str,
+  request_hash: str,
+  *,
+  ttl: float,
+  claim_timeout: Optional[float],
+) -> dict[str, Any]:
+  return {
+    "instance_id": instance_id,
+    "key": key,
+    "request_hash": request_hash,
+    "ttl": ttl,
+    "claim_timeout": claim_timeout,
+  }
 
 
 def get_submission(
   instance_id: str,
   submission_id: Optional[str] = None,
+  respondent_key: Optional[str] = None,
 ) -> Optional[dict[str, Any]]:
+  query, params = submission_read(instance_id, submission_id, respondent_key)
+  return db.fetch_one(query, params)
+
+
+def submission_read(
+  instance_id: str,
+  submission_id: Optional[str] = None,
+  respondent_key: Optional[str] = None,
+) -> tuple[str, tuple[Any, ...]]:
+  """Statement for :func:`get_submission`: by id, by respondent, else the latest of the instance."""
   if submission_id:
-    return db.fetch_one(
-      "SELECT * FROM form_submissions WHERE id = %s AND instance_id = %s",
-      (submission_id, instance_id),
+    return SUBMISSION_BY_ID_SQL, (submission_id, instance_id)
+  if respondent_key is not None:
+    return RESPONDENT_SUBMISSION_SQL, (instance_id, respondent_key)
+  return LATEST_SUBMISSION_SQL, (instance_id,)
+
+
+def submission_export_csv_sql(field_names: list[str]) -> sql.Composed:
+  """``COPY ... TO STDOUT`` with the fixed columns plus one text column per ``payload.values`` field."""
+  columns = [sql.SQL("s.{}").format(sql.Identifier(column)) for column in SUBMISSION_EXPORT_COLUMNS]
+  for name in field_names:
+    header = f"values.{name}" if name in SUBMISSION_EXPORT_COLUMNS else name
+    columns.append(sql.SQL("s.payload->'values'->>{} AS {}").format(sql.Literal(name), sql.Identifier(header)))
+  return sql.SQL("COPY (SELECT {} {}) TO STDOUT (FORMAT csv, HEADER true)").format(
+    sql.SQL(", ").join(columns),
+    sql.SQL(_SUBMISSION_EXPORT_FROM),
+  )
+
+
+class InvalidCursorError(RepositoryError):
+  """Raised when a pagination cursor cannot be decoded."""
+
+
+def submission_page_query(
+  scope: Literal["instance_id", "template_id"],
+  scope_id: str,
+  *,
+  limit: int,
+  cursor: Optional[str] = None,
+  status: Optional[str] = None,
+  callback_status: Optional[str] = None,
+) -> tuple[sql.Composed, dict[str, Any]]:
+  """Newest-first keyset page over ``(updated_at, id)`` for one instance or template.
+
+  The inner query only touches ``idx_form_submissions_*_recent`` (index-only);
+  full rows are fetched for the ``limit + 1`` ids it returns. Only the filters
+  given are emitted so the row comparison stays an index condition.
+  """
+  conditions = [sql.SQL("{} = %(scope_id)s").format(sql.Identifier(scope))]
+  params: dict[str, Any] = {"scope_id": scope_id, "limit": limit + 1}
+  if status is not None:
+    conditions.append(sql.SQL("status = %(status)s"))
+    params["status"] = status
+  if callback_status is not None:
+    conditions.append(sql.SQL("callback_status = %(callback_status)s"))
+    params["callback_status"] = callback_status
+  if cursor:
+    params["after_updated_at"], params["after_id"] = decode_submission_cursor(cursor)
+    conditions.append(sql.SQL("(updated_at, id) < (%(after_updated_at)s, %(after_id)s)"))
+  query = sql.SQL("""
+    WITH page AS (
+      SELECT instance_id, id FROM form_submissions
+      WHERE {conditions}
+      ORDER BY updated_at DESC, id DESC
+      LIMIT %(limit)s
     )
+    SELECT s.* FROM page JOIN form_submissions s USING (instance_id, id)
+    ORDER BY s.updated_at DESC, s.id DESC
+  """).format(conditions=sql.SQL(" AND ").join(conditions))
+  return query, params
+
+
+def submission_page(rows: list[dict[str, Any]], limit: int) -> dict[str, Any]:
+  """Trim the look-ahead row fetched by :func:`submission_page_query` into ``{"items", "next_cursor"}``."""
+  items = rows[:limit]
+  next_cursor = encode_submission_cursor(items[-1]) if len(rows) > limit else None
+  return {"items": items, "next_cursor": next_cursor}
+
+
+def encode_submission_cursor(row: dict[str, Any]) -> str:
+  raw = json.dumps([row["updated_at"].isoformat(), row["id"]], separators=(",", ":"))
+  return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_submission_cursor(cursor: str) -> tuple[datetime, str]:
+  try:
+    raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+    updated_at, submission_id = json.loads(raw)
+    return datetime.fromisoformat(updated_at), str(submission_id)
+  except (binascii.Error, TypeError, ValueError) as exc:
+    raise InvalidCursorError("Invalid cursor.") from exc
+
 
+def list_submissions(
+  scope: Literal["instance_id", "template_id"],
+  scope_id: str,
+  *,
+  limit: int,
+  cursor: Optional[str] = None,
+  status: Optional[str] = None,
+  callback_status: Optional[str] = None,
+) -> dict[str, Any]:
+  query, params = submission_page_query(
+    scope, scope_id, limit=limit, cursor=cursor, status=status, callback_status=callback_status
+  )
+  return submission_page(db.fetch_all(query, params), limit)
+
+
+def get_static_asset(filename: str) -> Optional[dict[str, Any]]:
   return db.fetch_one(
+    "SELECT filename, media_type, content FROM static_assets WHERE filename = %s",
+    (filename,),
+  )
+
+
+def save_static_asset(filename: str, media_type: str, content: bytes) -> None:
+  db.execute(
     """
-    SELECT * FROM form_submissions
-    WHERE instance_id = %s
-    ORDER BY updated_at DESC
-    LIMIT 1
+    INSERT INTO static_assets (filename, media_type, content)
+    VALUES (%s, %s, %s)
+    ON CONFLICT (filename) DO NOTHING
     """,
-    (instance_id,),
+    (filename, media_type, content),
   )
+
+
+def get_rendered_page(instance_id: str) -> Optional[dict[str, Any]]:
+  return db.fetch_one(RENDERED_PAGE_SQL, (instance_id,))
+
+
+def save_rendered_page(instance_id: str, page: dict[str, Any]) -> None:
+  db.execute(SAVE_RENDERED_PAGE_SQL, {"instance_id": instance_id, **page})
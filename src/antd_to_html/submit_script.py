@@ -1,25 +1,35 @@
-"""Generate client-side submit script for inline execution."""
+"""Generate client-side submit script for inline or external execution."""
 
 from __future__ import annotations
 
 import json
 from typing import Any, Mapping
 
+from .assets import register_asset
+from .config import get_settings
+
 DEFAULT_HEADERS = {
   "Accept": "application/json, text/x-json",
   "Content-Type": "application/json"
 }
 
+CONFIG_ELEMENT_ID = "antd-submit-config"
+CONFIG_PLACEHOLDER = "__CONFIG_JSON__"
 
-def build_submit_script(submit_config: Mapping[str, Any]) -> str:
+
+def build_submit_config(submit_config: Mapping[str, Any]) -> dict[str, Any]:
   method = str(submit_config.get("method", "POST")).upper()
-  callback_url = submit_config.get("callback_url")
-  callback_params = submit_config.get("callback_params") or {}
-  config = {
+  server_callback = bool(submit_config.get("serverCallback"))
+  # Callbacks sent by the server keep the receiver's URL, params and headers out of the page.
+  callback_url = None if server_callback else submit_config.get("callback_url")
+  callback_params = {} if server_callback else submit_config.get("callback_params") or {}
+  headers = {} if server_callback else submit_config.get("headers") or {}
+  return {
     "callback_url": callback_url,
+    "serverCallback": server_callback,
     "method": method,
     "callback_params": callback_params,
-    "headers": {**DEFAULT_HEADERS, **(submit_config.get("headers") or {})},
+    "headers": {**DEFAULT_HEADERS, **headers},
     "buttonSelector": submit_config.get("buttonSelector") or 'button[type="submit"]',
     "idleText": submit_config.get("idleText"),
     "pendingText": submit_config.get("pendingText") or "提交中...",
@@ -35,12 +45,26 @@ def build_submit_script(submit_config: Mapping[str, Any]) -> str:
     "updateText": submit_config.get("updateText"),
   }
 
-  serialized = _sanitize_json(config)
-  script = """
+
+def build_submit_script(submit_config: Mapping[str, Any]) -> str:
+  """Inline script with the sanitized config spliced into the prepared body."""
+  return f"{_SCRIPT_PREFIX}{_sanitize_json(build_submit_config(submit_config))}{_SCRIPT_SUFFIX}"
+
+
+def build_submit_config_blob(submit_config: Mapping[str, Any]) -> str:
+  """JSON data block read by the externally served submit script."""
+  serialized = _sanitize_json(build_submit_config(submit_config))
+  return f'<script type="application/json" id="{CONFIG_ELEMENT_ID}">{serialized}</script>'
+
+
+# Written with doubled braces; unescaped once at import below.
+_SCRIPT_SOURCE = """
 (function() {{
   var CONFIG = __CONFIG_JSON__;
   var callback_url = CONFIG.callback_url || null;
   var callback_params = CONFIG.callback_params || {};
+  // serverCallback: the service sends the callback itself once the submission is saved.
+  var callback_pending = !!callback_url || !!CONFIG.serverCallback;
 
   var submissionState = {{
     endpoint: CONFIG.submissionEndpoint || null,
@@ -50,6 +74,7 @@ def build_submit_script(submit_config: Mapping[str, Any]) -> str:
   }};
 
   var updateText = CONFIG.updateText || '更新';
+  var SAVE_RETRIES = 2;
 
   ready(function() {{
     var button = document.querySelector(CONFIG.buttonSelector || 'button[type=\"submit\"]');
@@ -100,8 +125,8 @@ def build_submit_script(submit_config: Mapping[str, Any]) -> str:
       var callbackPayload = buildCallbackPayload(submissionPayload);
 
       saveSubmission(submissionPayload, {{
-        status: callback_url ? 'submitted' : 'completed',
-        callbackStatus: callback_url ? 'pending' : 'success'
+        status: callback_pending ? 'submitted' : 'completed',
+        callbackStatus: callback_pending ? 'pending' : 'success'
       }})
         .then(function(row) {{
           submissionState.id = row.id || submissionState.id;
@@ -484,17 +509,8 @@ def build_submit_script(submit_config: Mapping[str, Any]) -> str:
     if (submissionId) {{
       body.submission_id = submissionId;
     }}
-    return fetch(submissionState.endpoint, {{
-      method: 'POST',
-      headers: submissionState.headers,
-      body: JSON.stringify(body)
-    }})
-      .then(function(response) {{
-        if (!response.ok) {{
-          throw new Error('Failed to save submission (' + response.status + ')');
-        }}
-        return response.json();
-      }})
+    var headers = Object.assign({{}}, submissionState.headers, {{ 'Idempotency-Key': newIdempotencyKey() }});
+    return postSubmission(JSON.stringify(body), headers, 0)
       .then(function(data) {{
         if (data && data.id) {{
           submissionState.id = data.id;
@@ -506,6 +522,46 @@ def build_submit_script(submit_config: Mapping[str, Any]) -> str:
       }});
   }}
 
+  // One Idempotency-Key per save: retries after a network error, or a 409 while
+  // the first attempt is still being written, get the original result back.
+  function postSubmission(body, headers, attempt) {{
+    function retry(error) {{
+      if (attempt >= SAVE_RETRIES) throw error;
+      return new Promise(function(resolve) {{ setTimeout(resolve, 500 * Math.pow(2, attempt)); }})
+        .then(function() {{ return postSubmission(body, headers, attempt + 1); }});
+    }}
+    return fetch(submissionState.endpoint, {{
+      method: 'POST',
+      headers: headers,
+      body: body
+    }})
+      .then(function(response) {{
+        if (response.status === 409) {{
+          return retry(new Error('Failed to save submission (409)'));
+        }}
+        if (!response.ok) {{
+          throw new Error('Failed to save submission (' + response.status + ')');
+        }}
+        return response.json();
+      }}, retry);
+  }}
+
+  function newIdempotencyKey() {{
+    var cryptoApi = typeof crypto !== 'undefined' ? crypto : null;
+    if (cryptoApi && typeof cryptoApi.randomUUID === 'function') {{
+      return cryptoApi.randomUUID();
+    }}
+    var bytes = new Uint8Array(16);
+    if (cryptoApi && typeof cryptoApi.getRandomValues === 'function') {{
+      cryptoApi.getRandomValues(bytes);
+    }} else {{
+      for (var i = 0; i < bytes.length; i += 1) bytes[i] = Math.floor(Math.random() * 256);
+    }}
+    var hex = '';
+    for (var j = 0; j < bytes.length; j += 1) hex += (bytes[j] + 256).toString(16).slice(1);
+    return hex;
+  }}
+
   function sendCallback(payload) {{
     if (!callback_url) {{
       return Promise.resolve(null);
@@ -623,8 +679,28 @@ def build_submit_script(submit_config: Mapping[str, Any]) -> str:
 })();
 """.strip()
 
-  script = script.replace("{{", "{").replace("}}", "}")
-  return script.replace("__CONFIG_JSON__", serialized)
+
+def _minify(script: str) -> str:
+  # Conservative: drop indentation and blank lines but keep line breaks for ASI.
+  lines = (line.strip() for line in script.splitlines())
+  return "\n".join(line for line in lines if line)
+
+
+def _prepare_script_template() -> str:
+  script = _SCRIPT_SOURCE.replace("{{", "{").replace("}}", "}")
+  if get_settings().minify_submit_script:
+    script = _minify(script)
+  return script
+
+
+_SCRIPT_TEMPLATE = _prepare_script_template()
+_SCRIPT_PREFIX, _SCRIPT_SUFFIX = _SCRIPT_TEMPLATE.split(CONFIG_PLACEHOLDER)
+
+_CONFIG_LOADER = (
+  "(function() { var el = document.getElementById('" + CONFIG_ELEMENT_ID + "'); "
+  "try { return JSON.parse(el ? el.textContent : '{}'); } catch (_) { return {}; } })()"
+)
+SUBMIT_SCRIPT_ASSET = register_asset("submit", f"{_SCRIPT_PREFIX}{_CONFIG_LOADER}{_SCRIPT_SUFFIX}", "js")
 
 
 def _sanitize_json(payload: Mapping[str, Any]) -> str:
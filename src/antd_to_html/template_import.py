@@ -0,0 +1,60 @@
+"""Bulk template import from NDJSON ``TemplateCreate`` records."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Iterable, Optional, Union
+
+from pydantic import ValidationError
+
+from . import repositories
+from .batch import validate_batch
+from .config import get_settings
+from .models import TemplateCreate
+
+
+def import_templates(lines: Iterable[Union[str, bytes]], *, batch_size: Optional[int] = None) -> dict[str, Any]:
+  """Validate every record (in parallel) and load the valid ones in batches.
+
+  Invalid lines and id/slug conflicts are reported per line; they never abort
+  the rest of the import. Each batch commits on its own.
+  """
+  results: list[dict[str, Any]] = []
+  parsed: list[tuple[dict[str, Any], TemplateCreate]] = []
+  for line_number, line in enumerate(lines, start=1):
+    if not line.strip():
+      continue
+    result = {"line": line_number, "id": None, "slug": None, "status": "invalid", "error": None, "details": None}
+    results.append(result)
+    try:
+      record = TemplateCreate.model_validate_json(line)
+    except ValidationError as exc:
+      result.update(error="Invalid template record.", details=json.loads(exc.json(include_url=False)))
+      continue
+    result.update(id=record.id, slug=record.slug)
+    parsed.append((result, record))
+
+  valid: list[tuple[dict[str, Any], TemplateCreate]] = []
+  for (result, record), errors in zip(parsed, validate_batch([record.definition for _, record in parsed])):
+    if errors:
+      result.update(error="Invalid form definition.", details=errors)
+    else:
+      valid.append((result, record))
+
+  size = max(1, batch_size or get_settings().template_import_batch_size)
+  for start in range(0, len(valid), size):
+    chunk = valid[start:start + size]
+    for (result, _), outcome in zip(chunk, repositories.import_templates([record for _, record in chunk])):
+      result.update(
+        id=outcome["id"],
+        slug=outcome["slug"],
+        status="created" if outcome["created"] else "conflict",
+        error=outcome["error"],
+      )
+
+  return {
+    "created": sum(result["status"] == "created" for result in results),
+    "conflicts": sum(result["status"] == "conflict" for result in results),
+    "invalid": sum(result["status"] == "invalid" for result in results),
+    "results": results,
+  }
@@ -0,0 +1,151 @@
+"""Group commit for submission saves: many upserts, one transaction, one WAL flush."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from psycopg import rows
+
+from . import async_db
+from .config import get_settings
+from .db import prepare_flag
+from .models import SubmissionCreate
+from .repositories import RepositoryError, submission_write
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingWrite:
+  query: str
+  params: tuple[Any, ...]
+  future: "asyncio.Future[dict[str, Any]]"
+
+
+class SubmissionWriteQueue:
+  """Buffers submission writes and flushes them in batches.
+
+  A batch goes out when it reaches ``max_batch`` writes or ``max_delay`` seconds
+  after its first write, whichever comes first. Every caller awaits the commit
+  of its own batch, so a returned row is as durable as with a direct write. If
+  the batch transaction fails, its writes are retried one by one so a single
+  bad write only fails its own request.
+  """
+
+  def __init__(self, max_batch: int, max_delay: float) -> None:
+    self.max_batch = max(1, max_batch)
+    self.max_delay = max(0.0, max_delay)
+    self._pending: list[_PendingWrite] = []
+    self._timer: Optional[asyncio.TimerHandle] = None
+    self._flushes: set[asyncio.Task[None]] = set()
+    self.batches = 0
+    self.writes = 0
+    self.fallbacks = 0
+
+  async def save(self, instance_id: str, data: SubmissionCreate, *, append: bool = False) -> dict[str, Any]:
+    query, params = submission_write(instance_id, data, append=append)
+    loop = asyncio.get_running_loop()
+    pending = _PendingWrite(query, params, loop.create_future())
+    self._pending.append(pending)
+    if len(self._pending) >= self.max_batch:
+      self._flush()
+    elif self._timer is None:
+      self._timer = loop.call_later(self.max_delay, self._flush)
+    return await pending.future
+
+  async def drain(self) -> None:
+    """Flush whatever is buffered and wait for in-flight batches (used at shutdown)."""
+    self._flush()
+    while self._flushes:
+      await asyncio.gather(*self._flushes, return_exceptions=True)
+
+  def stats(self) -> dict[str, Any]:
+    return {
+      "max_batch": self.max_batch,
+      "max_delay_ms": self.max_delay * 1000,
+      "pending": len(self._pending),
+      "in_flight": len(self._flushes),
+      "batches": self.batches,
+      "writes": self.writes,
+      "avg_batch": (self.writes / self.batches) if self.batches else 0.0,
+      "fallbacks": self.fallbacks,
+    }
+
+  def _flush(self) -> None:
+    if self._timer is not None:
+      self._timer.cancel()
+      self._timer = None
+    if not self._pending:
+      return
+    batch, self._pending = self._pending, []
+    task = asyncio.get_running_loop().create_task(self._write_batch(batch))
+    self._flushes.add(task)
+    task.add_done_callback(self._flushes.discard)
+
+  async def _write_batch(self, batch: list[_PendingWrite]) -> None:
+    self.batches += 1
+    self.writes += len(batch)
+    try:
+      async with async_db.get_connection() as conn:
+        async with conn.transaction(), conn.pipeline():
+          cursors = []
+          for pending in batch:
+            cur = conn.cursor(row_factory=rows.dict_row)
+            await cur.execute(pending.query, pending.params, prepare=prepare_flag(pending.query))
+            cursors.append(cur)
+        results = [await cur.fetchone() for cur in cursors]
+    except Exception as exc:
+      if len(batch) == 1:
+        _fail(batch[0], exc)
+        return
+      logger.warning("Submission batch of %d failed; retrying writes individually.", len(batch), exc_info=True)
+      self.fallbacks += 1
+      await asyncio.gather(*(self._write_one(pending) for pending in batch))
+      return
+    for pending, row in zip(batch, results):
+      _resolve(pending, row)
+
+  async def _write_one(self, pending: _PendingWrite) -> None:
+    try:
+      row = await async_db.execute(pending.query, pending.params)
+    except Exception as exc:
+      _fail(pending, exc)
+      return
+    _resolve(pending, row)
+
+
+def _resolve(pending: _PendingWrite, row: Optional[dict[str, Any]]) -> None:
+  if not row:
+    _fail(pending, RepositoryError("Failed to save submission."))
+  elif not pending.future.done():  # done = the request was cancelled; the write still happened
+    pending.future.set_result(row)
+
+
+def _fail(pending: _PendingWrite, exc: BaseException) -> None:
+  if not pending.future.done():
+    pending.future.set_exception(exc)
+
+
+_queue: Optional[SubmissionWriteQueue] = None
+
+
+def get_write_queue() -> SubmissionWriteQueue:
+  global _queue
+  if _queue is None:
+    settings = get_settings()
+    _queue = SubmissionWriteQueue(settings.submission_batch_size, settings.submission_batch_delay_ms / 1000)
+  return _queue
+
+
+async def close_write_queue() -> None:
+  global _queue
+  if _queue is not None:
+    queue, _queue = _queue, None
+    await queue.drain()
+
+
+def write_queue_stats() -> Optional[dict[str, Any]]:
+  return _queue.stats() if _queue is not None else None
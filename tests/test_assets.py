@@ -0,0 +1,41 @@
+from antd_to_html import assets
+from antd_to_html.assets import get_asset, persist_shared_assets, register_asset
+
+
+def use_store(monkeypatch, load, save):
+  monkeypatch.setattr(assets, "_store_loader", load)
+  monkeypatch.setattr(assets, "_store_saver", save)
+  monkeypatch.setattr(assets, "_wake_persister", lambda: None)
+
+
+def test_shared_asset_stays_unsaved_until_the_store_accepts_it(monkeypatch):
+  saved = []
+
+  def save(filename, media_type, content):
+    if not saved:
+      saved.append(None)
+      raise RuntimeError("database down")
+    saved.append(filename)
+
+  use_store(monkeypatch, lambda filename: None, save)
+  asset = register_asset("styles", "p { margin: 1px; }", "css", shared=True)
+
+  assert saved == []  # registering never writes
+  assert persist_shared_assets() == 1
+  assert get_asset(asset.filename) is asset
+  assert persist_shared_assets() == 0
+  assert saved == [None, asset.filename]
+  assert get_asset(asset.filename) is asset
+
+
+def test_unknown_filenames_are_looked_up_once(monkeypatch):
+  lookups = []
+
+  def load(filename):
+    lookups.append(filename)
+    return None
+
+  use_store(monkeypatch, load, lambda *args: None)
+  assert get_asset("styles.0123456789abcdef.css") is None
+  assert get_asset("styles.0123456789abcdef.css") is None
+  assert lookups == ["styles.0123456789abcdef.css"]
@@ -0,0 +1,40 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from antd_to_html.api import assets
+from antd_to_html.batch import render_batch
+
+
+def test_render_batch_preserves_order_and_reports_item_errors():
+  jobs = [
+    {"definition": {"title": "A", "items": [{"type": "input", "name": "a", "label": "A"}]}},
+    {"definition": {"items": [{"type": "unknown-widget", "name": "bad"}]}},
+    {"definition": {"title": "C", "items": [{"type": "textarea", "name": "c", "label": "C"}]}, "html_options": {"title": "Page C"}},
+  ]
+  with ProcessPoolExecutor(max_workers=2) as pool:
+    results = render_batch(jobs, executor=pool)
+
+  assert [("html" in result) for result in results] == [True, False, True]
+  assert 'name="a"' in results[0]["html"]
+  assert results[1]["error"] and results[1]["details"]
+  assert "<title>Page C</title>" in results[2]["html"]
+
+
+def test_custom_styles_rendered_in_a_worker_are_served_by_the_parent():
+  job = {
+    "definition": {"items": [{"type": "input", "name": "a", "label": "A"}]},
+    "html_options": {"assetMode": "external", "styles": "main { padding: 3px; }"},
+  }
+  # Two jobs: a single one is rendered in-process.
+  with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+    results = render_batch([job, job], executor=pool)
+
+  href = results[0]["html"].split('<link rel="stylesheet" href="', 1)[1].split('"', 1)[0]
+  app = FastAPI()
+  app.include_router(assets.router)
+  response = TestClient(app).get(href)
+  assert response.status_code == 200
+  assert response.text == "main { padding: 3px; }"
@@ -0,0 +1,24 @@
+import time
+
+from antd_to_html.cache import LRUCache
+
+
+def test_lru_cache_byte_bound_ttl_and_tags():
+  cache = LRUCache(10, maxbytes=10, sizeof=len)
+  cache.set("a", "aaaa", tags=["t1"])
+  cache.set("b", "bbbb", tags=["t1", "t2"])
+  cache.set("c", "cccc", tags=["t2"])
+  assert "a" not in cache and cache.bytes == 8 and cache.evictions == 1
+
+  assert cache.invalidate_tag("t2") == 2
+  assert len(cache) == 0 and cache.bytes == 0
+
+  cache.set("huge", "x" * 11)
+  assert "huge" not in cache
+
+  expiring = LRUCache(10, ttl=0.01)
+  expiring.set("k", "v")
+  assert expiring.get("k") == "v"
+  time.sleep(0.02)
+  assert expiring.get("k") is None
+  assert expiring.stats()["expirations"] == 1
@@ -0,0 +1,161 @@
+import asyncio
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from antd_to_html import async_repositories
+from antd_to_html.api.runtime import _page_key, _stored_page, merge_definition_with_runtime, runtime_submit_config
+from antd_to_html.callbacks import CallbackDispatcher, callback_job
+from antd_to_html.config import get_settings
+
+ROW = {
+  "instance_id": "inst",
+  "id": "sub",
+  "updated_at": datetime(2026, 1, 1, tzinfo=timezone.utc),
+  "payload": {"values": {"name": "Ada"}},
+}
+
+
+@contextmanager
+def stub_server(statuses, delay=0.0):
+  """Answers each request with the next status from ``statuses`` (the last one repeats)."""
+  state = {"requests": [], "active": 0, "peak": 0}
+  lock = threading.Lock()
+
+  class Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+      body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+      with lock:
+        state["requests"].append(body)
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        status = statuses[min(len(state["requests"]), len(statuses)) - 1]
+      time.sleep(delay)
+      reply = json.dumps({"ok": status == 200}).encode()
+      self.send_response(status)
+      self.send_header("Content-Type", "application/json")
+      self.send_header("Content-Length", str(len(reply)))
+      self.end_headers()
+      self.wfile.write(reply)
+      with lock:
+        state["active"] -= 1
+
+    def log_message(self, *args):
+      pass
+
+  server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+  thread = threading.Thread(target=server.serve_forever, daemon=True)
+  thread.start()
+  try:
+    yield f"http://127.0.0.1:{server.server_address[1]}/hook", state
+  finally:
+    server.shutdown()
+    server.server_close()
+
+
+def record_results(monkeypatch, expected):
+  results = []
+
+  async def record(instance_id, submission_id, version, **outcome):
+    results.append({"submission_id": submission_id, **outcome})
+    if len(results) == expected:
+      done.set()
+    return True
+
+  done = asyncio.Event()
+  monkeypatch.setattr(async_repositories, "record_callback_result", record)
+  return results, done
+
+
+def make_job(url, submission_id="sub"):
+  submit_config = {"callback_url": url, "serverCallback": True, "callback_params": {"source": "form"}}
+  return callback_job(submit_config, {**ROW, "id": submission_id})
+
+
+def test_retries_with_backoff_then_records_success(monkeypatch):
+  async def main(url):
+    results, done = record_results(monkeypatch, 1)
+    dispatcher = CallbackDispatcher(backoff_base=0.01)
+    dispatcher.enqueue(make_job(url))
+    await asyncio.wait_for(done.wait(), 5)
+    await dispatcher.close()
+    return results, dispatcher.stats()
+
+  with stub_server([503, 200]) as (url, state):
+    results, stats = asyncio.run(main(url))
+
+  assert results == [{"submission_id": "sub", "status": "completed", "callback_status": "success", "callback_info": {"ok": True}}]
+  assert state["requests"][0] == {"source": "form", "feedback_data": {"user_collect_data": ROW["payload"]}}
+  assert len(state["requests"]) == 2
+  assert stats["retries"] == 1 and stats["delivered"] == 1
+
+
+def test_client_errors_fail_without_retry(monkeypatch):
+  async def main(url):
+    results, done = record_results(monkeypatch, 1)
+    dispatcher = CallbackDispatcher(backoff_base=0.01)
+    dispatcher.enqueue(make_job(url))
+    await asyncio.wait_for(done.wait(), 5)
+    await dispatcher.close()
+    return results
+
+  with stub_server([404]) as (url, state):
+    results = asyncio.run(main(url))
+
+  assert len(state["requests"]) == 1
+  assert results[0]["callback_status"] == "failed"
+  assert results[0]["callback_info"] == {"error": "Request failed with status 404", "attempts": 1}
+
+
+def test_concurrency_is_bounded_per_host(monkeypatch):
+  async def main(url):
+    results, done = record_results(monkeypatch, 6)
+    dispatcher = CallbackDispatcher(host_concurrency=2)
+    for n in range(6):
+      dispatcher.enqueue(make_job(url, f"sub{n}"))
+    await asyncio.wait_for(done.wait(), 5)
+    await dispatcher.close()
+    return results
+
+  with stub_server([200], delay=0.05) as (url, state):
+    results = asyncio.run(main(url))
+
+  assert sorted(result["submission_id"] for result in results) == [f"sub{n}" for n in range(6)]
+  assert state["peak"] == 2
+
+
+def test_runtime_submit_config_matches_merged_definition(monkeypatch):
+  monkeypatch.setattr(get_settings(), "callback_dispatch", True)
+  template = {"definition": {"items": [{"name": "a"}], "submit": {"callback": {"url": "http://example.test/hook"}}}}
+  runtime_config = {"definition": {"submit": {"method": "put"}}, "submission": {"mode": "append"}}
+
+  definition, _ = merge_definition_with_runtime(template, runtime_config, "inst")
+  submit_config = runtime_submit_config(template, runtime_config, "inst")
+
+  assert submit_config == definition["submit"]
+  assert submit_config["serverCallback"] is True
+  assert callback_job(submit_config, ROW).method == "PUT"
+
+
+def test_pages_rendered_under_the_other_dispatch_setting_are_not_reused(monkeypatch):
+  versions = {
+    "instance_id": "inst",
+    "instance_updated_at": ROW["updated_at"],
+    "template_id": "tpl",
+    "template_version": 1,
+    "template_updated_at": ROW["updated_at"],
+  }
+  stored = {**versions, "html": b"<html></html>", "html_gzip": None, "html_br": None}
+  settings = get_settings()
+
+  monkeypatch.setattr(settings, "callback_dispatch", False)
+  browser_key = _page_key(versions)
+  stored["renderer_version"] = browser_key[-1]
+  assert _stored_page(stored, versions) is not None
+
+  monkeypatch.setattr(settings, "callback_dispatch", True)
+  assert _page_key(versions) != browser_key
+  assert _stored_page(stored, versions) is None
@@ -0,0 +1,48 @@
+import gzip
+
+from antd_to_html.compression import (
+  PAGE_CACHE,
+  CompressedPage,
+  cached_page,
+  invalidate_pages,
+  negotiate_encoding,
+  page_response,
+  page_tags,
+  store_page,
+)
+
+
+def test_negotiate_encoding_honours_quality_values():
+  assert negotiate_encoding(None) is None
+  assert negotiate_encoding("identity") is None
+  assert negotiate_encoding("gzip, deflate") == "gzip"
+  assert negotiate_encoding("gzip;q=0, *;q=0") is None
+  assert negotiate_encoding("*") in {"gzip", "br"}
+
+
+def test_stored_page_is_encoded_once_per_key():
+  PAGE_CACHE.clear()
+  assert cached_page(("view", "i-1", 1)) is None
+
+  first = store_page(("view", "i-1", 1), CompressedPage(("<html>" + "<p>repeated</p>" * 200 + "</html>").encode()))
+  gzip_response = page_response(first, "gzip")
+  second = cached_page(("view", "i-1", 1))
+
+  assert second is first
+  assert gzip_response.headers["content-encoding"] == "gzip"
+  assert gzip_response.headers["vary"] == "Accept-Encoding"
+  assert gzip.decompress(gzip_response.body) == first.body
+  assert page_response(second, "gzip").body is gzip_response.body
+  assert "content-encoding" not in page_response(second, None).headers
+
+
+def test_page_cache_tracks_variant_bytes_and_template_invalidation():
+  PAGE_CACHE.clear()
+  page = store_page(("preview", "t-1", 1), CompressedPage(b"<p>x</p>" * 500), page_tags("t-1"))
+  plain_bytes = PAGE_CACHE.bytes
+  page_response(page, "gzip")
+  assert PAGE_CACHE.bytes == plain_bytes + len(page.variants["gzip"])
+
+  store_page(("view", "i-1", "t-1"), CompressedPage(b"<p>y</p>"), page_tags("t-1", "i-1"))
+  assert invalidate_pages(template_id="t-1") == 2
+  assert len(PAGE_CACHE) == 0 and PAGE_CACHE.bytes == 0
@@ -0,0 +1,20 @@
+from datetime import datetime, timezone
+
+from antd_to_html.http_cache import is_not_modified, validator_headers, version_etag
+
+
+def test_conditional_get_validators():
+  updated = datetime(2024, 5, 1, 8, 30, 15, 123456, tzinfo=timezone.utc)
+  etag = version_etag(("view", "i-1", updated, "t-1", 3, updated, "3"), "gzip")
+  headers = validator_headers(etag, updated)
+
+  assert etag != version_etag(("view", "i-1", updated, "t-1", 3, updated, "3"))
+  assert etag != version_etag(("view", "i-1", updated, "t-1", 4, updated, "3"), "gzip")
+  assert headers["Last-Modified"] == "Wed, 01 May 2024 08:30:15 GMT"
+
+  assert is_not_modified({"if-none-match": f'"other", W/{etag}'}, etag, updated)
+  assert not is_not_modified({"if-none-match": '"other"'}, etag, updated)
+  assert is_not_modified({"if-modified-since": headers["Last-Modified"]}, etag, updated)
+  assert not is_not_modified({"if-modified-since": "Tue, 30 Apr 2024 00:00:00 GMT"}, etag, updated)
+  # If-None-Match takes precedence over If-Modified-Since.
+  assert not is_not_modified({"if-none-match": '"other"', "if-modified-since": headers["Last-Modified"]}, etag, updated)
@@ -0,0 +1,81 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from antd_to_html import async_repositories
+from antd_to_html.api.runtime import _save_submission
+from antd_to_html.idempotency import IdempotencyKeyCleaner, request_fingerprint
+from antd_to_html.models import Submission, SubmissionCreate
+
+PAYLOAD = SubmissionCreate(payload={"values": {"a": 1, "b": 2}}, status="submitted")
+STORED = Submission(
+  id="sub",
+  instance_id="inst",
+  payload={"values": {"a": 1, "b": 2}},
+  status="submitted",
+  submitted_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+  updated_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+)
+
+
+def test_fingerprint_ignores_key_order_but_not_values():
+  reordered = SubmissionCreate(payload={"values": {"b": 2, "a": 1}}, status="submitted")
+  changed = SubmissionCreate(payload={"values": {"a": 1, "b": 3}}, status="submitted")
+  assert request_fingerprint(PAYLOAD) == request_fingerprint(reordered)
+  assert request_fingerprint(PAYLOAD) != request_fingerprint(changed)
+
+
+@pytest.mark.parametrize(
+  ("claim", "expected"),
+  [
+    ({"claimed": False, "request_hash": "same", "response": STORED.model_dump(mode="json")}, STORED),
+    ({"claimed": False, "request_hash": "same", "response": None}, 409),
+    ({"claimed": False, "request_hash": None, "response": None}, 409),
+    ({"claimed": False, "request_hash": "other", "response": STORED.model_dump(mode="json")}, 422),
+  ],
+)
+def test_replay_decision(monkeypatch, claim, expected):
+  fingerprint = request_fingerprint(PAYLOAD)
+  claim = {**claim, "request_hash": fingerprint if claim["request_hash"] == "same" else claim["request_hash"]}
+
+  async def save_once(instance_id, data, **options):
+    return claim, None
+
+  monkeypatch.setattr(async_repositories, "save_submission_once", save_once)
+  if isinstance(expected, int):
+    with pytest.raises(HTTPException) as excinfo:
+      asyncio.run(_save_submission("inst", PAYLOAD, False, "key"))
+    assert excinfo.value.status_code == expected
+  else:
+    row, replayed = asyncio.run(_save_submission("inst", PAYLOAD, False, "key"))
+    assert replayed and Submission.model_validate(row) == expected
+
+
+def test_abandoned_claims_are_only_taken_over_outside_append_mode(monkeypatch):
+  timeouts = []
+
+  async def save_once(instance_id, data, **options):
+    timeouts.append(options["claim_timeout"])
+    return {"claimed": True}, {"id": "sub"}
+
+  monkeypatch.setattr(async_repositories, "save_submission_once", save_once)
+  assert asyncio.run(_save_submission("inst", PAYLOAD, False, "key")) == ({"id": "sub"}, False)
+  asyncio.run(_save_submission("inst", PAYLOAD, True, "key"))
+  assert timeouts[0] > 0 and timeouts[1] is None
+
+
+def test_cleaner_purges_in_batches(monkeypatch):
+  remaining = [7]
+  calls = []
+
+  async def delete_expired(ttl, limit):
+    deleted = min(limit, remaining[0])
+    remaining[0] -= deleted
+    calls.append(deleted)
+    return deleted
+
+  monkeypatch.setattr(async_repositories, "delete_expired_idempotency_keys", delete_expired)
+  assert asyncio.run(IdempotencyKeyCleaner(ttl=60, interval=300, batch_size=3).purge()) == 7
+  assert calls == [3, 3, 1]
@@ -0,0 +1,40 @@
+import io
+
+from antd_to_html.ids import ALPHABET, generate_short_ids
+from antd_to_html.instance_import import parse_instance_lines
+
+
+def test_parse_csv_maps_dotted_columns_into_runtime_config():
+  lines = [
+    "id,name,submit.callback.params.task_id,runtime_config",
+    'a1,alice,t-1,"{""html"": {""title"": ""Hi""}}"',
+    ",bob,,",
+    "",
+    "too,few",
+  ]
+  parsed = list(parse_instance_lines(lines, csv_format=True))
+
+  assert [line for line, _, _ in parsed] == [2, 3, 5]
+  alice, bob = parsed[0][1], parsed[1][1]
+  assert (alice.id, alice.name) == ("a1", "alice")
+  assert alice.runtime_config == {"html": {"title": "Hi"}, "submit": {"callback": {"params": {"task_id": "t-1"}}}}
+  assert bob.id is None and bob.runtime_config == {}
+  assert parsed[2][1] is None and parsed[2][2]["error"]
+
+
+def test_parse_ndjson_reports_bad_lines():
+  parsed = list(parse_instance_lines([b'{"name": "x", "runtime_config": {"html": {}}}', b"nope"]))
+  assert parsed[0][1].name == "x"
+  assert parsed[1][1] is None and parsed[1][2]["details"]
+
+
+def test_generate_short_ids():
+  ids = generate_short_ids(500, length=9)
+  assert len(ids) == 500 and len(set(ids)) == 500
+  assert all(len(value) == 9 and set(value) <= set(ALPHABET) for value in ids)
+
+
+def test_parse_accepts_lines_with_their_terminators():
+  upload = io.BytesIO(b"id,name,html.title\r\na1,alice,Hi\r\n\r\n")
+  parsed = list(parse_instance_lines(upload, csv_format=True))
+  assert [(line, item.id, item.runtime_config) for line, item, _ in parsed] == [(2, "a1", {"html": {"title": "Hi"}})]
@@ -0,0 +1,18 @@
+import json
+
+from antd_to_html.compression import PAGE_CACHE, CompressedPage, page_tags, store_page
+from antd_to_html.invalidation import handle_cache_notification
+
+
+def test_notification_evicts_only_the_changed_ids():
+  PAGE_CACHE.clear()
+  store_page(("view", "i-1"), CompressedPage(b"a"), page_tags("t-1", "i-1"))
+  store_page(("view", "i-2"), CompressedPage(b"b"), page_tags("t-1", "i-2"))
+  store_page(("view", "i-3"), CompressedPage(b"c"), page_tags("t-2", "i-3"))
+
+  handle_cache_notification(json.dumps({"table": "form_instances", "op": "UPDATE", "id": "i-1", "template_id": "t-1"}))
+  assert ("view", "i-1") not in PAGE_CACHE and ("view", "i-2") in PAGE_CACHE
+
+  handle_cache_notification(json.dumps({"table": "form_templates", "op": "DELETE", "id": "t-1", "template_id": None}))
+  assert PAGE_CACHE.get(("view", "i-2")) is None and PAGE_CACHE.get(("view", "i-3")) is not None
+  assert PAGE_CACHE.stats()["size"] == 1
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from antd_to_html.option_index import OptionIndex, select_options
+from antd_to_html.render import convert_antd_form_to_html
+
+
+def test_option_index_prefers_prefix_matches():
+  index = OptionIndex(
+    [
+      {"label": "Shanghai", "value": "sh"},
+      {"label": "Beijing", "value": "bj"},
+      {"label": "Shenzhen", "value": "sz"},
+      {"label": "Hong Kong SAR", "value": "hk"},
+      {"key": "k-only"},
+    ]
+  )
+
+  assert [entry["value"] for entry in index.search("sh", 10)] == ["sh", "sz"]
+  assert [entry["value"] for entry in index.search("SAR", 10)] == ["hk"]
+  assert [entry["value"] for entry in index.search("n", 2)] == ["sh", "bj"]
+  assert [entry["value"] for entry in index.search("", 2)] == ["sh", "bj"]
+  assert len(index) == 5
+
+
+def test_remote_select_renders_only_selected_options():
+  options = [{"label": f"City {n}", "value": f"c{n}"} for n in range(5000)]
+  definition = {
+    "items": [
+      {
+        "type": "form-list",
+        "name": "stops",
+        "item": {"type": "select", "name": "city", "optionsMode": "remote", "options": options, "defaultValue": "c42"},
+      }
+    ]
+  }
+
+  html = convert_antd_form_to_html(definition)
+
+  assert 'data-options-endpoint="fields/city/options"' in html
+  assert '<option value="c42" selected>City 42</option>' in html
+  assert "c43" not in html
+  assert "remote-select-search" in html
+  assert ".form-item .remote-select" in html
+  assert select_options(definition, "city") is options
+  assert select_options(definition, "stops") is None
@@ -0,0 +1,29 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from antd_to_html.repositories import (
+  InvalidCursorError,
+  decode_submission_cursor,
+  encode_submission_cursor,
+  submission_page,
+)
+
+
+def test_submission_cursor_round_trip_and_page_trimming():
+  rows = [
+    {"id": f"s{index}", "updated_at": datetime(2024, 5, 1, 12, 0, index, 123456, tzinfo=timezone.utc)}
+    for index in range(3, 0, -1)
+  ]
+  page = submission_page(rows, limit=2)
+
+  assert [row["id"] for row in page["items"]] == ["s3", "s2"]
+  assert decode_submission_cursor(page["next_cursor"]) == (rows[1]["updated_at"], "s2")
+  assert submission_page(rows[:2], limit=2)["next_cursor"] is None
+  assert encode_submission_cursor(rows[0]).isascii()
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "bm90IGpzb24", "WzFd"])
+def test_invalid_cursor(cursor):
+  with pytest.raises(InvalidCursorError):
+    decode_submission_cursor(cursor)
@@ -1,6 +1,22 @@
 from __future__ import annotations
 
-from antd_to_html.render import convert_antd_form_to_html
+import pytest
+
+from antd_to_html import render
+from antd_to_html.assets import get_asset
+from antd_to_html.render import (
+  BASE_STYLES,
+  BASE_STYLES_ASSET,
+  FORM_LIST_SCRIPT_ASSET,
+  RENDER_PLAN_CACHE,
+  attributes_to_string,
+  collect_field_names,
+  control_attributes,
+  convert_antd_form_to_html,
+  escape_html,
+  iter_antd_form_html,
+)
+from antd_to_html.submit_script import SUBMIT_SCRIPT_ASSET
 
 
 def test_basic_render():
@@ -20,3 +36,139 @@ def test_basic_render():
   assert "<!DOCTYPE html>" in html
   assert "测试表单" in html
   assert 'name="username"' in html
+
+
+def test_render_plan_is_reused_across_submit_configs():
+  definition = {
+    "title": "缓存",
+    "items": [{"type": "input", "name": "email", "label": "邮箱"}],
+  }
+  first = dict(definition, submit={"submissionEndpoint": "/forms/a/submissions"})
+  second = dict(definition, submit={"submissionEndpoint": "/forms/b/submissions"})
+
+  RENDER_PLAN_CACHE.clear()
+  hits_before = RENDER_PLAN_CACHE.hits
+  html_a = convert_antd_form_to_html(first)
+  html_b = convert_antd_form_to_html(second)
+
+  assert RENDER_PLAN_CACHE.hits == hits_before + 1
+  assert "/forms/a/submissions" in html_a
+  assert "/forms/b/submissions" in html_b
+  assert html_a.replace("/forms/a/", "/forms/b/") == html_b
+
+
+def test_cached_plan_still_validates_submit_config():
+  definition = {"items": [{"type": "input", "name": "q"}]}
+  convert_antd_form_to_html(definition)
+
+  with pytest.raises(ValueError) as excinfo:
+    convert_antd_form_to_html(dict(definition, submit={"method": "GET"}))
+  assert excinfo.value.details == ["submit.method must be one of: POST, PUT, PATCH, DELETE."]
+
+
+def test_streamed_render_matches_full_render():
+  definition = {
+    "title": "流式",
+    "items": [
+      {"type": "input", "name": "name", "label": "姓名"},
+      {"type": "select", "name": "city", "options": [{"label": "北京", "value": "bj"}]},
+    ],
+    "submit": {"submissionEndpoint": "/forms/s/submissions"},
+  }
+
+  RENDER_PLAN_CACHE.clear()
+  cold = list(iter_antd_form_html(definition))
+  warm = list(iter_antd_form_html(definition))
+
+  assert "</head>" in cold[0]
+  assert 'name="name"' not in cold[0]
+  assert len(cold) > len(warm)
+  assert "".join(cold) == "".join(warm) == convert_antd_form_to_html(definition)
+
+
+def test_external_asset_mode_references_fingerprinted_submit_script():
+  definition = {
+    "items": [{"type": "input", "name": "q"}],
+    "submit": {"submissionEndpoint": "/forms/x/submissions"},
+  }
+
+  html = convert_antd_form_to_html(definition, options={"html": {"assetMode": "external"}})
+
+  assert f'<script src="/static/{SUBMIT_SCRIPT_ASSET.filename}" defer></script>' in html
+  assert '<script type="application/json" id="antd-submit-config">' in html
+  assert "function collectPayload" not in html
+  assert get_asset(SUBMIT_SCRIPT_ASSET.filename) is SUBMIT_SCRIPT_ASSET
+  assert b"__CONFIG_JSON__" not in SUBMIT_SCRIPT_ASSET.content
+
+
+def test_external_asset_mode_links_styles_and_form_list_script():
+  definition = {"items": [{"type": "form-list", "name": "rows", "item": {"type": "input", "name": "v"}}]}
+
+  html = convert_antd_form_to_html(definition, options={"html": {"assetMode": "external"}})
+  assert f'<link rel="stylesheet" href="/static/{BASE_STYLES_ASSET.filename}" />' in html
+  assert f'<script src="/static/{FORM_LIST_SCRIPT_ASSET.filename}" defer></script>' in html
+  assert "<style>" not in html
+
+  custom = convert_antd_form_to_html(
+    definition,
+    options={"html": {"assetMode": "external", "styles": "body { color: red; }", "assetBaseUrl": "https://cdn.test/a/"}},
+  )
+  href = custom.split('<link rel="stylesheet" href="', 1)[1].split('"', 1)[0]
+  assert href.startswith("https://cdn.test/a/styles.")
+  assert get_asset(href.rsplit("/", 1)[1]).content == b"body { color: red; }"
+
+
+def test_inline_styles_are_pruned_to_used_field_types():
+  text_only = convert_antd_form_to_html({"items": [{"type": "input", "name": "a"}]})
+  assert ".form-item > input {" in text_only
+  assert ".form-divider" not in text_only
+  assert "textarea" not in text_only
+  assert ".form-actions" in text_only
+
+  nested = convert_antd_form_to_html(
+    {"items": [{"type": "form-list", "name": "l", "item": {"type": "textarea", "name": "t"}}, {"type": "divider"}]}
+  )
+  assert ".form-item .form-list" in nested
+  assert "textarea:focus" in nested
+  assert ".form-divider {" in nested
+
+  full = convert_antd_form_to_html({"items": [{"type": "input", "name": "a"}]}, options={"html": {"pruneStyles": False}})
+  assert BASE_STYLES in full
+
+
+def test_escape_and_attribute_fast_paths():
+  assert escape_html("plain") == "plain"
+  assert escape_html(None) == ""
+  assert escape_html(3) == "3"
+  assert escape_html("<a href=\"x\">'&'</a>") == "&lt;a href=&quot;x&quot;&gt;&#39;&amp;&#39;&lt;/a&gt;"
+  assert attributes_to_string({"a": None, "b": False, "c": True, "d": "x&y", "e": 0}) == 'c d="x&amp;y"'
+  assert control_attributes({"name": "n", "controlClassName": "k"}, {"type": "text"}) == (
+    'id="n" name="n" type="text" class="k"'
+  )
+  assert control_attributes(
+    {"name": "n", "controlClassName": "k", "htmlAttributes": {"id": "custom", "class": "z"}},
+    {"class": "base"},
+  ) == 'id="custom" name="n" class="z"'
+
+
+def test_collect_field_names_keeps_form_list_rows_under_the_list():
+  items = [
+    {"type": "input", "name": "email"},
+    {"type": "divider"},
+    {"type": "group", "items": [{"type": "select", "name": "city"}, {"type": "input", "name": "email"}]},
+    {"type": "form-list", "name": "people", "item": {"type": "input", "name": "who"}},
+  ]
+  assert collect_field_names(items) == ["email", "city", "people"]
+
+
+def test_versioned_plans_skip_the_content_hash_and_are_bounded_by_size(monkeypatch):
+  definition = {"items": [{"type": "input", "name": "q"}]}
+  RENDER_PLAN_CACHE.clear()
+  html = convert_antd_form_to_html(definition, version=("template", "t1", 1))
+
+  monkeypatch.setattr(render, "json", None)  # a versioned hit must not serialize the definition
+  assert convert_antd_form_to_html(definition, version=("template", "t1", 1)) == html
+  monkeypatch.undo()
+
+  plan = RENDER_PLAN_CACHE.get((render.RENDERER_VERSION, ("template", "t1", 1)))
+  assert RENDER_PLAN_CACHE.stats()["bytes"] == plan.size
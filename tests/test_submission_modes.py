@@ -0,0 +1,33 @@
+from antd_to_html.api.runtime import merge_definition_with_runtime, submission_mode
+from antd_to_html.models import SubmissionCreate
+from antd_to_html.repositories import UPDATE_SUBMISSION_SQL, UPSERT_SUBMISSION_SQL, submission_write
+
+
+def test_submission_write_respondent_keys():
+  data = SubmissionCreate(payload={"values": {}})
+  assert submission_write("i1", data)[1][1] == ""
+
+  first = submission_write("i1", data, append=True)[1][1]
+  second = submission_write("i1", data, append=True)[1][1]
+  assert first and second and first != second
+
+  keyed = SubmissionCreate(payload={}, respondent_key="alice")
+  assert submission_write("i1", keyed, append=True)[0] is UPSERT_SUBMISSION_SQL
+  assert submission_write("i1", keyed, append=True)[1][1] == "alice"
+  assert submission_write("i1", keyed)[1][1] == ""
+
+  by_id = SubmissionCreate(payload={}, submission_id="s1")
+  assert submission_write("i1", by_id, append=True)[0] is UPDATE_SUBMISSION_SQL
+
+
+def test_append_mode_disables_initial_load():
+  runtime = {"submit": {"callback": {"url": "https://example.com"}, "persistence": {"mode": "append"}}}
+  assert submission_mode(runtime) == "append"
+  assert submission_mode({"submission": {"mode": "single"}}) == "single"
+  assert submission_mode({}) == "single"
+
+  template = {"definition": {"items": []}}
+  definition, _ = merge_definition_with_runtime(template, runtime, "i1")
+  assert definition["submit"]["loadSubmissionOnInit"] is False
+  definition, _ = merge_definition_with_runtime(template, {}, "i1")
+  assert definition["submit"]["loadSubmissionOnInit"] is True
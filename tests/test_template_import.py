@@ -0,0 +1,36 @@
+import json
+
+from antd_to_html import template_import
+
+
+def test_import_reports_invalid_lines_and_loads_the_rest(monkeypatch):
+  loaded = []
+
+  def fake_import(records):
+    loaded.extend(records)
+    return [
+      {"id": record.id or "gen", "slug": record.slug, "created": index == 0, "error": None if index == 0 else "Template slug already exists."}
+      for index, record in enumerate(records)
+    ]
+
+  monkeypatch.setattr(template_import.repositories, "import_templates", fake_import)
+  definition = {"items": [{"type": "input", "name": "a", "label": "A"}]}
+  lines = [
+    json.dumps({"slug": "one", "title": "One", "definition": definition}),
+    "",
+    "{not json",
+    json.dumps({"title": "Bad", "definition": {"items": [{"type": "unknown-widget"}]}}),
+    json.dumps({"slug": "one", "title": "Again", "definition": definition}),
+  ]
+
+  summary = template_import.import_templates(lines, batch_size=10)
+
+  assert [record.title for record in loaded] == ["One", "Again"]
+  assert (summary["created"], summary["conflicts"], summary["invalid"]) == (1, 1, 2)
+  assert [(result["line"], result["status"]) for result in summary["results"]] == [
+    (1, "created"),
+    (3, "invalid"),
+    (4, "invalid"),
+    (5, "conflict"),
+  ]
+  assert summary["results"][2]["details"]
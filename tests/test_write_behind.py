@@ -0,0 +1,52 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from antd_to_html import async_db
+from antd_to_html.models import SubmissionCreate
+from antd_to_html.write_behind import SubmissionWriteQueue
+
+DATA = SubmissionCreate(payload={"values": {}})
+
+
+def test_flushes_by_count_then_by_deadline(monkeypatch):
+  batches = []
+
+  async def fake_write_batch(self, batch):
+    batches.append([pending.params[0] for pending in batch])
+    for pending in batch:
+      pending.future.set_result({"instance_id": pending.params[0]})
+
+  monkeypatch.setattr(SubmissionWriteQueue, "_write_batch", fake_write_batch)
+
+  async def main():
+    queue = SubmissionWriteQueue(max_batch=3, max_delay=0.01)
+    return await asyncio.gather(*(queue.save(f"i{n}", DATA) for n in range(5)))
+
+  rows = asyncio.run(main())
+  assert batches == [["i0", "i1", "i2"], ["i3", "i4"]]
+  assert [row["instance_id"] for row in rows] == ["i0", "i1", "i2", "i3", "i4"]
+
+
+def test_failed_batch_is_retried_per_write(monkeypatch):
+  @asynccontextmanager
+  async def broken_connection():
+    raise RuntimeError("batch failed")
+    yield
+
+  async def execute(query, params):
+    if params[0] == "bad":
+      raise ValueError("bad write")
+    return {"instance_id": params[0]}
+
+  monkeypatch.setattr(async_db, "get_connection", broken_connection)
+  monkeypatch.setattr(async_db, "execute", execute)
+
+  async def main():
+    queue = SubmissionWriteQueue(max_batch=3, max_delay=1)
+    results = await asyncio.gather(*(queue.save(name, DATA) for name in ("a", "bad", "c")), return_exceptions=True)
+    return queue, results
+
+  queue, results = asyncio.run(main())
+  assert results[0] == {"instance_id": "a"} and results[2] == {"instance_id": "c"}
+  assert isinstance(results[1], ValueError)
+  assert queue.stats()["fallbacks"] == 1